@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Time the hot paths of the game on a fixed corpus of mid-game positions.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --compare benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+
+The corpus is built by seeded self-play on GameEngine, so the same seed and
+dictionary always give the same positions and racks. Each benchmark runs
+over the whole corpus several times and the median time per operation is
+reported. Every run is appended to a JSON history file; with --compare, the
+run fails (exit status 1) if any benchmark is slower than the baseline by
+more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from src.ai.ai_player import AIPlayer
+from src.data.database import DatabaseManager
+from src.game.board import Board
+from src.game.game_engine import GameEngine
+from src.game.player import Player
+from src.game.score_calculator import ScoreCalculator
+from src.game.word_validator import WordValidator
+
+DEFAULT_HISTORY_PATH = "benchmarks/history.json"
+
+def build_corpus(word_validator, positions=40, seed=1234, first_turn=6, min_bag=20):
+    """Collect mid-game positions from seeded self-play.
+    
+    Args:
+        word_validator: The word validator.
+        positions: The number of positions to collect.
+        seed: The seed of the first game; game i uses seed + i.
+        first_turn: The first turn of each game to collect from.
+        min_bag: Stop collecting from a game once fewer tiles are in the bag.
+    
+    Returns:
+        list: Positions as dicts with the board 'snapshot', the 'rack' of the
+              side to move, 'tiles_remaining', the 'unseen' tiles and that
+              side's best 'move'.
+    """
+    corpus = []
+    game = 0
+    
+    while len(corpus) < positions:
+        game_seed = seed + game
+        engine = GameEngine(word_validator, Player(1, "Benchmark"), "easy", seed=game_seed)
+        engine.initialize_game()
+        driver = AIPlayer(engine.player, "easy", engine.board, word_validator,
+                          engine.score_calculator, rng=random.Random("%s:player" % game_seed))
+        
+        turn = 0
+        while not engine.is_game_over and len(corpus) < positions:
+            if engine.tile_bag.get_remaining_tiles_count() < min_bag:
+                break
+            
+            if engine.current_player == "player":
+                tiles_remaining = engine.tile_bag.get_remaining_tiles_count()
+                unseen_tiles = engine.tile_bag.get_remaining_tiles() + engine.ai_player.player.get_tiles()
+                move = driver.make_move(tiles_remaining, unseen_tiles)
+                
+                if turn >= first_turn and move:
+                    corpus.append({
+                        "snapshot": engine.board.get_snapshot(),
+                        "rack": engine.player.get_tiles(),
+                        "tiles_remaining": tiles_remaining,
+                        "unseen": unseen_tiles,
+                        "move": move
+                    })
+                
+                if not move or not engine.play_move(move['tiles']):
+                    engine.pass_turn()
+            else:
+                engine.play_ai_move()
+            
+            turn += 1
+        
+        game += 1
+    
+    return corpus
+
+def time_runs(function, repeat):
+    """Time repeated runs of a function.
+    
+    Args:
+        function: Called with no arguments; returns the number of operations
+            it performed.
+        repeat: The number of runs.
+    
+    Returns:
+        dict: The operation count, the median and fastest run in seconds and
+              the median time per operation in microseconds.
+    """
+    times = []
+    operations = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operations = function()
+        times.append(time.perf_counter() - started)
+    
+    median = statistics.median(times)
+    return {
+        "operations": operations,
+        "median_s": median,
+        "min_s": min(times),
+        "per_op_us": 1e6 * median / operations if operations else 0.0
+    }
+
+def bench_candidate_moves(corpus, word_validator, score_calculator, dawg):
+    """Benchmark AIPlayer.get_candidate_moves on every position."""
+    ais = []
+    for position in corpus:
+        board = Board.from_snapshot(position["snapshot"], dawg)
+        player = Player(1, "Benchmark", is_ai=True)
+        player.set_tiles(position["rack"])
+        ai = AIPlayer(player, "hard", board, word_validator, score_calculator,
+                      rng=random.Random(0))
+        ai.tiles_remaining = position["tiles_remaining"]
+        ais.append(ai)
+    
+    def run():
+        for ai in ais:
+            ai.get_candidate_moves()
+        return len(ais)
+    
+    return run
+
+def bench_evaluate_word_placement(corpus, score_calculator, dawg):
+    """Benchmark ScoreCalculator.evaluate_word_placement on each position's move."""
+    cases = [(position["move"], position["rack"], Board.from_snapshot(position["snapshot"], dawg))
+             for position in corpus]
+    
+    def run():
+        for move, rack, board in cases:
+            score_calculator.evaluate_word_placement(move['word'], move['position'],
+                                                     move['direction'], rack, board)
+        return len(cases)
+    
+    return run
+
+def bench_get_words_from_move(corpus, dawg):
+    """Benchmark Board.get_words_from_move on each position's move."""
+    cases = [(position["move"]['tiles'], Board.from_snapshot(position["snapshot"], dawg))
+             for position in corpus]
+    
+    def run():
+        for tiles, board in cases:
+            board.get_words_from_move(tiles)
+        return len(cases)
+    
+    return run
+
+def bench_is_valid_word(corpus, word_validator, seed):
+    """Benchmark WordValidator.is_valid_word on played words and random strings."""
+    rng = random.Random(seed)
+    words = [position["move"]['word'] for position in corpus]
+    for _ in range(len(words)):
+        length = rng.randint(2, 8)
+        words.append("".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(length)))
+    words *= 50
+    
+    def run():
+        for word in words:
+            word_validator.is_valid_word(word)
+        return len(words)
+    
+    return run
+
+def bench_game_turn(word_validator, seed, turns=10):
+    """Benchmark full GameEngine turns: the player's move and the AI's reply.
+    
+    This is the work GameController does for a turn, without the Qt timers
+    and worker threads around it.
+    """
+    def run():
+        engine = GameEngine(word_validator, Player(1, "Benchmark"), "medium", seed=seed)
+        engine.initialize_game()
+        driver = AIPlayer(engine.player, "easy", engine.board, word_validator,
+                          engine.score_calculator, rng=random.Random("%s:player" % seed))
+        
+        played = 0
+        while played < turns and not engine.is_game_over:
+            move = driver.make_move(engine.tile_bag.get_remaining_tiles_count())
+            if not move or not engine.play_move(move['tiles']):
+                engine.pass_turn()
+            engine.play_ai_move()
+            played += 1
+        return played
+    
+    return run
+
+def run_benchmarks(word_validator, positions=40, repeat=5, seed=1234):
+    """Build the corpus and run every benchmark.
+    
+    Args:
+        word_validator: The word validator.
+        positions: The number of corpus positions.
+        repeat: The number of timed runs per benchmark.
+        seed: The corpus seed.
+    
+    Returns:
+        dict: Benchmark name -> timing from time_runs().
+    """
+    dawg = word_validator.get_dawg()
+    corpus = build_corpus(word_validator, positions, seed)
+    score_calculator = ScoreCalculator()
+    
+    benchmarks = {
+        "candidate_moves": bench_candidate_moves(corpus, word_validator, score_calculator, dawg),
+        "evaluate_word_placement": bench_evaluate_word_placement(corpus, score_calculator, dawg),
+        "get_words_from_move": bench_get_words_from_move(corpus, dawg),
+        "is_valid_word": bench_is_valid_word(corpus, word_validator, seed),
+        "game_turn": bench_game_turn(word_validator, seed),
+    }
+    
+    return {name: time_runs(function, repeat) for name, function in benchmarks.items()}
+
+def compare(results, baseline, threshold):
+    """Compare results with a baseline.
+    
+    Args:
+        results: Benchmark name -> timing.
+        baseline: Benchmark name -> timing of the baseline run.
+        threshold: The allowed slowdown as a fraction (0.1 for 10%).
+    
+    Returns:
+        list: (name, ratio, regressed) for each benchmark in both runs, where
+              ratio is the current time per operation over the baseline's.
+    """
+    rows = []
+    for name, timing in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference["per_op_us"]:
+            continue
+        ratio = timing["per_op_us"] / reference["per_op_us"]
+        rows.append((name, ratio, ratio > 1 + threshold))
+    return rows
+
+def git_revision():
+    """Get the current git commit, if available.
+    
+    Returns:
+        str: The abbreviated commit hash, or None.
+    """
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+def load_json(path, default):
+    """Read a JSON file, or return a default if it does not exist."""
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    """Run the benchmarks from the command line.
+    
+    Args:
+        argv: Optional argument list (defaults to sys.argv[1:]).
+    
+    Returns:
+        int: 0, or 1 if a benchmark regressed against the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark move generation, validation and scoring.")
+    parser.add_argument("--database", default="resources/scrabble.db",
+                        help="database holding the dictionary")
+    parser.add_argument("--positions", type=int, default=40, help="corpus size")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="corpus seed")
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH,
+                        help="JSON file the run is appended to")
+    parser.add_argument("--compare", default=None, metavar="BASELINE",
+                        help="fail if slower than this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown against the baseline (0.10 = 10%%)")
+    parser.add_argument("--save-baseline", default=None, metavar="PATH",
+                        help="write this run as the baseline")
+    args = parser.parse_args(argv)
+    
+    db_manager = DatabaseManager(args.database)
+    db_manager.initialize_database()
+    word_validator = WordValidator(db_manager)
+    
+    results = run_benchmarks(word_validator, args.positions, args.repeat, args.seed)
+    
+    run = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "words": len(word_validator.lexicon),
+        "positions": args.positions,
+        "seed": args.seed,
+        "results": results
+    }
+    
+    print("%-26s %10s %12s %12s" % ("benchmark", "ops", "median s", "us/op"))
+    for name, timing in results.items():
+        print("%-26s %10d %12.4f %12.1f" % (name, timing["operations"], timing["median_s"],
+                                            timing["per_op_us"]))
+    
+    history = load_json(args.history, [])
+    history.append(run)
+    directory = os.path.dirname(args.history)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.history, "w") as f:
+        json.dump(history, f, indent=2)
+    
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(run, f, indent=2)
+    
+    status = 0
+    if args.compare:
+        baseline = load_json(args.compare, None)
+        if baseline is None:
+            print("Baseline %s not found" % args.compare, file=sys.stderr)
+            return 1
+        
+        print()
+        print("Against %s (revision %s):" % (args.compare, baseline.get("revision")))
+        for name, ratio, regressed in compare(results, baseline["results"], args.threshold):
+            print("%-26s %+8.1f%%%s" % (name, 100 * (ratio - 1), "  REGRESSION" if regressed else ""))
+            if regressed:
+                status = 1
+    
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,7 +22,9 @@ def main():
     main_window.show()
     
     # Start the application event loop
-    sys.exit(app.exec_())
+    status = app.exec_()
+    db_manager.close()
+    sys.exit(status)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import copy
 import random
 import time
 from collections import deque
 
+from src.ai.endgame import EndgameSolver, SearchTimeout
+from src.ai.leaves import LeaveTable
+from src.ai.move_generator import MoveGenerator
+from src.ai.simulator import ParallelSimulator, Simulator, create_simulation_pool, remove_tiles
+from src.ai.transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+from src.game.zobrist import SIDE_KEY, rack_hash
+
 class AIPlayer:
     """AI player for Scrabble using Minimax with Alpha-Beta pruning."""
     
-    def __init__(self, player, difficulty, board, word_validator, score_calculator):
+    def __init__(self, player, difficulty, board, word_validator, score_calculator,
+                 search_budget=None, use_simulation=False, simulation_workers=1,
+                 time_limit=None, leave_table=None, rng=None):
         """Initialize the AI player.
         
         Args:
@@ -17,33 +27,121 @@ class AIPlayer:
             board: The game board.
             word_validator: The word validator.
             score_calculator: The score calculator.
+            search_budget: Optional maximum number of move generations per
+                minimax search (defaults to a per-difficulty value).
+            use_simulation: Whether the hard AI chooses between its candidates
+                with Monte Carlo simulation instead of minimax.
+            simulation_workers: Number of processes to run simulation rollouts
+                on. With more than one, a process pool is started on first use;
+                call shutdown() when the AI is no longer needed.
+            time_limit: Optional thinking time per move in seconds (defaults
+                to a per-difficulty value; None means no limit).
+            leave_table: Optional LeaveTable valuing the tiles kept after a
+                move (defaults to the shared table in resources/leaves.bin).
+            rng: Optional random.Random for every random choice the AI makes
+                (move selection, sampled racks, simulation seeds), so a
+                seeded AI replays the same decisions.
         """
         self.player = player
         self.difficulty = difficulty.lower()
         self.board = board
         self.word_validator = word_validator
         self.score_calculator = score_calculator
+        self.rng = rng or random.Random()
         
         # Set depth for minimax based on difficulty
         if self.difficulty == "easy":
             self.minimax_depth = 1
             self.max_candidates = 3
+            self.search_budget = 0
+            self.time_limit = None
         elif self.difficulty == "medium":
             self.minimax_depth = 2
             self.max_candidates = 5
+            self.search_budget = 40
+            self.time_limit = None
         else:  # hard
             self.minimax_depth = 3
             self.max_candidates = 10
+            self.search_budget = 150
+            self.time_limit = 2.0
+        
+        if search_budget is not None:
+            self.search_budget = search_budget
+        if time_limit is not None:
+            self.time_limit = time_limit
+        
+        # Opponent modelling: racks sampled per opponent node, and the
+        # best-scoring replies searched for each rack
+        self.opponent_samples = 3
+        self.opponent_replies = 3
+        
+        # Monte Carlo simulation settings (hard difficulty)
+        self.use_simulation = use_simulation
+        self.simulation_plies = 3
+        self.simulation_iterations = 200
+        self.simulation_time_limit = 3.0
+        self.simulation_workers = simulation_workers
+        self.simulation_pool = None
+        self.simulation_pool_dawg = None
+        
+        # Exact endgame search once the bag is empty (hard difficulty)
+        self.use_endgame_solver = self.difficulty == "hard"
+        self.endgame_time_limit = 5.0
+        
+        # Equity of the tiles kept after a move, added to move scores when
+        # ranking while the bag still has tiles
+        self.leave_table = leave_table or LeaveTable.for_file()
+        
+        # Tiles the AI cannot see (bag plus opponent rack), set by make_move
+        self.unseen_tiles = []
+        self.tiles_remaining = None
+        self.nodes_searched = 0
+        
+        # Deadline for the current move (a time.time() value), set by make_move
+        self.deadline = None
+        self.search_depth = 0
+        
+        # Pondering: opponent racks sampled to predict the opponent's move,
+        # and how many of the likeliest predictions to answer in advance
+        self.ponder_samples = 12
+        self.ponder_predictions = 3
+        
+        # Set by cancel() to stop a search running on another thread
+        self.cancelled = False
+        self.active_search = None
+        
+        # Minimax results, kept across turns and aged per search
+        self.transposition_table = TranspositionTable(1 << 14)
     
-    def make_move(self, tiles_remaining):
+    def make_move(self, tiles_remaining, unseen_tiles=None, deadline=None):
         """Make a move based on the current board state and AI difficulty.
         
         Args:
             tiles_remaining: Number of tiles remaining in the bag.
+            unseen_tiles: Optional list of (letter, value) tiles the AI cannot
+                see (the bag plus the opponent's rack). Opponent racks are
+                sampled from it during search.
+            deadline: Optional time.time() value by which the move must be
+                chosen. Defaults to now plus the AI's time limit, if any.
             
         Returns:
             dict: A dictionary describing the move, or None if no move is possible.
         """
+        self.unseen_tiles = list(unseen_tiles or [])
+        self.tiles_remaining = tiles_remaining
+        
+        if self.cancelled:
+            return None
+        
+        if deadline is None and self.time_limit is not None:
+            deadline = time.time() + self.time_limit
+        self.deadline = deadline
+        
+        # With the bag empty the unseen tiles are exactly the opponent's rack
+        if tiles_remaining == 0 and self.unseen_tiles and self.use_endgame_solver:
+            return self.solve_endgame()
+        
         # Get available moves
         candidate_moves = self.get_candidate_moves()
         
@@ -67,275 +165,71 @@ class AIPlayer:
     def get_candidate_moves(self):
         """Generate candidate moves for the AI.
         
+        Every legal placement of the rack is generated and scored; the best
+        ones are kept.
+        
         Returns:
             list: A list of possible moves.
         """
-        # Get the player's tiles
-        tiles = self.player.get_tiles()
-        
-        # If this is the first move, place a word through the center
-        if self.board.is_first_move():
-            return self.get_first_move_candidates(tiles)
-        
-        # Find anchors (empty cells adjacent to existing tiles)
-        anchors = self.find_anchors()
-        
-        # Generate candidate moves from each anchor point
-        candidates = []
-        
-        for anchor in anchors:
-            # Generate horizontal moves
-            h_moves = self.generate_moves_from_anchor(anchor, "horizontal", tiles)
-            candidates.extend(h_moves)
-            
-            # Generate vertical moves
-            v_moves = self.generate_moves_from_anchor(anchor, "vertical", tiles)
-            candidates.extend(v_moves)
-        
-        # Sort candidates by score in descending order
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-        
         # Limit the number of candidates based on difficulty
-        return candidates[:self.max_candidates]
+        return self.generate_ranked_moves(self.player.get_tiles(), self.max_candidates)
     
-    def get_first_move_candidates(self, tiles):
-        """Generate candidate moves for the first move.
+    def generate_ranked_moves(self, tiles, limit):
+        """Generate and score all moves for a rack, best first.
         
-        Args:
-            tiles: The player's tiles.
-            
-        Returns:
-            list: A list of possible first moves.
-        """
-        candidates = []
-        center_row, center_col = 7, 7  # Center of a standard 15x15 board
-        
-        # Generate all possible words from the player's tiles
-        possible_words = self.generate_possible_words(tiles)
-        
-        for word in possible_words:
-            # Try to place the word horizontally through the center
-            for i in range(min(len(word), center_col + 1)):
-                if i <= center_col and center_col - i + len(word) - 1 < 15:
-                    start_col = center_col - i
-                    
-                    # Evaluate this placement
-                    result = self.score_calculator.evaluate_word_placement(
-                        word, (center_row, start_col), "horizontal", tiles, self.board
-                    )
-                    
-                    if result['valid'] and self.validate_words(result['words']):
-                        # Create a move dictionary
-                        move = {
-                            'word': word,
-                            'position': (center_row, start_col),
-                            'direction': 'horizontal',
-                            'score': result['score'],
-                            'tiles': []
-                        }
-                        
-                        # Add the tiles used
-                        row, col = center_row, start_col
-                        for letter in word:
-                            for tile_letter, tile_value in result['tiles_used']:
-                                if tile_letter.upper() == letter.upper():
-                                    move['tiles'].append((row, col, tile_letter, tile_value))
-                                    break
-                            col += 1
-                        
-                        candidates.append(move)
-            
-            # Try to place the word vertically through the center
-            for i in range(min(len(word), center_row + 1)):
-                if i <= center_row and center_row - i + len(word) - 1 < 15:
-                    start_row = center_row - i
-                    
-                    # Evaluate this placement
-                    result = self.score_calculator.evaluate_word_placement(
-                        word, (start_row, center_col), "vertical", tiles, self.board
-                    )
-                    
-                    if result['valid'] and self.validate_words(result['words']):
-                        # Create a move dictionary
-                        move = {
-                            'word': word,
-                            'position': (start_row, center_col),
-                            'direction': 'vertical',
-                            'score': result['score'],
-                            'tiles': []
-                        }
-                        
-                        # Add the tiles used
-                        row, col = start_row, center_col
-                        for letter in word:
-                            for tile_letter, tile_value in result['tiles_used']:
-                                if tile_letter.upper() == letter.upper():
-                                    move['tiles'].append((row, col, tile_letter, tile_value))
-                                    break
-                            row += 1
-                        
-                        candidates.append(move)
-        
-        # Sort candidates by score in descending order
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-        
-        return candidates[:self.max_candidates]
-    
-    def find_anchors(self):
-        """Find anchor points (empty cells adjacent to existing tiles).
-        
-        Returns:
-            list: A list of (row, col) tuples representing anchor points.
-        """
-        anchors = set()
-        
-        for row in range(self.board.size):
-            for col in range(self.board.size):
-                # If this cell has a tile, check adjacent cells
-                if self.board.has_tile(row, col):
-                    # Check adjacent cells (up, right, down, left)
-                    for adj_row, adj_col in [(row - 1, col), (row, col + 1), 
-                                            (row + 1, col), (row, col - 1)]:
-                        if (0 <= adj_row < self.board.size and 
-                            0 <= adj_col < self.board.size and 
-                            not self.board.has_tile(adj_row, adj_col)):
-                            anchors.add((adj_row, adj_col))
-        
-        return list(anchors)
-    
-    def generate_moves_from_anchor(self, anchor, direction, tiles):
-        """Generate possible moves from an anchor point in a given direction.
+        Moves are ranked by equity: the score plus the value of the tiles
+        left on the rack. Once the bag is empty the leave cannot be redrawn
+        around, so moves are ranked by score alone.
         
         Args:
-            anchor: The (row, col) anchor point.
-            direction: "horizontal" or "vertical".
-            tiles: The player's tiles.
+            tiles: The rack as (letter, value) tuples.
+            limit: The maximum number of moves to return.
             
         Returns:
-            list: A list of possible moves.
+            list: The best moves, each with its 'score' and 'equity'.
         """
-        row, col = anchor
-        candidates = []
-        
-        # Generate all possible words from the player's tiles
-        possible_words = self.generate_possible_words(tiles)
-        
-        for word in possible_words:
-            # Try different starting positions for the word
-            for i in range(len(word)):
-                # Calculate the starting position
-                if direction == "horizontal":
-                    start_row, start_col = row, col - i
-                else:  # vertical
-                    start_row, start_col = row - i, col
-                
-                # Make sure the starting position is valid
-                if (0 <= start_row < self.board.size and 
-                    0 <= start_col < self.board.size):
-                    
-                    # Evaluate this placement
-                    result = self.score_calculator.evaluate_word_placement(
-                        word, (start_row, start_col), direction, tiles, self.board
-                    )
-                    
-                    if result['valid'] and self.validate_words(result['words']):
-                        # Create a move dictionary
-                        move = {
-                            'word': word,
-                            'position': (start_row, start_col),
-                            'direction': direction,
-                            'score': result['score'],
-                            'tiles': []
-                        }
-                        
-                        # Add the tiles used
-                        curr_row, curr_col = start_row, start_col
-                        for letter in word:
-                            found = False
-                            
-                            # If there's already a tile at this position, skip
-                            if self.board.has_tile(curr_row, curr_col):
-                                if direction == "horizontal":
-                                    curr_col += 1
-                                else:
-                                    curr_row += 1
-                                continue
-                            
-                            for tile_letter, tile_value in result['tiles_used']:
-                                if tile_letter.upper() == letter.upper() and not found:
-                                    move['tiles'].append((curr_row, curr_col, tile_letter, tile_value))
-                                    found = True
-                                    break
-                            
-                            if direction == "horizontal":
-                                curr_col += 1
-                            else:
-                                curr_row += 1
-                        
-                        candidates.append(move)
-        
-        return candidates
-    
-    def generate_possible_words(self, tiles):
-        """Generate possible words from the player's tiles.
+        # Find anchors (empty cells adjacent to existing tiles)
+        anchors = self.find_anchors()
         
-        This is a simplified method that generates words directly instead of using a trie.
-        For a real game, you would use a more efficient algorithm.
+        # Generate every legal placement through the anchors
+        generator = MoveGenerator(self.board, self.word_validator.get_dawg())
+        candidates = generator.generate_moves(tiles, anchors)
         
-        Args:
-            tiles: The player's tiles.
-            
-        Returns:
-            list: A list of possible words.
-        """
-        # Letters available to the player
-        available_letters = [letter.upper() for letter, _ in tiles]
-        
-        # Get all words from the dictionary (this is a simplification)
-        self.word_validator.db_manager.connect()
-        self.word_validator.db_manager.cursor.execute(
-            "SELECT word FROM dictionary WHERE length(word) <= ? LIMIT 1000",
-            (len(available_letters) + 5,)  # Allow for some existing tiles on the board
+        scores = self.score_calculator.score_placements(
+            [move['tiles'] for move in candidates], self.board
         )
-        all_words = [row[0] for row in self.word_validator.db_manager.cursor.fetchall()]
-        self.word_validator.db_manager.close()
-        
-        # Filter words that can be formed with the available letters
-        possible_words = []
+        use_leaves = self.tiles_remaining != 0
+        for move, score in zip(candidates, scores):
+            move['score'] = score
+            move['equity'] = score
+            if use_leaves:
+                move['equity'] += self.leave_table.value(remove_tiles(tiles, move['tiles']))
         
-        for word in all_words:
-            word = word.upper()
-            if self.can_form_word(word, available_letters):
-                possible_words.append(word)
+        # Sort candidates by equity in descending order (ties keep generation order)
+        candidates.sort(key=lambda x: x['equity'], reverse=True)
         
-        # Limit the number of words to prevent too much computation
-        if len(possible_words) > 200:
-            return random.sample(possible_words, 200)
-        
-        return possible_words
+        return candidates[:limit]
     
-    def can_form_word(self, word, available_letters):
-        """Check if a word can be formed with the available letters.
-        
-        This is a simplified check that doesn't account for letters already on the board.
+    def score_move(self, move):
+        """Calculate the score of a generated move.
         
         Args:
-            word: The word to check.
-            available_letters: The available letters.
+            move: The move to score.
             
         Returns:
-            bool: True if the word can be formed, False otherwise.
+            int: The total score of all words formed.
         """
-        # Make a copy of the available letters
-        letters = available_letters.copy()
+        return self.score_calculator.score_placement(move['tiles'], self.board)
+    
+    def find_anchors(self):
+        """Find anchor points (empty cells adjacent to existing tiles).
         
-        for letter in word:
-            if letter in letters:
-                letters.remove(letter)
-            else:
-                return False
+        The board maintains the anchor set incrementally, so this is O(1).
         
-        return True
+        Returns:
+            set: A set of (row, col) tuples representing anchor points.
+        """
+        return self.board.get_anchors()
     
     def validate_words(self, words):
         """Validate that all words are in the dictionary.
@@ -370,7 +264,7 @@ class AIPlayer:
         if len(candidate_moves) == 1:
             return candidate_moves[0]
         
-        # For easy difficulty or if prioritizing score, just return the highest scoring move
+        # For easy difficulty or if prioritizing score, just return the best-ranked move
         if self.difficulty == "easy" or prioritize_score:
             return candidate_moves[0]
         
@@ -385,23 +279,71 @@ class AIPlayer:
                 weights = [move['score'] / total_score for move in candidate_moves]
             
             # Make a weighted random choice
-            return random.choices(candidate_moves, weights=weights, k=1)[0]
+            return self.rng.choices(candidate_moves, weights=weights, k=1)[0]
+        
+        # For hard difficulty, simulate the candidates if enabled
+        if self.use_simulation and self.unseen_tiles:
+            return self.simulate_moves(candidate_moves)
         
-        # For hard difficulty, use minimax with alpha-beta pruning
+        # Otherwise use minimax with alpha-beta pruning
+        return self.iterative_deepening(candidate_moves[:self.max_candidates])
+    
+    def iterative_deepening(self, candidate_moves):
+        """Search the candidates with minimax at increasing depths.
+        
+        Each iteration searches the previous iteration's best move first (and
+        the transposition table orders the moves below it). If the deadline
+        passes during an iteration, the result of the last completed one is
+        used.
+        
+        Args:
+            candidate_moves: A list of candidate moves, best first.
+            
+        Returns:
+            dict: The best move found.
+        """
+        best_move = candidate_moves[0]
+        self.search_depth = 0
+        self.transposition_table.new_search()
+        
+        for depth in range(1, self.minimax_depth + 1):
+            ordered_moves = [best_move] + [move for move in candidate_moves if move is not best_move]
+            
+            try:
+                best_move = self.search_root(ordered_moves, depth)
+            except SearchTimeout:
+                break
+            
+            self.search_depth = depth
+        
+        return best_move
+    
+    def search_root(self, candidate_moves, depth):
+        """Search every candidate to a fixed depth.
+        
+        Args:
+            candidate_moves: The candidates, in search order.
+            depth: The search depth in plies, counting the candidate itself.
+            
+        Returns:
+            dict: The best move.
+        """
         best_score = float('-inf')
         best_move = None
         alpha = float('-inf')
         beta = float('inf')
+        self.nodes_searched = 0
         
-        for move in candidate_moves[:min(len(candidate_moves), self.max_candidates)]:
+        for move in candidate_moves:
             # Apply the move
             self.apply_move(move)
             
-            # Evaluate with minimax
-            score = self.minimax(self.minimax_depth - 1, False, alpha, beta)
-            
-            # Undo the move
-            self.undo_move(move)
+            try:
+                # Evaluate with minimax (scores are AI points minus opponent points)
+                score = move['score'] + self.minimax(depth - 1, False, alpha, beta)
+            finally:
+                # Undo the move
+                self.undo_move(move)
             
             # Update best move if this one is better
             if score > best_score:
@@ -417,9 +359,230 @@ class AIPlayer:
         
         return best_move or candidate_moves[0]
     
+    def simulate_moves(self, candidate_moves):
+        """Select a move by Monte Carlo simulation of the candidates.
+        
+        Args:
+            candidate_moves: A list of candidate moves, best first.
+            
+        Returns:
+            dict: The move with the highest mean equity.
+        """
+        dawg = self.word_validator.get_dawg()
+        settings = {
+            'plies': self.simulation_plies,
+            'max_iterations': self.simulation_iterations,
+            'time_limit': self.remaining_time(self.simulation_time_limit)
+        }
+        
+        if self.simulation_workers > 1:
+            simulator = ParallelSimulator(self.board, dawg, self.score_calculator,
+                                          self.get_simulation_pool(), self.simulation_workers,
+                                          **settings)
+        else:
+            simulator = Simulator(self.board, dawg, self.score_calculator, **settings)
+        
+        self.start_search(simulator)
+        results = simulator.simulate(
+            candidate_moves[:self.max_candidates],
+            self.player.get_tiles(),
+            self.unseen_tiles,
+            self.rng.getrandbits(32)
+        )
+        self.active_search = None
+        
+        return results[0]['move']
+    
+    def get_simulation_pool(self):
+        """Get the simulation process pool, starting it if needed.
+        
+        Returns:
+            ProcessPoolExecutor: The pool.
+        """
+        dawg = self.word_validator.get_dawg()
+        
+        # Workers hold the word graph, so restart the pool when it changes
+        if self.simulation_pool is None or self.simulation_pool_dawg is not dawg:
+            self.shutdown()
+            self.simulation_pool = create_simulation_pool(dawg, self.simulation_workers)
+            self.simulation_pool_dawg = dawg
+        
+        return self.simulation_pool
+    
+    def solve_endgame(self):
+        """Select a move by searching the endgame exactly.
+        
+        Returns:
+            dict: The best move, or None if passing is best.
+        """
+        solver = EndgameSolver(
+            self.board,
+            self.word_validator.get_dawg(),
+            self.score_calculator,
+            time_limit=self.remaining_time(self.endgame_time_limit)
+        )
+        
+        self.start_search(solver)
+        move = solver.solve(self.player.get_tiles(), self.unseen_tiles)
+        self.active_search = None
+        
+        return move
+    
+    def predict_opponent_moves(self, count):
+        """Predict the opponent's likeliest moves from the unseen tiles.
+        
+        Racks are sampled from the unseen tiles and the best-scoring move for
+        each is counted; moves found for more racks rank higher.
+        
+        Args:
+            count: The maximum number of moves to return.
+            
+        Returns:
+            list: The predicted moves, likeliest first.
+        """
+        votes = {}
+        
+        for rack in self.sample_opponent_racks(self.ponder_samples):
+            if self.cancelled:
+                break
+            
+            replies = self.generate_ranked_moves(rack, 1)
+            if replies:
+                entry = votes.setdefault(tuple(replies[0]['tiles']), [0, replies[0]])
+                entry[0] += 1
+        
+        ranked = sorted(votes.values(), key=lambda entry: (entry[0], entry[1]['score']), reverse=True)
+        return [move for _, move in ranked[:count]]
+    
+    def ponder(self, tiles_remaining, unseen_tiles, callback):
+        """Work out replies to the opponent's likeliest moves in advance.
+        
+        Meant to run on the opponent's turn. For each predicted move, the move
+        is played on the board and the AI's reply is chosen exactly as
+        make_move would choose it on the next turn.
+        
+        Args:
+            tiles_remaining: Number of tiles remaining in the bag now.
+            unseen_tiles: The tiles the AI cannot see now.
+            callback: Called with (position key, move) for each prediction;
+                see ponder_key().
+        """
+        self.unseen_tiles = list(unseen_tiles)
+        self.tiles_remaining = tiles_remaining
+        
+        for prediction in self.predict_opponent_moves(self.ponder_predictions):
+            if self.cancelled:
+                return
+            
+            # The opponent refills from the bag after playing
+            remaining = max(0, tiles_remaining - len(prediction['tiles']))
+            
+            self.apply_opponent_move(prediction)
+            try:
+                key = self.ponder_key(remaining)
+                move = self.make_move(remaining, self.unseen_tiles)
+            finally:
+                self.undo_opponent_move(prediction)
+            
+            if not self.cancelled:
+                callback(key, move)
+    
+    def ponder_key(self, tiles_remaining):
+        """Get the key identifying the AI's decision in the current position.
+        
+        Args:
+            tiles_remaining: Number of tiles remaining in the bag.
+            
+        Returns:
+            tuple: The board hash, the AI's rack hash and the bag count.
+        """
+        return self.board.get_hash(), rack_hash(self.player.get_tiles()), tiles_remaining
+    
+    def start_search(self, search):
+        """Register a simulator or endgame solver so cancel() can reach it.
+        
+        Args:
+            search: The simulator or solver about to run.
+        """
+        self.active_search = search
+        if self.cancelled:
+            search.cancel()
+    
+    def cancel(self):
+        """Stop the current search as soon as possible.
+        
+        This may be called from another thread. The search ends at its next
+        deadline check and make_move returns its best result so far (or None
+        if it had not started); the caller should discard it.
+        """
+        self.cancelled = True
+        
+        search = self.active_search
+        if search is not None:
+            search.cancel()
+    
+    def snapshot(self):
+        """Copy the AI onto private copies of the board and rack.
+        
+        The copy shares the lexicon, score calculator, settings, transposition
+        table and simulation pool, so it can search on a background thread
+        while the game keeps the originals.
+        
+        Returns:
+            AIPlayer: The copy.
+        """
+        if self.use_simulation and self.simulation_workers > 1:
+            # Start the pool here so the copy shares it
+            self.get_simulation_pool()
+        
+        ai = copy.copy(self)
+        ai.board = self.board.copy()
+        ai.player = copy.copy(self.player)
+        ai.player.tiles = list(self.player.tiles)
+        ai.unseen_tiles = []
+        # A stream of its own, seeded from ours, so a background search never
+        # races the game for random numbers
+        ai.rng = random.Random(self.rng.getrandbits(64))
+        ai.cancelled = False
+        ai.active_search = None
+        return ai
+    
+    def remaining_time(self, time_limit):
+        """Cap a time limit by the time left before the move's deadline.
+        
+        Args:
+            time_limit: The time limit in seconds.
+            
+        Returns:
+            float: The smaller of the limit and the time left.
+        """
+        if self.deadline is None:
+            return time_limit
+        return max(0.0, min(time_limit, self.deadline - time.time()))
+    
+    def shutdown(self):
+        """Stop the simulation process pool, if one is running."""
+        if self.simulation_pool is not None:
+            self.simulation_pool.shutdown()
+            self.simulation_pool = None
+            self.simulation_pool_dawg = None
+    
     def minimax(self, depth, is_maximizing, alpha, beta):
         """Minimax algorithm with alpha-beta pruning.
         
+        Values are the AI's points minus the opponent's points along the line,
+        plus the static evaluation at the leaves. Opponent nodes are chance
+        nodes: several opponent racks are sampled from the unseen tiles, the
+        opponent plays its best reply for each, and the results are averaged.
+        Each move generation counts against the search budget; once it is
+        spent the remaining nodes are evaluated statically. SearchTimeout is
+        raised when the move's deadline passes; the board and rack are
+        restored on the way out.
+        
+        Results are cached in the transposition table under the Zobrist hash
+        of the board, the AI's rack and the side to move, so positions reached
+        by different move orders are only searched once.
+        
         Args:
             depth: The current depth.
             is_maximizing: Whether it's the maximizing player's turn.
@@ -432,42 +595,174 @@ class AIPlayer:
         if depth == 0:
             return self.evaluate_board()
         
+        if self.cancelled or (self.deadline is not None and time.time() >= self.deadline):
+            raise SearchTimeout()
+        
+        key = self.position_hash(is_maximizing)
+        entry = self.transposition_table.get(key)
+        table_move = None
+        original_alpha = alpha
+        
+        if entry is not None:
+            _, entry_depth, flag, value, table_move, _ = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                elif flag == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                
+                if alpha >= beta:
+                    return value
+        
+        if self.nodes_searched >= self.search_budget:
+            return self.evaluate_board()
+        
+        best_move = None
+        
         if is_maximizing:
             max_eval = float('-inf')
             
             # Generate moves for AI
-            candidate_moves = self.get_candidate_moves()
+            self.nodes_searched += 1
+            candidate_moves = self.generate_ranked_moves(self.player.get_tiles(), 3)  # Limit to 3 moves for efficiency
             
-            for move in candidate_moves[:min(len(candidate_moves), 3)]:  # Limit to 3 moves for efficiency
+            # Search the table's best move first
+            candidate_moves.sort(key=lambda move: tuple(move['tiles']) != table_move)
+            
+            if not candidate_moves:
+                # The AI has to pass
+                max_eval = self.minimax(depth - 1, False, alpha, beta)
+            
+            for move in candidate_moves:
                 self.apply_move(move)
-                eval_score = self.minimax(depth - 1, False, alpha, beta)
-                self.undo_move(move)
+                try:
+                    eval_score = move['score'] + self.minimax(depth - 1, False, alpha, beta)
+                finally:
+                    self.undo_move(move)
                 
-                max_eval = max(max_eval, eval_score)
+                if eval_score > max_eval:
+                    max_eval = eval_score
+                    best_move = tuple(move['tiles'])
                 alpha = max(alpha, eval_score)
                 
                 if beta <= alpha:
                     break
             
-            return max_eval
+            value = max_eval
         else:
-            min_eval = float('inf')
+            value = self.expected_reply_value(depth)
+        
+        if not is_maximizing:
+            # Chance nodes are searched without a window
+            flag = EXACT
+        elif value <= original_alpha:
+            flag = UPPER_BOUND
+        elif value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        
+        # Values from a search cut short by the budget are not stored
+        if self.nodes_searched < self.search_budget:
+            self.transposition_table.store(key, depth, flag, value, best_move)
+        
+        return value
+    
+    def expected_reply_value(self, depth):
+        """Evaluate an opponent (chance) node by sampling opponent racks.
+        
+        Args:
+            depth: The current depth.
+            
+        Returns:
+            float: The mean value over the sampled racks.
+        """
+        racks = self.sample_opponent_racks()
+        
+        if not racks:
+            # Nothing is known about the opponent's tiles
+            return self.minimax(depth - 1, True, float('-inf'), float('inf'))
+        
+        total_eval = 0
+        
+        for rack in racks:
+            # The opponent plays its best reply for this rack
+            self.nodes_searched += 1
+            replies = self.generate_ranked_moves(rack, self.opponent_replies)
             
-            # Simulate opponent moves (simplified)
-            # In a real implementation, you'd generate actual opponent moves
-            opponent_moves = [{'score': 5}, {'score': 10}, {'score': 15}]
+            if not replies:
+                # The opponent has to pass
+                total_eval += self.minimax(depth - 1, True, float('-inf'), float('inf'))
+                continue
             
-            for move in opponent_moves:
-                # Simulate opponent move (simplified)
-                eval_score = self.minimax(depth - 1, True, alpha, beta) - move['score']
+            min_eval = float('inf')
+            for reply in replies:
+                self.apply_opponent_move(reply)
+                try:
+                    eval_score = self.minimax(depth - 1, True, float('-inf'), min_eval) - reply['score']
+                finally:
+                    self.undo_opponent_move(reply)
                 
                 min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                
-                if beta <= alpha:
-                    break
             
-            return min_eval
+            total_eval += min_eval
+        
+        return total_eval / len(racks)
+    
+    def position_hash(self, is_maximizing):
+        """Get the Zobrist hash of the current search position.
+        
+        Args:
+            is_maximizing: Whether it's the AI's turn.
+            
+        Returns:
+            int: The hash of the board, the AI's rack and the side to move.
+        """
+        key = self.board.get_hash() ^ rack_hash(self.player.get_tiles())
+        if not is_maximizing:
+            key ^= SIDE_KEY
+        return key
+    
+    def sample_opponent_racks(self, count=None):
+        """Sample possible opponent racks from the unseen tiles.
+        
+        Args:
+            count: The number of racks (defaults to opponent_samples).
+            
+        Returns:
+            list: Up to count racks of (letter, value) tuples.
+        """
+        if not self.unseen_tiles:
+            return []
+        
+        if count is None:
+            count = self.opponent_samples
+        
+        rack_size = min(7, len(self.unseen_tiles))
+        return [self.rng.sample(self.unseen_tiles, rack_size)
+                for _ in range(count)]
+    
+    def apply_opponent_move(self, move):
+        """Apply a simulated opponent move to the board.
+        
+        Args:
+            move: The move to apply; its tiles are taken out of the unseen pool.
+        """
+        for row, col, letter, value in move['tiles']:
+            self.board.place_tile(row, col, letter, value)
+            self.unseen_tiles.remove((letter, value))
+    
+    def undo_opponent_move(self, move):
+        """Undo a simulated opponent move.
+        
+        Args:
+            move: The move to undo; its tiles go back into the unseen pool.
+        """
+        for row, col, letter, value in move['tiles']:
+            self.board.remove_tile(row, col)
+            self.unseen_tiles.append((letter, value))
     
     def evaluate_board(self):
         """Evaluate the current board state.
@@ -479,28 +774,22 @@ class AIPlayer:
         # In a real implementation, you'd consider more factors
         
         # Count the number of tiles placed by the AI
-        ai_tiles_count = 0
-        for row in range(self.board.size):
-            for col in range(self.board.size):
-                if self.board.has_tile(row, col):
-                    ai_tiles_count += 1
+        ai_tiles_count = self.board.get_tile_count()
         
-        # Consider the remaining tiles in the AI's rack
-        rack_potential = sum(value for _, value in self.player.get_tiles())
+        # Consider the tiles left on the AI's rack
+        leave_value = self.leave_table.value(self.player.get_tiles())
         
         # Evaluate board control (simplified)
         control_score = 0
-        for row in range(self.board.size):
-            for col in range(self.board.size):
-                if self.board.has_tile(row, col):
-                    # Add points for controlling premium squares
-                    bonus_type = self.board.get_bonus_type(row, col)
-                    if bonus_type == self.board.DOUBLE_WORD or bonus_type == self.board.TRIPLE_WORD:
-                        control_score += 3
-                    elif bonus_type == self.board.DOUBLE_LETTER or bonus_type == self.board.TRIPLE_LETTER:
-                        control_score += 1
-        
-        return ai_tiles_count * 2 + rack_potential + control_score
+        for row, col, _, _ in self.board.get_placed_tiles():
+            # Add points for controlling premium squares
+            bonus_type = self.board.get_bonus_type(row, col)
+            if bonus_type == self.board.DOUBLE_WORD or bonus_type == self.board.TRIPLE_WORD:
+                control_score += 3
+            elif bonus_type == self.board.DOUBLE_LETTER or bonus_type == self.board.TRIPLE_LETTER:
+                control_score += 1
+        
+        return ai_tiles_count * 2 + leave_value + control_score
     
     def apply_move(self, move):
         """Apply a move to the board (for simulation).
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+from src.ai.move_generator import MoveGenerator
+from src.ai.simulator import remove_tiles
+from src.ai.transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+from src.game.zobrist import PASS_KEYS, rack_hash
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit is reached."""
+
+class EndgameSolver:
+    """Perfect-information search for the endgame (empty tile bag).
+    
+    With the bag empty both racks are known, so the game can be searched
+    exactly. Values are the spread (side to move minus opponent) from the
+    current position to the end of the game, including the rack penalties of
+    GameController.end_game: going out earns twice the opponent's remaining
+    tile values, and a game ended by passing costs each side its own.
+    
+    The search is a negamax alpha-beta with iterative deepening. Moves are
+    ordered by the transposition table's best move and then by immediate
+    value. Passing is always allowed; two passes in a row end the game, since
+    passing again from the same position cannot change the outcome. Positions
+    cut off by the depth limit are scored as if the game ended by passing.
+    """
+    
+    def __init__(self, board, dawg, score_calculator, time_limit=5.0, max_depth=16,
+                 table_size=1 << 18):
+        """Initialize the endgame solver.
+        
+        Args:
+            board: The game board. The search plays on it and undoes its moves.
+            dawg: The word graph for the lexicon.
+            score_calculator: The score calculator.
+            time_limit: The time budget in seconds (None for no limit).
+            max_depth: The deepest iteration to search, in plies.
+            table_size: The number of transposition table slots.
+        """
+        self.board = board
+        self.dawg = dawg
+        self.score_calculator = score_calculator
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        
+        # Search state
+        self.racks = [[], []]
+        self.table = TranspositionTable(table_size)
+        self.deadline = None
+        self.cutoff = False
+        self.nodes = 0
+        
+        # Set by cancel(), possibly from another thread
+        self.cancelled = False
+        
+        # Result of the last solve
+        self.best_line = []
+        self.best_value = None
+        self.depth_reached = 0
+        self.complete = False
+    
+    def solve(self, rack, opponent_rack):
+        """Find the best move for the side to move.
+        
+        Args:
+            rack: The tiles of the side to move, as (letter, value) tuples.
+            opponent_rack: The opponent's tiles.
+        
+        Returns:
+            dict: The best move (with 'score'), or None to pass.
+        """
+        self.racks = [list(rack), list(opponent_rack)]
+        self.table.clear()
+        self.nodes = 0
+        self.best_line = []
+        self.best_value = None
+        self.depth_reached = 0
+        self.complete = False
+        
+        if self.time_limit is not None:
+            self.deadline = time.time() + self.time_limit
+        else:
+            self.deadline = None
+        
+        for depth in range(1, self.max_depth + 1):
+            self.cutoff = False
+            
+            try:
+                value = self.negamax(depth, 0, 0, float('-inf'), float('inf'))
+            except SearchTimeout:
+                break
+            
+            self.best_value = value
+            self.best_line = self.principal_variation(depth)
+            self.depth_reached = depth
+            
+            if not self.cutoff:
+                # Every line reached the end of the game
+                self.complete = True
+                break
+        
+        if self.depth_reached == 0:
+            # Not even one ply finished; fall back to the highest-scoring move
+            moves = self.ordered_moves(self.racks[0], self.racks[1], None)
+            self.best_line = moves[:1]
+        
+        return self.best_line[0] if self.best_line else None
+    
+    def cancel(self):
+        """Stop the search at the next node; the last completed iteration is used."""
+        self.cancelled = True
+    
+    def negamax(self, depth, side, passes, alpha, beta):
+        """Search a position.
+        
+        Args:
+            depth: The remaining depth in plies.
+            side: The side to move (0 for the solving side, 1 for the opponent).
+            passes: The number of consecutive passes so far.
+            alpha: The lower bound of the search window.
+            beta: The upper bound of the search window.
+        
+        Returns:
+            float: The spread for the side to move.
+        """
+        self.nodes += 1
+        if self.cancelled:
+            raise SearchTimeout()
+        if self.deadline is not None and self.nodes % 64 == 0 and time.time() >= self.deadline:
+            raise SearchTimeout()
+        
+        rack = self.racks[side]
+        opponent_rack = self.racks[1 - side]
+        
+        if depth == 0:
+            self.cutoff = True
+            return rack_value(opponent_rack) - rack_value(rack)
+        
+        key = self.position_key(side, passes)
+        entry = self.table.get(key)
+        table_move = None
+        original_alpha = alpha
+        
+        if entry is not None:
+            _, entry_depth, flag, value, table_move, _ = entry
+            
+            # Entries stored at infinite depth reached the end of every line
+            entry_cutoff = entry_depth != float('inf')
+            
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    self.cutoff = self.cutoff or entry_cutoff
+                    return value
+                elif flag == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                
+                if alpha >= beta:
+                    self.cutoff = self.cutoff or entry_cutoff
+                    return value
+        
+        # Track whether this subtree hits the depth limit
+        parent_cutoff = self.cutoff
+        self.cutoff = False
+        
+        best_value = float('-inf')
+        best_move = None
+        
+        for move in self.ordered_moves(rack, opponent_rack, table_move):
+            value = self.move_value(move, depth, side, passes, alpha, beta)
+            
+            if value > best_value:
+                best_value = value
+                best_move = move
+            
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        
+        # A subtree that never hit the depth limit is solved at any depth
+        node_cutoff = self.cutoff
+        entry_depth = depth if node_cutoff else float('inf')
+        self.table.store(key, entry_depth, flag, best_value, move_key(best_move))
+        
+        self.cutoff = parent_cutoff or node_cutoff
+        return best_value
+    
+    def move_value(self, move, depth, side, passes, alpha, beta):
+        """Search the position after a move.
+        
+        Args:
+            move: The move, or None for a pass.
+            depth: The remaining depth before the move.
+            side: The side making the move.
+            passes: The number of consecutive passes before the move.
+            alpha: The lower bound of the search window.
+            beta: The upper bound of the search window.
+        
+        Returns:
+            float: The spread for the side making the move.
+        """
+        rack = self.racks[side]
+        opponent_rack = self.racks[1 - side]
+        
+        if move is None:
+            if passes + 1 >= 2:
+                # The game ends; both sides lose their remaining tiles
+                return rack_value(opponent_rack) - rack_value(rack)
+            return -self.negamax(depth - 1, 1 - side, passes + 1, -beta, -alpha)
+        
+        remaining = remove_tiles(rack, move['tiles'])
+        if not remaining:
+            # Going out ends the game and collects the opponent's tiles
+            return move['score'] + 2 * rack_value(opponent_rack)
+        
+        for row, col, letter, value in move['tiles']:
+            self.board.place_tile(row, col, letter, value)
+        self.racks[side] = remaining
+        
+        try:
+            return move['score'] - self.negamax(depth - 1, 1 - side, 0, -beta, -alpha)
+        finally:
+            for row, col, _, _ in move['tiles']:
+                self.board.remove_tile(row, col)
+            self.racks[side] = rack
+    
+    def ordered_moves(self, rack, opponent_rack, table_move):
+        """Generate the moves for a rack, most promising first.
+        
+        Args:
+            rack: The tiles of the side to move.
+            opponent_rack: The opponent's tiles.
+            table_move: The best move key from the transposition table, or None.
+        
+        Returns:
+            list: Move dictionaries with scores, followed by None for a pass
+                  (the pass comes first if it is the table move).
+        """
+        generator = MoveGenerator(self.board, self.dawg)
+        moves = generator.generate_moves(rack, self.board.get_anchors())
+        
+        scores = self.score_calculator.score_placements(
+            [move['tiles'] for move in moves], self.board
+        )
+        for move, score in zip(moves, scores):
+            move['score'] = score
+        
+        out_bonus = 2 * rack_value(opponent_rack)
+        
+        def priority(move):
+            value = move['score']
+            if len(move['tiles']) == len(rack):
+                value += out_bonus
+            return (move_key(move) == table_move, value)
+        
+        moves.sort(key=priority, reverse=True)
+        
+        if table_move == ():
+            return [None] + moves
+        return moves + [None]
+    
+    def principal_variation(self, depth):
+        """Follow the transposition table's best moves from the root.
+        
+        Args:
+            depth: The length of the line to extract.
+        
+        Returns:
+            list: The moves of the best line (None for passes).
+        """
+        line = []
+        played = []
+        side = 0
+        passes = 0
+        
+        try:
+            for _ in range(depth):
+                entry = self.table.get(self.position_key(side, passes))
+                if entry is None or entry[4] is None:
+                    break
+                
+                key = entry[4]
+                if key == ():
+                    line.append(None)
+                    passes += 1
+                    if passes >= 2:
+                        break
+                    side = 1 - side
+                    continue
+                
+                moves = self.ordered_moves(self.racks[side], self.racks[1 - side], key)
+                move = moves[0]
+                if move is None or move_key(move) != key:
+                    break
+                
+                line.append(move)
+                remaining = remove_tiles(self.racks[side], move['tiles'])
+                if not remaining:
+                    break
+                
+                for row, col, letter, value in move['tiles']:
+                    self.board.place_tile(row, col, letter, value)
+                played.append((side, self.racks[side], move))
+                self.racks[side] = remaining
+                passes = 0
+                side = 1 - side
+        finally:
+            for move_side, rack, move in reversed(played):
+                for row, col, _, _ in move['tiles']:
+                    self.board.remove_tile(row, col)
+                self.racks[move_side] = rack
+        
+        return line
+    
+    def position_key(self, side, passes):
+        """Build the transposition table key for the current position.
+        
+        Args:
+            side: The side to move.
+            passes: The number of consecutive passes so far.
+        
+        Returns:
+            int: The Zobrist hash of the board, both racks and the pass count.
+        """
+        return (self.board.get_hash() ^
+                rack_hash(self.racks[side], 0) ^
+                rack_hash(self.racks[1 - side], 1) ^
+                PASS_KEYS[passes])
+
+def rack_value(rack):
+    """Get the total value of the tiles on a rack.
+    
+    Args:
+        rack: The rack as (letter, value) tuples.
+    
+    Returns:
+        int: The sum of the tile values.
+    """
+    return sum(value for _, value in rack)
+
+def move_key(move):
+    """Get a key identifying a move.
+    
+    Args:
+        move: A move dictionary, or None for a pass.
+    
+    Returns:
+        tuple: The move's tiles, or () for a pass.
+    """
+    if move is None:
+        return ()
+    return tuple(move['tiles'])
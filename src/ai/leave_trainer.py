@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Learn rack-leave values from self-play.
+
+Usage:
+    python -m src.ai.leave_trainer --games 500
+
+Two AIs that rank their moves with the current table play each other. After
+every move, the tiles kept are credited with the points the same player
+scores on their next turn, relative to the average turn. Each observed leave
+is blended with its current value (the prior), so running the trainer again
+refines an existing table.
+"""
+
+import argparse
+import os
+import random
+import sys
+
+from src.ai.ai_player import AIPlayer
+from src.ai.leaves import DEFAULT_LEAVES_PATH, SYMBOLS, LeaveTable, leave_key
+from src.data.database import DatabaseManager
+from src.game.board import Board
+from src.game.player import Player
+from src.game.score_calculator import ScoreCalculator
+from src.game.tile_bag import TileBag
+from src.game.word_validator import WordValidator
+
+def play_game(word_validator, score_calculator, leave_table, seed, max_turns=100):
+    """Play one self-play game and record its leaves.
+    
+    Args:
+        word_validator: The word validator.
+        score_calculator: The score calculator.
+        leave_table: The LeaveTable the players rank their moves with.
+        seed: The random seed for the game.
+        max_turns: The most turns to play.
+    
+    Returns:
+        list: (leave key, next turn's score) pairs, one per move that left
+              tiles to draw around.
+    """
+    board = Board()
+    bag = TileBag(rng=random.Random("%s:bag" % seed))
+    players = [Player(-1, "Trainer 1", True), Player(-2, "Trainer 2", True)]
+    ais = [AIPlayer(player, "easy", board, word_validator, score_calculator,
+                    leave_table=leave_table, rng=random.Random("%s:%d" % (seed, index)))
+           for index, player in enumerate(players)]
+    
+    for player in players:
+        player.set_tiles(bag.draw_tiles(7))
+    
+    # Leave each player kept on their last move, awaiting its next score
+    pending = [None, None]
+    samples = []
+    passes = 0
+    
+    for turn in range(max_turns):
+        if passes >= 2 or not all(player.get_tile_count() for player in players):
+            break
+        
+        side = turn % 2
+        player = players[side]
+        move = ais[side].make_move(bag.get_remaining_tiles_count())
+        
+        if pending[side] is not None:
+            samples.append((pending[side], move['score'] if move else 0))
+            pending[side] = None
+        
+        if not move:
+            passes += 1
+            continue
+        
+        passes = 0
+        for row, col, letter, value in move['tiles']:
+            board.place_tile(row, col, letter, value)
+            player.remove_tile(letter)
+        
+        # Only leaves that are drawn around say anything about the next turn
+        if not bag.is_empty():
+            pending[side] = leave_key(player.get_tiles())
+        
+        for letter, value in bag.draw_tiles(7 - player.get_tile_count()):
+            player.add_tile(letter, value)
+    
+    return samples
+
+def train(leave_table, samples, prior_weight=10.0):
+    """Build a new table from self-play samples.
+    
+    Args:
+        leave_table: The current table, whose values act as priors.
+        samples: (leave key, next turn's score) pairs.
+        prior_weight: How many samples the prior counts as.
+    
+    Returns:
+        LeaveTable: The refreshed table.
+    """
+    if not samples:
+        return LeaveTable(leave_table.values, leave_table.tile_values)
+    
+    total = sum(score for _, score in samples)
+    mean = total / len(samples)
+    
+    leaves = {}  # key -> [count, total]
+    tiles = {}  # symbol -> [count, total] over leaves holding the tile
+    for key, score in samples:
+        stats = leaves.setdefault(key, [0, 0])
+        stats[0] += 1
+        stats[1] += score
+        for symbol in set(key):
+            stats = tiles.setdefault(symbol, [0, 0])
+            stats[0] += 1
+            stats[1] += score
+    
+    values = dict(leave_table.values)
+    for key, (count, key_total) in leaves.items():
+        prior = leave_table.value_of_key(key)
+        values[key] = (key_total - count * mean + prior_weight * prior) / (count + prior_weight)
+    
+    # A tile is worth the difference between turns after leaves with it and without it
+    tile_values = dict(leave_table.tile_values)
+    for symbol, (count, symbol_total) in tiles.items():
+        if count == len(samples):
+            continue
+        without = (total - symbol_total) / (len(samples) - count)
+        observed = symbol_total / count - without
+        prior = tile_values[symbol]
+        tile_values[symbol] = (count * observed + prior_weight * prior) / (count + prior_weight)
+    
+    return LeaveTable(values, tile_values)
+
+def main(argv=None):
+    """Run the trainer from the command line.
+    
+    Args:
+        argv: Optional argument list (defaults to sys.argv[1:]).
+    
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Learn rack-leave values from self-play.")
+    parser.add_argument("--games", type=int, default=200,
+                        help="number of self-play games per round")
+    parser.add_argument("--rounds", type=int, default=1,
+                        help="rounds of play and retraining")
+    parser.add_argument("--database", default="resources/scrabble.db",
+                        help="database holding the dictionary")
+    parser.add_argument("--input", default=None,
+                        help="table to refresh (defaults to the output file, if it exists)")
+    parser.add_argument("--output", default=DEFAULT_LEAVES_PATH,
+                        help="where to write the trained table")
+    parser.add_argument("--prior-weight", type=float, default=10.0,
+                        help="samples the current value of a leave counts as")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the first game, for reproducible runs")
+    args = parser.parse_args(argv)
+    
+    input_path = args.input or args.output
+    if os.path.exists(input_path):
+        leave_table = LeaveTable.load(input_path)
+    else:
+        leave_table = LeaveTable()
+    
+    db_manager = DatabaseManager(args.database)
+    db_manager.initialize_database()
+    word_validator = WordValidator(db_manager)
+    score_calculator = ScoreCalculator()
+    
+    seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(32)
+    print("Seed: %d" % seed)
+    
+    for round_number in range(1, args.rounds + 1):
+        samples = []
+        for game in range(args.games):
+            game_seed = seed + (round_number - 1) * args.games + game
+            samples.extend(play_game(word_validator, score_calculator, leave_table, game_seed))
+        
+        leave_table = train(leave_table, samples, args.prior_weight)
+        print("Round %d: %d games, %d leaves sampled, %d leaves in table" %
+              (round_number, args.games, len(samples), len(leave_table)))
+    
+    leave_table.save(args.output)
+    print("Tile values: %s" % ", ".join("%s %.1f" % (symbol, leave_table.tile_values[symbol])
+                                         for symbol in SYMBOLS))
+    print("Wrote %s" % args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import struct
+
+# Default location of the trained table
+DEFAULT_LEAVES_PATH = "resources/leaves.bin"
+
+# Binary format: header, per-tile values, then (length, letters, value) entries
+MAGIC = b"LEAV"
+VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_ENTRY_VALUE = struct.Struct("<f")
+
+# Leave keys write the blank as '?' so it sorts before the letters
+BLANK = "?"
+SYMBOLS = BLANK + "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_TILE_VALUES = struct.Struct("<%df" % len(SYMBOLS))
+
+# Rough equity of keeping a single tile, used until a table has been trained
+DEFAULT_TILE_VALUES = {
+    '?': 24.0, 'S': 8.0, 'Z': 5.0, 'X': 3.5, 'R': 1.5, 'H': 1.0, 'E': 1.0,
+    'N': 0.5, 'D': 0.5, 'T': 0.0, 'L': -0.5, 'A': 0.5, 'C': 0.5, 'M': 0.5,
+    'P': -0.5, 'K': -1.0, 'J': -1.5, 'Y': -0.5, 'F': -2.0, 'G': -2.0,
+    'B': -2.0, 'O': -2.0, 'I': -2.0, 'W': -3.5, 'U': -4.5, 'V': -5.5,
+    'Q': -7.0,
+}
+
+# Equity lost for each extra copy of a tile in a leave
+DUPLICATE_PENALTY = -3.0
+
+def leave_key(tiles):
+    """Build the table key for a leave.
+    
+    Args:
+        tiles: The leave as (letter, value) tuples.
+    
+    Returns:
+        str: The leave's letters, upper case and sorted, with '?' for blanks.
+    """
+    return "".join(sorted(letter.upper() if letter != ' ' else BLANK
+                          for letter, _ in tiles))
+
+class LeaveTable:
+    """Equity of the tiles left on a rack after a move.
+    
+    Leaves are looked up by their sorted multiset key (see leave_key()) in a
+    dictionary, so a lookup costs one sort of at most seven letters and one
+    hash probe. Leaves missing from the table are valued as the sum of their
+    single-tile values plus a penalty for duplicates.
+    
+    Tables are trained by src.ai.leave_trainer and stored in a compact binary
+    file; tables are shared per file.
+    """
+    
+    # Shared tables, keyed by file path
+    _instances = {}
+    
+    def __init__(self, values=None, tile_values=None):
+        """Initialize the table.
+        
+        Args:
+            values: Optional dict mapping leave keys to equity.
+            tile_values: Optional dict mapping single tiles ('?' for the
+                blank) to equity; missing tiles use DEFAULT_TILE_VALUES.
+        """
+        self.values = dict(values or {})
+        self.tile_values = dict(DEFAULT_TILE_VALUES)
+        if tile_values:
+            self.tile_values.update(tile_values)
+    
+    @classmethod
+    def for_file(cls, path=DEFAULT_LEAVES_PATH):
+        """Get the shared table for a file.
+        
+        Args:
+            path: The path of the table file. If it does not exist, a table
+                with only the default tile values is used.
+        
+        Returns:
+            LeaveTable: The table for the file.
+        """
+        table = cls._instances.get(path)
+        if table is None:
+            if os.path.exists(path):
+                table = cls.load(path)
+            else:
+                table = cls()
+            cls._instances[path] = table
+        return table
+    
+    @classmethod
+    def load(cls, path):
+        """Read a table from a binary file.
+        
+        Args:
+            path: The path of the file.
+        
+        Returns:
+            LeaveTable: The table.
+        
+        Raises:
+            ValueError: If the file is not a leave table of a known version.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        
+        if len(data) < _HEADER.size + _TILE_VALUES.size:
+            raise ValueError("%s is not a leave table" % path)
+        
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("%s is not a leave table" % path)
+        if version != VERSION:
+            raise ValueError("Unsupported leave table version %d in %s" % (version, path))
+        
+        offset = _HEADER.size
+        tile_values = dict(zip(SYMBOLS, _TILE_VALUES.unpack_from(data, offset)))
+        offset += _TILE_VALUES.size
+        
+        values = {}
+        for _ in range(count):
+            length = data[offset]
+            key = data[offset + 1:offset + 1 + length].decode("ascii")
+            offset += 1 + length
+            values[key] = _ENTRY_VALUE.unpack_from(data, offset)[0]
+            offset += _ENTRY_VALUE.size
+        
+        return cls(values, tile_values)
+    
+    def save(self, path):
+        """Write the table to a binary file.
+        
+        Args:
+            path: The path of the file; its directory is created if needed.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        parts = [
+            _HEADER.pack(MAGIC, VERSION, len(self.values)),
+            _TILE_VALUES.pack(*(self.tile_values[symbol] for symbol in SYMBOLS)),
+        ]
+        for key in sorted(self.values):
+            encoded = key.encode("ascii")
+            parts.append(bytes([len(encoded)]) + encoded)
+            parts.append(_ENTRY_VALUE.pack(self.values[key]))
+        
+        with open(path, "wb") as f:
+            f.write(b"".join(parts))
+    
+    def value(self, tiles):
+        """Get the equity of a leave.
+        
+        Args:
+            tiles: The leave as (letter, value) tuples.
+        
+        Returns:
+            float: The leave's equity in points.
+        """
+        return self.value_of_key(leave_key(tiles))
+    
+    def value_of_key(self, key):
+        """Get the equity of a leave from its key.
+        
+        Args:
+            key: The leave key.
+        
+        Returns:
+            float: The leave's equity in points.
+        """
+        value = self.values.get(key)
+        if value is None:
+            value = self.estimate(key)
+        return value
+    
+    def estimate(self, key):
+        """Value a leave from its single tiles.
+        
+        Args:
+            key: The leave key.
+        
+        Returns:
+            float: The sum of the tile values plus the duplicate penalties.
+        """
+        value = 0.0
+        previous = None
+        for symbol in key:
+            value += self.tile_values.get(symbol, 0.0)
+            if symbol == previous:
+                value += DUPLICATE_PENALTY
+            previous = symbol
+        return value
+    
+    def __len__(self):
+        return len(self.values)
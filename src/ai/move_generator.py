@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from src.game.board import letter_bit
+
+class MoveGenerator:
+    """Generates every legal placement for a rack (Appel-Jacobson algorithm).
+    
+    Words are built outwards from anchor squares by walking a DAWG of the
+    lexicon: first every possible left part, then extending right across empty
+    and occupied squares. Letters that would form an invalid perpendicular
+    word are rejected with the board's cross-check masks, so every generated
+    move is legal. Blank tiles are not played.
+    """
+    
+    def __init__(self, board, dawg):
+        """Initialize the move generator.
+        
+        Args:
+            board: The game board.
+            dawg: The word graph for the lexicon. It is attached to the board
+                so the board maintains cross-checks against it.
+        """
+        self.board = board
+        self.dawg = dawg
+        
+        if board.dawg is not dawg:
+            board.set_word_graph(dawg)
+        
+        # Per-call search state
+        self.rack = {}
+        self.values = {}
+        self.cross_checks = []
+        self.anchors = set()
+        self.horizontal = True
+        self.line = 0
+        self.moves = []
+    
+    def generate_moves(self, tiles, anchors):
+        """Generate all legal moves for a rack.
+        
+        Args:
+            tiles: The player's tiles as (letter, value) tuples.
+            anchors: The (row, col) anchor squares. Ignored on the first move,
+                where the center square is the only anchor.
+        
+        Returns:
+            list: Move dictionaries with 'word', 'position', 'direction' and
+                  'tiles' keys, in a deterministic order.
+        """
+        self.rack = {}
+        self.values = {}
+        for letter, value in tiles:
+            letter = letter.upper()
+            if 'A' <= letter <= 'Z':
+                self.rack[letter] = self.rack.get(letter, 0) + 1
+                self.values[letter] = value
+        
+        if self.board.is_first_move():
+            center = self.board.size // 2
+            anchors = [(center, center)]
+        
+        self.anchors = set(anchors)
+        self.moves = []
+        
+        for horizontal in (True, False):
+            self.horizontal = horizontal
+            self.cross_checks = self.board.get_cross_checks(horizontal)
+            
+            for row, col in sorted(self.anchors):
+                if horizontal:
+                    self.line, anchor = row, col
+                else:
+                    self.line, anchor = col, row
+                self.generate_at_anchor(anchor)
+        
+        # A single tile can form a word in both directions; keep the first
+        unique_moves = []
+        seen = set()
+        for move in self.moves:
+            key = tuple(sorted(move['tiles']))
+            if key not in seen:
+                seen.add(key)
+                unique_moves.append(move)
+        
+        return unique_moves
+    
+    def square(self, index):
+        """Map a position along the current line to (row, col)."""
+        if self.horizontal:
+            return self.line, index
+        return index, self.line
+    
+    def letter_at(self, index):
+        """Get the letter on the board at a position along the current line."""
+        board = self.board
+        if self.horizontal:
+            code = board.letters[self.line * board.size + index]
+        else:
+            code = board.letters[index * board.size + self.line]
+        return chr(code) if code else None
+    
+    def generate_at_anchor(self, anchor):
+        """Generate all moves whose leftmost new tile region covers an anchor.
+        
+        Args:
+            anchor: The anchor's position along the current line.
+        """
+        dawg = self.dawg
+        
+        if anchor > 0 and self.letter_at(anchor - 1) is not None:
+            # The left part is fixed by the tiles already on the board
+            start = anchor - 1
+            while start > 0 and self.letter_at(start - 1) is not None:
+                start -= 1
+            
+            node = dawg.walk(self.letter_at(i) for i in range(start, anchor))
+            if node is not None:
+                self.extend_right(node, anchor, anchor, start, [], [])
+        else:
+            # The left part may use empty, non-anchor squares only
+            limit = 0
+            index = anchor - 1
+            while (index >= 0 and self.letter_at(index) is None and
+                   self.square(index) not in self.anchors):
+                limit += 1
+                index -= 1
+            
+            self.left_part(dawg.ROOT, limit, anchor, [])
+    
+    def left_part(self, node, limit, anchor, left):
+        """Build left parts from the rack, extending right from each.
+        
+        Args:
+            node: The DAWG node for the current left part.
+            limit: How many more squares the left part may use.
+            anchor: The anchor's position along the current line.
+            left: The letters of the current left part.
+        """
+        self.extend_right(node, anchor, anchor, anchor - len(left), left, [])
+        
+        if limit > 0:
+            rack = self.rack
+            for letter, child in self.dawg.get_edges(node).items():
+                if rack.get(letter):
+                    rack[letter] -= 1
+                    left.append(letter)
+                    self.left_part(child, limit - 1, anchor, left)
+                    left.pop()
+                    rack[letter] += 1
+    
+    def extend_right(self, node, index, anchor, start, left, placed):
+        """Extend a partial word rightwards from a position.
+        
+        Args:
+            node: The DAWG node for the letters so far.
+            index: The next position along the current line.
+            anchor: The anchor's position along the current line.
+            start: The position where the word starts.
+            left: The letters of the left part.
+            placed: (position, letter) pairs for rack tiles placed at or after the anchor.
+        """
+        dawg = self.dawg
+        size = self.board.size
+        
+        if index < size:
+            existing = self.letter_at(index)
+        else:
+            existing = None
+        
+        if existing is not None:
+            child = dawg.get_child(node, existing)
+            if child is not None:
+                self.extend_right(child, index + 1, anchor, start, left, placed)
+            return
+        
+        if index > anchor and dawg.is_terminal(node):
+            self.record_move(start, index, left, placed)
+        
+        if index >= size:
+            return
+        
+        rack = self.rack
+        row, col = self.square(index)
+        mask = self.cross_checks[row * size + col]
+        for letter, child in dawg.get_edges(node).items():
+            if rack.get(letter) and mask & letter_bit(letter):
+                rack[letter] -= 1
+                placed.append((index, letter))
+                self.extend_right(child, index + 1, anchor, start, left, placed)
+                placed.pop()
+                rack[letter] += 1
+    
+    def record_move(self, start, end, left, placed):
+        """Record a complete move.
+        
+        Args:
+            start: The position where the word starts.
+            end: The position just past the end of the word.
+            left: The letters of the left part.
+            placed: (position, letter) pairs for rack tiles at or after the anchor.
+        """
+        new_letters = {start + i: letter for i, letter in enumerate(left)}
+        new_letters.update(placed)
+        
+        word = ""
+        tiles = []
+        for index in range(start, end):
+            row, col = self.square(index)
+            letter = new_letters.get(index)
+            if letter is None:
+                word += self.letter_at(index)
+            else:
+                word += letter
+                tiles.append((row, col, letter, self.values[letter]))
+        
+        self.moves.append({
+            'word': word,
+            'position': self.square(start),
+            'direction': 'horizontal' if self.horizontal else 'vertical',
+            'tiles': tiles
+        })
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.ai.move_generator import MoveGenerator
+from src.game.board import Board
+from src.game.score_calculator import ScoreCalculator
+
+# Per-process state for pool workers, set up by init_worker()
+_worker_state = {}
+
+class Simulator:
+    """Chooses between candidate moves with Monte Carlo rollouts.
+    
+    Each rollout plays a candidate, deals the opponent a random rack from the
+    unseen tiles, and then lets both sides play their highest-scoring move for
+    the remaining plies. A candidate's equity is the mean score difference
+    over its rollouts. Rollouts run in rounds (one per candidate) until the
+    iteration or time budget is spent, or until the leader's confidence
+    interval no longer overlaps any other candidate's.
+    
+    Every rollout draws from its own generator seeded by (seed, candidate,
+    iteration), so a fixed seed always gives the same results.
+    """
+    
+    def __init__(self, board, dawg, score_calculator, plies=3, max_iterations=200,
+                 time_limit=3.0, min_rounds=4, confidence=1.96):
+        """Initialize the simulator.
+        
+        Args:
+            board: The game board. Rollouts play on it and undo their moves.
+            dawg: The word graph for the lexicon.
+            score_calculator: The score calculator.
+            plies: Plies per rollout, counting the candidate move itself.
+            max_iterations: The maximum number of rollouts in total.
+            time_limit: The wall-clock budget in seconds (None for no limit).
+            min_rounds: Rounds to run before stopping early.
+            confidence: The z-value used for the confidence intervals.
+        """
+        self.board = board
+        self.dawg = dawg
+        self.score_calculator = score_calculator
+        self.plies = plies
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.min_rounds = min_rounds
+        self.confidence = confidence
+        
+        # Statistics for the last simulation
+        self.iterations = 0
+        self.rounds = 0
+        
+        # Set by cancel(), possibly from another thread
+        self.cancelled = False
+    
+    def simulate(self, candidates, rack, unseen_tiles, seed):
+        """Simulate candidate moves and rank them by equity.
+        
+        Args:
+            candidates: The candidate moves (with 'tiles' and 'score').
+            rack: The player's rack as (letter, value) tuples.
+            unseen_tiles: The tiles the player cannot see (bag plus opponent rack).
+            seed: The base seed for the rollouts.
+        
+        Returns:
+            list: Result dictionaries with 'move', 'equity', 'stderr' and
+                  'rollouts' keys, best first.
+        """
+        results = [{'move': move, 'equities': []} for move in candidates]
+        
+        self.iterations = 0
+        self.rounds = 0
+        
+        if not candidates:
+            return []
+        
+        start_time = time.time()
+        
+        while self.iterations + len(results) <= self.max_iterations:
+            active = list(range(len(results)))
+            equities = self.run_round(candidates, active, rack, unseen_tiles, seed, self.rounds)
+            
+            for index, equity in zip(active, equities):
+                results[index]['equities'].append(equity)
+            
+            self.iterations += len(active)
+            self.rounds += 1
+            
+            if self.rounds >= self.min_rounds and self.is_separated(results):
+                break
+            
+            if self.time_limit is not None and time.time() - start_time >= self.time_limit:
+                break
+            
+            if self.cancelled:
+                break
+        
+        return self.summarize(results)
+    
+    def cancel(self):
+        """Stop the simulation after the current round."""
+        self.cancelled = True
+    
+    def run_round(self, candidates, active, rack, unseen_tiles, seed, iteration):
+        """Run one rollout for each active candidate.
+        
+        Args:
+            candidates: The candidate moves.
+            active: The indexes of the candidates to roll out.
+            rack: The player's rack.
+            unseen_tiles: The tiles the player cannot see.
+            seed: The base seed for the rollouts.
+            iteration: The round number.
+        
+        Returns:
+            list: The equity of each rollout, in the order of active.
+        """
+        return [self.rollout(candidates[index], rack, unseen_tiles,
+                             rollout_seed(seed, index, iteration))
+                for index in active]
+    
+    def rollout(self, move, rack, unseen_tiles, seed):
+        """Play out one random continuation of a move.
+        
+        Args:
+            move: The candidate move.
+            rack: The player's rack before the move.
+            unseen_tiles: The tiles the player cannot see.
+            seed: The seed for this rollout.
+        
+        Returns:
+            float: The player's score minus the opponent's over the rollout.
+        """
+        rng = random.Random(seed)
+        
+        # Deal the opponent's rack; the rest of the unseen tiles form the bag
+        bag = list(unseen_tiles)
+        rng.shuffle(bag)
+        opponent_rack = bag[:7]
+        del bag[:7]
+        
+        own_rack = remove_tiles(rack, move['tiles'])
+        draw_tiles(own_rack, bag)
+        
+        played = []
+        self.play(move, played)
+        equity = move['score']
+        
+        racks = [opponent_rack, own_rack]
+        sign = -1
+        for ply in range(1, self.plies):
+            mover = (ply - 1) % 2
+            reply = self.best_move(racks[mover])
+            
+            if reply is not None:
+                self.play(reply, played)
+                equity += sign * reply['score']
+                racks[mover] = remove_tiles(racks[mover], reply['tiles'])
+                draw_tiles(racks[mover], bag)
+                
+                if not racks[mover]:
+                    # The mover went out
+                    break
+            
+            sign = -sign
+        
+        # Restore the board
+        for played_move in reversed(played):
+            for row, col, _, _ in played_move['tiles']:
+                self.board.remove_tile(row, col)
+        
+        return equity
+    
+    def best_move(self, tiles):
+        """Find the highest-scoring move for a rack.
+        
+        Args:
+            tiles: The rack as (letter, value) tuples.
+        
+        Returns:
+            dict: The best move with its 'score', or None if there is none.
+        """
+        generator = MoveGenerator(self.board, self.dawg)
+        moves = generator.generate_moves(tiles, self.board.get_anchors())
+        
+        if not moves:
+            return None
+        
+        scores = self.score_calculator.score_placements(
+            [move['tiles'] for move in moves], self.board
+        )
+        
+        # Ties keep generation order
+        best_index = max(range(len(moves)), key=lambda i: (scores[i], -i))
+        best = moves[best_index]
+        best['score'] = scores[best_index]
+        return best
+    
+    def play(self, move, played):
+        """Place a move's tiles on the board.
+        
+        Args:
+            move: The move to place.
+            played: The list of moves played so far in the rollout.
+        """
+        for row, col, letter, value in move['tiles']:
+            self.board.place_tile(row, col, letter, value)
+        played.append(move)
+    
+    def is_separated(self, results):
+        """Check if the leader's confidence interval clears every other candidate.
+        
+        Args:
+            results: The per-candidate results so far.
+        
+        Returns:
+            bool: True if the leading candidate is clearly the best.
+        """
+        if len(results) < 2:
+            return True
+        
+        intervals = []
+        for result in results:
+            mean, stderr = mean_and_stderr(result['equities'])
+            intervals.append((mean - self.confidence * stderr, mean + self.confidence * stderr, mean))
+        
+        leader = max(range(len(intervals)), key=lambda i: intervals[i][2])
+        lower_bound = intervals[leader][0]
+        
+        return all(upper < lower_bound for i, (_, upper, _) in enumerate(intervals) if i != leader)
+    
+    def summarize(self, results):
+        """Turn raw rollout results into a ranking.
+        
+        Args:
+            results: The per-candidate results.
+        
+        Returns:
+            list: Result dictionaries, best first (ties keep candidate order).
+        """
+        summary = []
+        for result in results:
+            mean, stderr = mean_and_stderr(result['equities'])
+            summary.append({
+                'move': result['move'],
+                'equity': mean,
+                'stderr': stderr,
+                'rollouts': len(result['equities'])
+            })
+        
+        summary.sort(key=lambda x: x['equity'], reverse=True)
+        return summary
+
+class ParallelSimulator(Simulator):
+    """Simulator that spreads each round of rollouts over a process pool.
+    
+    The pool's workers hold the word graph (see create_simulation_pool()), and
+    each task carries a board snapshot plus the rollouts to run. Rollouts are
+    seeded exactly as in the serial simulator, so for a fixed seed and no
+    time limit both give identical results.
+    """
+    
+    def __init__(self, board, dawg, score_calculator, executor, workers, **kwargs):
+        """Initialize the parallel simulator.
+        
+        Args:
+            board: The game board.
+            dawg: The word graph for the lexicon.
+            score_calculator: The score calculator.
+            executor: A pool returned by create_simulation_pool().
+            workers: The number of processes in the pool.
+            **kwargs: Budget settings passed on to Simulator.
+        """
+        super().__init__(board, dawg, score_calculator, **kwargs)
+        self.executor = executor
+        self.workers = workers
+    
+    def run_round(self, candidates, active, rack, unseen_tiles, seed, iteration):
+        """Run one rollout for each active candidate on the pool.
+        
+        Args:
+            candidates: The candidate moves.
+            active: The indexes of the candidates to roll out.
+            rack: The player's rack.
+            unseen_tiles: The tiles the player cannot see.
+            seed: The base seed for the rollouts.
+            iteration: The round number.
+        
+        Returns:
+            list: The equity of each rollout, in the order of active.
+        """
+        snapshot = self.board.get_snapshot()
+        
+        # One task per worker, each taking every n-th candidate
+        chunks = [active[i::self.workers] for i in range(self.workers)]
+        futures = []
+        for chunk in chunks:
+            if chunk:
+                futures.append(self.executor.submit(
+                    run_rollouts,
+                    snapshot,
+                    [candidates[index] for index in chunk],
+                    rack,
+                    unseen_tiles,
+                    self.plies,
+                    [rollout_seed(seed, index, iteration) for index in chunk]
+                ))
+        
+        equities = {}
+        for chunk, future in zip([chunk for chunk in chunks if chunk], futures):
+            equities.update(zip(chunk, future.result()))
+        
+        return [equities[index] for index in active]
+
+def create_simulation_pool(dawg, workers):
+    """Start a process pool for ParallelSimulator.
+    
+    Args:
+        dawg: The word graph, sent once to every worker.
+        workers: The number of processes.
+    
+    Returns:
+        ProcessPoolExecutor: The pool. The caller shuts it down.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                               initargs=(dawg,))
+
+def init_worker(dawg):
+    """Set up a pool worker.
+    
+    Args:
+        dawg: The word graph for the lexicon.
+    """
+    _worker_state['dawg'] = dawg
+    _worker_state['score_calculator'] = ScoreCalculator()
+    _worker_state['snapshot'] = None
+    _worker_state['simulator'] = None
+
+def run_rollouts(snapshot, moves, rack, unseen_tiles, plies, seeds):
+    """Run rollouts in a pool worker.
+    
+    The board is rebuilt only when the snapshot changes, i.e. once per turn.
+    
+    Args:
+        snapshot: The board snapshot from Board.get_snapshot().
+        moves: The candidate moves to roll out.
+        rack: The player's rack.
+        unseen_tiles: The tiles the player cannot see.
+        plies: Plies per rollout.
+        seeds: One rollout seed per move.
+    
+    Returns:
+        list: The equity of each rollout.
+    """
+    if _worker_state['snapshot'] != snapshot:
+        board = Board.from_snapshot(snapshot, _worker_state['dawg'])
+        _worker_state['simulator'] = Simulator(board, _worker_state['dawg'],
+                                               _worker_state['score_calculator'])
+        _worker_state['snapshot'] = snapshot
+    
+    simulator = _worker_state['simulator']
+    simulator.plies = plies
+    return [simulator.rollout(move, rack, unseen_tiles, seed)
+            for move, seed in zip(moves, seeds)]
+
+def rollout_seed(seed, index, iteration):
+    """Derive the seed for one rollout.
+    
+    Args:
+        seed: The base seed.
+        index: The candidate's index.
+        iteration: The round number.
+    
+    Returns:
+        str: A seed for random.Random.
+    """
+    return "%s:%d:%d" % (seed, index, iteration)
+
+def remove_tiles(rack, tiles):
+    """Get a copy of a rack with a move's tiles taken out.
+    
+    Args:
+        rack: The rack as (letter, value) tuples.
+        tiles: The move's (row, col, letter, value) tuples.
+    
+    Returns:
+        list: The remaining tiles.
+    """
+    remaining = list(rack)
+    for _, _, letter, _ in tiles:
+        for i, (rack_letter, _) in enumerate(remaining):
+            if rack_letter.upper() == letter.upper():
+                remaining.pop(i)
+                break
+    return remaining
+
+def draw_tiles(rack, bag):
+    """Refill a rack to seven tiles from the front of a bag.
+    
+    Args:
+        rack: The rack to refill (modified in place).
+        bag: The shuffled bag (modified in place).
+    """
+    count = min(7 - len(rack), len(bag))
+    if count > 0:
+        rack.extend(bag[:count])
+        del bag[:count]
+
+def mean_and_stderr(values):
+    """Compute the mean and standard error of a sample.
+    
+    Args:
+        values: The sample.
+    
+    Returns:
+        tuple: (mean, standard error); the error is infinite for fewer than two values.
+    """
+    count = len(values)
+    if count == 0:
+        return 0.0, float('inf')
+    
+    mean = sum(values) / count
+    if count < 2:
+        return mean, float('inf')
+    
+    variance = sum((value - mean) ** 2 for value in values) / (count - 1)
+    return mean, math.sqrt(variance / count)
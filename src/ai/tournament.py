@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Play AI configurations against each other and compare their strength.
+
+Usage:
+    python -m src.ai.tournament hard medium --games 200 --workers 4
+    python -m src.ai.tournament "hard,use_simulation=True" hard --games 100
+
+A configuration is a difficulty, optionally followed by AIPlayer keyword
+arguments (e.g. "hard,time_limit=0.5,search_budget=300"). Games are played
+on GameEngine with the two configurations swapping who moves first, and are
+spread across a process pool.
+"""
+
+import argparse
+import ast
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.ai.ai_player import AIPlayer
+from src.ai.simulator import mean_and_stderr
+from src.data.database import DatabaseManager
+from src.game.game_engine import GameEngine
+from src.game.player import Player
+from src.game.word_validator import WordValidator
+
+# Per-process state for pool workers, set by init_worker()
+_worker_state = {}
+
+def parse_config(spec):
+    """Parse a configuration spec.
+    
+    Args:
+        spec: A difficulty, optionally followed by comma-separated
+            key=value AIPlayer arguments.
+    
+    Returns:
+        tuple: (difficulty, options dict).
+    
+    Raises:
+        ValueError: If the spec is malformed.
+    """
+    parts = [part.strip() for part in spec.split(",")]
+    difficulty = parts[0].lower()
+    if difficulty not in ("easy", "medium", "hard"):
+        raise ValueError("Unknown difficulty %r in %r" % (parts[0], spec))
+    
+    options = {}
+    for part in parts[1:]:
+        if "=" not in part:
+            raise ValueError("Expected key=value, got %r in %r" % (part, spec))
+        key, text = part.split("=", 1)
+        text = text.strip()
+        if text.lower() in ("true", "false"):
+            value = text.lower() == "true"
+        else:
+            try:
+                value = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                value = text
+        options[key.strip()] = value
+    
+    return difficulty, options
+
+def init_worker(db_path):
+    """Set up a tournament process.
+    
+    Args:
+        db_path: The database holding the dictionary.
+    """
+    word_validator = WordValidator(DatabaseManager(db_path))
+    word_validator.get_dawg()
+    _worker_state['word_validator'] = word_validator
+
+def play_game(configs, a_first, seed, max_turns=200):
+    """Play one game between two configurations.
+    
+    Args:
+        configs: {'a': (difficulty, options), 'b': (difficulty, options)}.
+        a_first: Whether configuration A moves first.
+        seed: The random seed for the game.
+        max_turns: The most turns to play before stopping the game.
+    
+    Returns:
+        dict: The game's 'seed', final 'scores' and per-configuration move
+              'latencies' in seconds, keyed by 'a' and 'b'.
+    """
+    word_validator = _worker_state['word_validator']
+    
+    # The engine's player side moves first
+    first, second = ("a", "b") if a_first else ("b", "a")
+    difficulty, options = configs[second]
+    engine = GameEngine(word_validator, Player(1, "First"), difficulty, options, seed)
+    engine.initialize_game()
+    
+    difficulty, options = configs[first]
+    first_ai = AIPlayer(engine.player, difficulty, engine.board, word_validator,
+                        engine.score_calculator, rng=random.Random("%s:player" % seed),
+                        **options)
+    
+    latencies = {"a": [], "b": []}
+    
+    for _ in range(max_turns):
+        if engine.is_game_over:
+            break
+        
+        tiles_remaining = engine.tile_bag.get_remaining_tiles_count()
+        
+        if engine.current_player == "player":
+            unseen_tiles = engine.tile_bag.get_remaining_tiles() + engine.ai_player.player.get_tiles()
+            started = time.perf_counter()
+            move = first_ai.make_move(tiles_remaining, unseen_tiles)
+            latencies[first].append(time.perf_counter() - started)
+            
+            if not move or not engine.play_move(move['tiles']):
+                engine.pass_turn()
+        else:
+            started = time.perf_counter()
+            move = engine.ai_player.make_move(tiles_remaining, engine.get_unseen_tiles())
+            latencies[second].append(time.perf_counter() - started)
+            
+            engine.apply_ai_move(move)
+    
+    first_ai.shutdown()
+    engine.ai_player.shutdown()
+    
+    return {
+        "seed": seed,
+        "scores": {first: engine.player_score, second: engine.ai_score},
+        "latencies": latencies
+    }
+
+def run_tournament(configs, games, db_path, workers=1, seed=0, progress=None):
+    """Play a series of games.
+    
+    Args:
+        configs: {'a': (difficulty, options), 'b': (difficulty, options)}.
+        games: The number of games.
+        db_path: The database holding the dictionary.
+        workers: The number of processes (1 plays in this process).
+        seed: The seed of the first game; game i uses seed + i.
+        progress: Optional callable taking (games finished, games).
+    
+    Returns:
+        list: The game results from play_game(), in game order.
+    """
+    jobs = [(configs, index % 2 == 0, seed + index) for index in range(games)]
+    results = []
+    
+    if workers <= 1:
+        init_worker(db_path)
+        for job in jobs:
+            results.append(play_game(*job))
+            if progress:
+                progress(len(results), games)
+        return results
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(db_path,)) as executor:
+        futures = [executor.submit(play_game, *job) for job in jobs]
+        for future in futures:
+            results.append(future.result())
+            if progress:
+                progress(len(results), games)
+    
+    return results
+
+def percentile(values, fraction):
+    """Get a percentile of a sample by the nearest-rank method.
+    
+    Args:
+        values: The sample.
+        fraction: The percentile as a fraction (0.9 for the 90th).
+    
+    Returns:
+        float: The percentile, or 0.0 for an empty sample.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(results, confidence=1.96):
+    """Compute tournament statistics from A's point of view.
+    
+    Args:
+        results: The game results.
+        confidence: The z-value for confidence intervals (1.96 for 95%).
+    
+    Returns:
+        dict: Wins, ties, losses, win rate and spread with their intervals,
+              and per-configuration move counts, speed and latency percentiles.
+    """
+    spreads = [result["scores"]["a"] - result["scores"]["b"] for result in results]
+    wins = sum(1 for spread in spreads if spread > 0)
+    ties = sum(1 for spread in spreads if spread == 0)
+    
+    # Ties count as half a win
+    points = [1.0 if spread > 0 else 0.5 if spread == 0 else 0.0 for spread in spreads]
+    win_rate, win_rate_error = mean_and_stderr(points)
+    spread, spread_error = mean_and_stderr(spreads)
+    
+    summary = {
+        "games": len(results),
+        "wins": wins,
+        "ties": ties,
+        "losses": len(results) - wins - ties,
+        "win_rate": win_rate,
+        "win_rate_interval": (win_rate - confidence * win_rate_error,
+                              win_rate + confidence * win_rate_error),
+        "spread": spread,
+        "spread_interval": (spread - confidence * spread_error,
+                            spread + confidence * spread_error),
+        "sides": {}
+    }
+    
+    for side in ("a", "b"):
+        latencies = [latency for result in results for latency in result["latencies"][side]]
+        thinking = sum(latencies)
+        summary["sides"][side] = {
+            "moves": len(latencies),
+            "thinking_seconds": thinking,
+            "moves_per_second": len(latencies) / thinking if thinking else 0.0,
+            "p50": percentile(latencies, 0.5),
+            "p90": percentile(latencies, 0.9),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else 0.0
+        }
+    
+    return summary
+
+def format_summary(summary, labels, elapsed):
+    """Format tournament statistics as a text report.
+    
+    Args:
+        summary: The statistics from summarize().
+        labels: {'a': spec, 'b': spec}.
+        elapsed: The wall-clock time of the tournament in seconds.
+    
+    Returns:
+        str: The report.
+    """
+    low, high = summary["win_rate_interval"]
+    spread_low, spread_high = summary["spread_interval"]
+    lines = [
+        "A: %s" % labels["a"],
+        "B: %s" % labels["b"],
+        "%d games in %.1f s" % (summary["games"], elapsed),
+        "A won %d, tied %d, lost %d: win rate %.1f%% (95%% CI %.1f%% to %.1f%%)" % (
+            summary["wins"], summary["ties"], summary["losses"],
+            100 * summary["win_rate"], 100 * max(0.0, low), 100 * min(1.0, high)),
+        "Mean spread (A - B): %+.1f (95%% CI %+.1f to %+.1f)" % (
+            summary["spread"], spread_low, spread_high),
+        "",
+        "%-4s %7s %10s %10s %9s %9s %9s %9s" % (
+            "", "moves", "cpu s", "moves/s", "p50 ms", "p90 ms", "p99 ms", "max ms"),
+    ]
+    for side in ("a", "b"):
+        stats = summary["sides"][side]
+        lines.append("%-4s %7d %10.1f %10.2f %9.1f %9.1f %9.1f %9.1f" % (
+            side.upper(), stats["moves"], stats["thinking_seconds"], stats["moves_per_second"],
+            1000 * stats["p50"], 1000 * stats["p90"], 1000 * stats["p99"], 1000 * stats["max"]))
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Run a tournament from the command line.
+    
+    Args:
+        argv: Optional argument list (defaults to sys.argv[1:]).
+    
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Play two AI configurations against each other.")
+    parser.add_argument("a", help='configuration A, e.g. "hard" or "hard,time_limit=0.5"')
+    parser.add_argument("b", help="configuration B")
+    parser.add_argument("--games", type=int, default=100, help="number of games")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--database", default="resources/scrabble.db",
+                        help="database holding the dictionary")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args(argv)
+    
+    try:
+        configs = {"a": parse_config(args.a), "b": parse_config(args.b)}
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # Make sure the dictionary is loaded before the workers read it
+    db_manager = DatabaseManager(args.database)
+    db_manager.initialize_database()
+    WordValidator(db_manager)
+    
+    def progress(done, total):
+        print("\rGame %d/%d" % (done, total), end="", file=sys.stderr, flush=True)
+    
+    started = time.time()
+    results = run_tournament(configs, args.games, args.database, args.workers, args.seed, progress)
+    elapsed = time.time() - started
+    print(file=sys.stderr)
+    
+    summary = summarize(results)
+    labels = {"a": args.a, "b": args.b}
+    print(format_summary(summary, labels, elapsed))
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"configs": labels, "seed": args.seed, "elapsed": elapsed,
+                       "summary": summary, "games": results}, f, indent=2)
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
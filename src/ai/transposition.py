@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Bound types for stored values
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed by Zobrist hash.
+    
+    Each hash maps to a single slot (hash % capacity), so memory use is
+    bounded. A new entry replaces the one in its slot if the slot is empty,
+    holds the same position, was stored during an earlier search, or was
+    searched no deeper than the new entry (depth-preferred with aging).
+    
+    Entries are tuples of (key, depth, flag, value, move, generation).
+    """
+    
+    def __init__(self, capacity=1 << 16):
+        """Initialize the table.
+        
+        Args:
+            capacity: The number of slots.
+        """
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.generation = 0
+        self.count = 0
+    
+    def new_search(self):
+        """Start a new search; older entries become replaceable."""
+        self.generation += 1
+    
+    def get(self, key):
+        """Look up a position.
+        
+        Args:
+            key: The position's 64-bit hash.
+        
+        Returns:
+            tuple: The stored entry, or None if the position is not stored.
+        """
+        entry = self.slots[key % self.capacity]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+    
+    def store(self, key, depth, flag, value, move):
+        """Store a search result, subject to the replacement policy.
+        
+        Args:
+            key: The position's 64-bit hash.
+            depth: The depth searched below the position.
+            flag: EXACT, LOWER_BOUND or UPPER_BOUND.
+            value: The value found.
+            move: A key for the best move found, or None.
+        """
+        index = key % self.capacity
+        existing = self.slots[index]
+        
+        if existing is None:
+            self.count += 1
+        elif (existing[0] != key and existing[5] == self.generation and
+              depth < existing[1]):
+            # Keep the deeper result from this search
+            return
+        
+        self.slots[index] = (key, depth, flag, value, move, self.generation)
+    
+    def clear(self):
+        """Remove all entries."""
+        self.slots = [None] * self.capacity
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
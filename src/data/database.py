@@ -3,58 +3,181 @@
 
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
 class DatabaseManager:
-    """Manages SQLite database operations for the Scrabble game."""
+    """Manages SQLite database operations for the Scrabble game.
+    
+    Each thread gets one long-lived connection, opened on first use and kept
+    until close(). SQLite connections cannot be shared between threads, so
+    this is a small per-thread pool. Every connection keeps a cache of
+    prepared statements, so the queries below are compiled once per thread.
+    
+    Callers use scoped cursors: transaction() for writes (committed on
+    success, rolled back on error) and scoped_cursor() for reads.
+    
+    The schema is versioned with PRAGMA user_version. initialize_database()
+    brings existing databases up to date by running the MIGRATIONS they have
+    not had yet.
+    """
+    
+    # Prepared statements kept per connection
+    STATEMENT_CACHE_SIZE = 256
+    
+    # Set on every connection. WAL lets readers run alongside a writer and
+    # makes commits cheaper; with WAL, synchronous=NORMAL is still safe
+    # against corruption and only risks the last commits on power loss.
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA mmap_size = 67108864",  # 64 MB
+        "PRAGMA temp_store = MEMORY",
+    )
+    
+    # Schema changes by version; a database at version N gets every
+    # migration after N, in order. Dictionary lookups by word (with or
+    # without a theme) already use the index of its UNIQUE constraint.
+    MIGRATIONS = (
+        (1, (
+            # get_or_create_player() and get_players()
+            "CREATE INDEX IF NOT EXISTS idx_players_name ON players (name)",
+            # get_recent_games(), get_player_stats() and get_saved_games()
+            """CREATE INDEX IF NOT EXISTS idx_games_player_date ON games (
+                player_id, date_played, player_score, ai_score, winner,
+                ai_difficulty, duration
+            )""",
+            # get_word_stats()
+            "CREATE INDEX IF NOT EXISTS idx_moves_player_word ON moves (player_id, word, score)",
+            # load_game()
+            "CREATE INDEX IF NOT EXISTS idx_moves_game ON moves (game_id, move_number)",
+            # get_settings() and save_settings()
+            "CREATE INDEX IF NOT EXISTS idx_settings_player ON settings (player_id)",
+        )),
+    )
     
     def __init__(self, db_path="resources/scrabble.db"):
         """Initialize database manager with path to database file."""
         self.db_path = db_path
-        self.connection = None
-        self.cursor = None
+        self._local = threading.local()
     
     def initialize_database(self):
         """Create database and tables if they don't exist."""
         # Ensure directory exists
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        # Connect to database
-        self.connect()
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
         
         # Create tables
-        self._create_player_table()
-        self._create_game_table()
-        self._create_move_table()
-        self._create_dictionary_table()
-        self._create_settings_table()
+        with self.transaction() as cursor:
+            self._create_player_table(cursor)
+            self._create_game_table(cursor)
+            self._create_move_table(cursor)
+            self._create_dictionary_table(cursor)
+            self._create_settings_table(cursor)
         
-        # Commit changes and close connection
-        self.commit()
-        self.close()
+        self.migrate()
+    
+    def get_schema_version(self):
+        """Get the schema version of the database (0 before any migration)."""
+        with self.scoped_cursor() as cursor:
+            cursor.execute("PRAGMA user_version")
+            return cursor.fetchone()[0]
+    
+    def migrate(self):
+        """Apply the migrations the database has not had yet.
+        
+        Each migration runs in its own transaction together with the version
+        bump, so an interrupted upgrade is retried from the same step.
+        
+        Returns:
+            int: The schema version after migrating.
+        """
+        version = self.get_schema_version()
+        
+        for target, statements in self.MIGRATIONS:
+            if target <= version:
+                continue
+            
+            with self.transaction() as cursor:
+                # sqlite3 only opens transactions implicitly for DML
+                cursor.execute("BEGIN")
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(f"PRAGMA user_version = {int(target)}")
+            
+            # Refresh the query planner's statistics for the new indexes
+            self.connect().execute("ANALYZE")
+            version = target
+        
+        return version
     
     def connect(self):
-        """Connect to the SQLite database."""
-        self.connection = sqlite3.connect(self.db_path)
-        self.cursor = self.connection.cursor()
+        """Get this thread's connection to the database, opening it if needed.
+        
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path,
+                                         cached_statements=self.STATEMENT_CACHE_SIZE)
+            for pragma in self.PRAGMAS:
+                connection.execute(pragma)
+            self._local.connection = connection
+        return connection
     
     def commit(self):
         """Commit changes to the database."""
-        if self.connection:
-            self.connection.commit()
+        connection = getattr(self._local, 'connection', None)
+        if connection:
+            connection.commit()
     
     def close(self):
-        """Close the database connection."""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
-        self.cursor = None
-        self.connection = None
-    
-    def _create_player_table(self):
+        """Close this thread's connection; the next query reopens it."""
+        connection = getattr(self._local, 'connection', None)
+        if connection:
+            # Let SQLite update statistics the connection's queries would use
+            connection.execute("PRAGMA optimize")
+            connection.close()
+        self._local.connection = None
+    
+    @contextmanager
+    def transaction(self):
+        """Run statements in a transaction.
+        
+        Yields:
+            sqlite3.Cursor: A cursor for this block only. The transaction is
+                committed when the block ends, or rolled back if it raises.
+        """
+        connection = self.connect()
+        cursor = connection.cursor()
+        try:
+            yield cursor
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @contextmanager
+    def scoped_cursor(self):
+        """Get a cursor for reading.
+        
+        Yields:
+            sqlite3.Cursor: A cursor that is closed when the block ends.
+        """
+        cursor = self.connect().cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+    
+    def _create_player_table(self, cursor):
         """Create the player table if it doesn't exist."""
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS players (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
@@ -65,9 +188,9 @@ class DatabaseManager:
         )
         ''')
     
-    def _create_game_table(self):
+    def _create_game_table(self, cursor):
         """Create the game table if it doesn't exist."""
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS games (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             player_id INTEGER,
@@ -83,9 +206,9 @@ class DatabaseManager:
         )
         ''')
     
-    def _create_move_table(self):
+    def _create_move_table(self, cursor):
         """Create the move table if it doesn't exist."""
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS moves (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             game_id INTEGER,
@@ -101,9 +224,9 @@ class DatabaseManager:
         )
         ''')
     
-    def _create_dictionary_table(self):
+    def _create_dictionary_table(self, cursor):
         """Create the dictionary table if it doesn't exist."""
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS dictionary (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             word TEXT UNIQUE,
@@ -112,9 +235,9 @@ class DatabaseManager:
         )
         ''')
     
-    def _create_settings_table(self):
+    def _create_settings_table(self, cursor):
         """Create the settings table if it doesn't exist."""
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS settings (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             player_id INTEGER,
@@ -128,51 +251,88 @@ class DatabaseManager:
         )
         ''')
     
-    def save_game(self, player_id, ai_difficulty, player_score, ai_score, 
+    def get_or_create_player(self, name):
+        """Get the id of the player with a name, creating the player if needed."""
+        with self.transaction() as cursor:
+            cursor.execute('''
+            SELECT id FROM players WHERE name = ?
+            ''', (name,))
+            player = cursor.fetchone()
+            
+            if player:
+                return player[0]
+            
+            cursor.execute('''
+            INSERT INTO players (name) VALUES (?)
+            ''', (name,))
+            return cursor.lastrowid
+    
+    def get_player(self, player_id):
+        """Get the (id, name) of a player."""
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT id, name FROM players WHERE id = ?
+            ''', (player_id,))
+            return cursor.fetchone()
+    
+    def get_players(self):
+        """Get the (id, name) of every player, ordered by name."""
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT id, name FROM players ORDER BY name
+            ''')
+            return cursor.fetchall()
+    
+    def save_game(self, player_id, ai_difficulty, player_score, ai_score,
                   winner, duration, board_config, completed=False):
         """Save a game to the database."""
-        self.connect()
-        self.cursor.execute('''
-        INSERT INTO games (
-            player_id, ai_difficulty, player_score, ai_score, winner, 
-            duration, board_config, completed, date_played
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (player_id, ai_difficulty, player_score, ai_score, winner, 
-              duration, board_config, completed, datetime.now()))
-        
-        game_id = self.cursor.lastrowid
-        self.commit()
-        self.close()
-        return game_id
+        with self.transaction() as cursor:
+            cursor.execute('''
+            INSERT INTO games (
+                player_id, ai_difficulty, player_score, ai_score, winner,
+                duration, board_config, completed, date_played
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (player_id, ai_difficulty, player_score, ai_score, winner,
+                  duration, board_config, completed, datetime.now()))
+            
+            return cursor.lastrowid
+    
+    def update_game(self, game_id, player_score, ai_score, winner, duration,
+                    board_config, completed=False):
+        """Update a saved game; a completed game stays completed."""
+        with self.transaction() as cursor:
+            cursor.execute('''
+            UPDATE games
+            SET player_score = ?, ai_score = ?, winner = ?,
+                duration = ?, board_config = ?, completed = MAX(completed, ?)
+            WHERE id = ?
+            ''', (player_score, ai_score, winner, duration, board_config,
+                  1 if completed else 0, game_id))
     
     def load_game(self, game_id):
         """Load a game from the database."""
-        self.connect()
-        self.cursor.execute('''
-        SELECT * FROM games WHERE id = ?
-        ''', (game_id,))
-        game_data = self.cursor.fetchone()
-        
-        if game_data:
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT * FROM games WHERE id = ?
+            ''', (game_id,))
+            game_data = cursor.fetchone()
+            
+            if not game_data:
+                return None
+            
             # Get moves for this game
-            self.cursor.execute('''
+            cursor.execute('''
             SELECT * FROM moves WHERE game_id = ? ORDER BY move_number
             ''', (game_id,))
-            moves = self.cursor.fetchall()
-            
-            self.close()
-            return {
-                'game': game_data,
-                'moves': moves
-            }
+            moves = cursor.fetchall()
         
-        self.close()
-        return None
+        return {
+            'game': game_data,
+            'moves': moves
+        }
     
     def get_saved_games(self, player_id=None, completed=None):
         """Get list of saved games, optionally filtered by player and completion status."""
-        self.connect()
-        
         query = "SELECT * FROM games"
         params = []
         
@@ -190,38 +350,35 @@ class DatabaseManager:
         
         query += " ORDER BY date_played DESC"
         
-        self.cursor.execute(query, params)
-        games = self.cursor.fetchall()
-        self.close()
-        
-        return games
+        with self.scoped_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
     
     def save_move(self, game_id, player_id, word, score, position, direction, move_number):
         """Save a move to the database."""
-        self.connect()
-        self.cursor.execute('''
-        INSERT INTO moves (
-            game_id, player_id, word, score, position, direction, move_number
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (game_id, player_id, word, score, position, direction, move_number))
-        
-        move_id = self.cursor.lastrowid
-        self.commit()
-        self.close()
-        return move_id
+        with self.transaction() as cursor:
+            cursor.execute('''
+            INSERT INTO moves (
+                game_id, player_id, word, score, position, direction, move_number
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (game_id, player_id, word, score, position, direction, move_number))
+            
+            return cursor.lastrowid
     
     def get_player_stats(self, player_id):
         """Get statistics for a player."""
-        self.connect()
-        self.cursor.execute('''
-        SELECT * FROM players WHERE id = ?
-        ''', (player_id,))
-        player = self.cursor.fetchone()
-        
-        if player:
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT * FROM players WHERE id = ?
+            ''', (player_id,))
+            player = cursor.fetchone()
+            
+            if not player:
+                return None
+            
             # Get additional stats
-            self.cursor.execute('''
-            SELECT 
+            cursor.execute('''
+            SELECT
                 COUNT(*) as total_games,
                 SUM(player_score) as total_score,
                 MAX(player_score) as highest_score,
@@ -230,38 +387,81 @@ class DatabaseManager:
             FROM games
             WHERE player_id = ?
             ''', (player_id,))
-            stats = self.cursor.fetchone()
+            stats = cursor.fetchone()
+        
+        return {
+            'player': player,
+            'stats': stats
+        }
+    
+    def get_recent_games(self, player_id, limit=10):
+        """Get a player's most recent games for the analytics view."""
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT date_played, player_score, ai_score, winner, ai_difficulty, duration
+            FROM games
+            WHERE player_id = ?
+            ORDER BY date_played DESC
+            LIMIT ?
+            ''', (player_id, limit))
+            return cursor.fetchall()
+    
+    def get_word_stats(self, player_id, limit=20):
+        """Get a player's word statistics for the analytics view.
+        
+        Returns:
+            dict: 'top_words' as (word, score, uses) rows, 'avg_length' (or
+                  None) and 'length_distribution' as (length, count) rows.
+        """
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT word, score, COUNT(*) as uses
+            FROM moves
+            WHERE player_id = ?
+            GROUP BY word
+            ORDER BY score DESC, uses DESC
+            LIMIT ?
+            ''', (player_id, limit))
+            top_words = cursor.fetchall()
             
-            self.close()
-            return {
-                'player': player,
-                'stats': stats
-            }
+            cursor.execute('''
+            SELECT AVG(LENGTH(word)) as avg_length
+            FROM moves
+            WHERE player_id = ?
+            ''', (player_id,))
+            avg_length = cursor.fetchone()
+            
+            cursor.execute('''
+            SELECT LENGTH(word) as length, COUNT(*) as count
+            FROM moves
+            WHERE player_id = ?
+            GROUP BY length
+            ORDER BY length
+            ''', (player_id,))
+            length_distribution = cursor.fetchall()
         
-        self.close()
-        return None
+        return {
+            'top_words': top_words,
+            'avg_length': avg_length[0] if avg_length else None,
+            'length_distribution': length_distribution
+        }
     
     def add_dictionary_word(self, word, points, theme="standard"):
         """Add a word to the dictionary."""
-        self.connect()
         try:
-            self.cursor.execute('''
-            INSERT INTO dictionary (word, points, theme)
-            VALUES (?, ?, ?)
-            ''', (word.lower(), points, theme))
-            self.commit()
-            success = True
+            with self.transaction() as cursor:
+                cursor.execute('''
+                INSERT INTO dictionary (word, points, theme)
+                VALUES (?, ?, ?)
+                ''', (word.lower(), points, theme))
         except sqlite3.IntegrityError:
             # Word already exists
-            success = False
+            return False
         
-        self.close()
-        return success
+        return True
     
     def is_valid_word(self, word, theme=None):
         """Check if a word exists in the dictionary."""
-        self.connect()
-        
         query = "SELECT 1 FROM dictionary WHERE word = ?"
         params = [word.lower()]
         
@@ -269,103 +469,117 @@ class DatabaseManager:
             query += " AND theme = ?"
             params.append(theme)
         
-        self.cursor.execute(query, params)
-        result = self.cursor.fetchone() is not None
+        with self.scoped_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchone() is not None
+    
+    def count_dictionary_words(self):
+        """Get the number of words in the dictionary."""
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT COUNT(*) FROM dictionary
+            ''')
+            return cursor.fetchone()[0]
+    
+    def get_dictionary_fingerprint(self):
+        """Get the (row count, highest id) of the dictionary table.
         
-        self.close()
-        return result
+        Rows are only ever added, so this changes whenever a word is.
+        """
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT COUNT(*), COALESCE(MAX(id), 0) FROM dictionary
+            ''')
+            return tuple(cursor.fetchone())
+    
+    def get_dictionary_entries(self):
+        """Get every (word, theme) pair in the dictionary."""
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT word, theme FROM dictionary
+            ''')
+            return cursor.fetchall()
     
     def get_word_points(self, word):
         """Get the base points value for a word."""
-        self.connect()
-        self.cursor.execute('''
-        SELECT points FROM dictionary WHERE word = ?
-        ''', (word.lower(),))
-        result = self.cursor.fetchone()
-        self.close()
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT points FROM dictionary WHERE word = ?
+            ''', (word.lower(),))
+            result = cursor.fetchone()
         
         return result[0] if result else None
     
     def update_player_stats(self, player_id, games_played_inc=0, score_inc=0, highest_score=None):
         """Update a player's statistics."""
-        self.connect()
-        
-        # Get current stats
-        self.cursor.execute('''
-        SELECT highest_score FROM players WHERE id = ?
-        ''', (player_id,))
-        current = self.cursor.fetchone()
-        
-        if not current:
-            self.close()
-            return False
-        
-        # Update highest score if necessary
-        if highest_score is not None and highest_score > current[0]:
-            self.cursor.execute('''
-            UPDATE players
-            SET games_played = games_played + ?,
-                total_score = total_score + ?,
-                highest_score = ?
-            WHERE id = ?
-            ''', (games_played_inc, score_inc, highest_score, player_id))
-        else:
-            self.cursor.execute('''
-            UPDATE players
-            SET games_played = games_played + ?,
-                total_score = total_score + ?
-            WHERE id = ?
-            ''', (games_played_inc, score_inc, player_id))
+        with self.transaction() as cursor:
+            # Get current stats
+            cursor.execute('''
+            SELECT highest_score FROM players WHERE id = ?
+            ''', (player_id,))
+            current = cursor.fetchone()
+            
+            if not current:
+                return False
+            
+            # Update highest score if necessary
+            if highest_score is not None and highest_score > current[0]:
+                cursor.execute('''
+                UPDATE players
+                SET games_played = games_played + ?,
+                    total_score = total_score + ?,
+                    highest_score = ?
+                WHERE id = ?
+                ''', (games_played_inc, score_inc, highest_score, player_id))
+            else:
+                cursor.execute('''
+                UPDATE players
+                SET games_played = games_played + ?,
+                    total_score = total_score + ?
+                WHERE id = ?
+                ''', (games_played_inc, score_inc, player_id))
         
-        self.commit()
-        self.close()
         return True
     
     def save_settings(self, player_id, settings):
         """Save player settings."""
-        self.connect()
-        
-        # Check if settings exist for this player
-        self.cursor.execute('''
-        SELECT 1 FROM settings WHERE player_id = ?
-        ''', (player_id,))
-        exists = self.cursor.fetchone() is not None
-        
-        if exists:
-            # Update existing settings
-            query = "UPDATE settings SET "
-            updates = []
-            params = []
-            
-            for key, value in settings.items():
-                updates.append(f"{key} = ?")
-                params.append(value)
-            
-            query += ", ".join(updates)
-            query += " WHERE player_id = ?"
-            params.append(player_id)
-            
-            self.cursor.execute(query, params)
-        else:
-            # Insert new settings
-            keys = ["player_id"] + list(settings.keys())
-            placeholders = ["?"] * len(keys)
-            values = [player_id] + list(settings.values())
+        with self.transaction() as cursor:
+            # Check if settings exist for this player
+            cursor.execute('''
+            SELECT 1 FROM settings WHERE player_id = ?
+            ''', (player_id,))
+            exists = cursor.fetchone() is not None
             
-            query = f"INSERT INTO settings ({', '.join(keys)}) VALUES ({', '.join(placeholders)})"
-            self.cursor.execute(query, values)
+            if exists:
+                # Update existing settings
+                query = "UPDATE settings SET "
+                updates = []
+                params = []
+                
+                for key, value in settings.items():
+                    updates.append(f"{key} = ?")
+                    params.append(value)
+                
+                query += ", ".join(updates)
+                query += " WHERE player_id = ?"
+                params.append(player_id)
+                
+                cursor.execute(query, params)
+            else:
+                # Insert new settings
+                keys = ["player_id"] + list(settings.keys())
+                placeholders = ["?"] * len(keys)
+                values = [player_id] + list(settings.values())
+                
+                query = f"INSERT INTO settings ({', '.join(keys)}) VALUES ({', '.join(placeholders)})"
+                cursor.execute(query, values)
         
-        self.commit()
-        self.close()
         return True
     
     def get_settings(self, player_id):
         """Get settings for a player."""
-        self.connect()
-        self.cursor.execute('''
-        SELECT * FROM settings WHERE player_id = ?
-        ''', (player_id,))
-        settings = self.cursor.fetchone()
-        self.close()
-        
-        return settings 
\ No newline at end of file
+        with self.scoped_cursor() as cursor:
+            cursor.execute('''
+            SELECT * FROM settings WHERE player_id = ?
+            ''', (player_id,))
+            return cursor.fetchone()
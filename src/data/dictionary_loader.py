@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Bulk-load words into the dictionary table.
+
+Usage:
+    python -m src.data.dictionary_loader words.txt --theme animals
+    python -m src.data.dictionary_loader --nltk
+
+Words are streamed from a file or any iterable and inserted in batches with
+executemany, all inside one transaction. Secondary indexes on the dictionary
+table are dropped for the load and rebuilt once at the end, so SQLite does
+not update them row by row.
+"""
+
+import argparse
+import itertools
+import sys
+import time
+
+from src.data.database import DatabaseManager
+
+# Standard Scrabble letter values, by lowercase letter
+LETTER_VALUES = {
+    'a': 1, 'b': 3, 'c': 3, 'd': 2, 'e': 1, 'f': 4, 'g': 2, 'h': 4, 'i': 1,
+    'j': 8, 'k': 5, 'l': 1, 'm': 3, 'n': 1, 'o': 1, 'p': 3, 'q': 10, 'r': 1,
+    's': 1, 't': 1, 'u': 1, 'v': 4, 'w': 4, 'x': 8, 'y': 4, 'z': 10
+}
+
+# Valid Scrabble word lengths
+MIN_WORD_LENGTH = 2
+MAX_WORD_LENGTH = 15
+
+DEFAULT_BATCH_SIZE = 10000
+
+def word_points(word):
+    """Get the base point value of a word (the sum of its letter values).
+    
+    Args:
+        word: The word, in any case.
+    
+    Returns:
+        int: The base point value; unknown characters count 0.
+    """
+    get = LETTER_VALUES.get
+    return sum([get(letter, 0) for letter in word.lower()])
+
+def iter_words(source):
+    """Stream normalized words from a source.
+    
+    Args:
+        source: A path to a file with one word per line, or an iterable of
+            words.
+    
+    Yields:
+        str: Each lowercase word of a valid Scrabble length, in source order.
+            Duplicates are passed through; the insert ignores them.
+    """
+    if isinstance(source, str):
+        with open(source, 'r') as f:
+            yield from iter_words(f)
+        return
+    
+    for word in source:
+        word = word.strip().lower()
+        if MIN_WORD_LENGTH <= len(word) <= MAX_WORD_LENGTH:
+            yield word
+
+def iter_batches(words, theme, batch_size=DEFAULT_BATCH_SIZE):
+    """Group words into rows for the dictionary table.
+    
+    Args:
+        words: An iterable of normalized words.
+        theme: The theme of every row.
+        batch_size: The number of rows per batch.
+    
+    Yields:
+        list: (word, points, theme) rows.
+    """
+    get = LETTER_VALUES.get
+    words = iter(words)
+    while True:
+        batch = list(itertools.islice(words, batch_size))
+        if not batch:
+            return
+        yield [(word, sum([get(letter, 0) for letter in word]), theme) for word in batch]
+
+def load_words(db_manager, source, theme="standard", batch_size=DEFAULT_BATCH_SIZE):
+    """Insert words into the dictionary in a single transaction.
+    
+    Words already in the dictionary are skipped. Secondary indexes on the
+    dictionary table are rebuilt after the rows are in; the index behind
+    the UNIQUE constraint on word stays, since it decides what is skipped.
+    
+    Args:
+        db_manager: The database manager.
+        source: A file path or an iterable of words (see iter_words()).
+        theme: The theme to assign to the words.
+        batch_size: The number of rows per executemany call.
+    
+    Returns:
+        dict: 'read' and 'added' word counts, 'seconds' taken and
+              'words_per_second' read.
+    """
+    started = time.perf_counter()
+    connection = db_manager.connect()
+    read = 0
+    
+    with db_manager.transaction() as cursor:
+        # sqlite3 only opens transactions implicitly for DML
+        cursor.execute("BEGIN")
+        changes_before = connection.total_changes
+        
+        # Constraint indexes have no SQL and cannot be dropped
+        cursor.execute('''
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = 'dictionary' AND sql IS NOT NULL
+        ''')
+        deferred_indexes = cursor.fetchall()
+        for name, _ in deferred_indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+        
+        for batch in iter_batches(iter_words(source), theme, batch_size):
+            cursor.executemany(
+                "INSERT OR IGNORE INTO dictionary (word, points, theme) VALUES (?, ?, ?)",
+                batch
+            )
+            read += len(batch)
+        
+        added = connection.total_changes - changes_before
+        
+        for _, sql in deferred_indexes:
+            cursor.execute(sql)
+    
+    seconds = time.perf_counter() - started
+    return {
+        'read': read,
+        'added': added,
+        'seconds': seconds,
+        'words_per_second': read / seconds if seconds else 0.0
+    }
+
+def nltk_words():
+    """Get the NLTK English word list, downloading it if needed.
+    
+    Returns:
+        list: The words.
+    """
+    import nltk
+    
+    nltk.download('words', quiet=True)
+    nltk.download('scowl-wl', quiet=True)
+    
+    from nltk.corpus import words
+    
+    return words.words()
+
+def main(argv=None):
+    """Load a word list from the command line.
+    
+    Args:
+        argv: Optional argument list (defaults to sys.argv[1:]).
+    
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="Bulk-load words into the dictionary.")
+    parser.add_argument("path", nargs="?", help="word list, one word per line")
+    parser.add_argument("--nltk", action="store_true", help="load the NLTK word list instead")
+    parser.add_argument("--theme", default="standard", help="theme of the words")
+    parser.add_argument("--database", default="resources/scrabble.db",
+                        help="database holding the dictionary")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows per executemany call")
+    args = parser.parse_args(argv)
+    
+    if bool(args.path) == args.nltk:
+        parser.error("give a word list path or --nltk")
+    
+    db_manager = DatabaseManager(args.database)
+    db_manager.initialize_database()
+    
+    source = nltk_words() if args.nltk else args.path
+    stats = load_words(db_manager, source, args.theme, args.batch_size)
+    db_manager.close()
+    
+    print("Read %d words, added %d in %.2f s (%.0f words/s)" % (
+        stats['read'], stats['added'], stats['seconds'], stats['words_per_second']))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+class AIWorker(QThread):
+    """Runs the AI's move search on a background thread.
+    
+    The worker searches on a snapshot of the AI (its own copy of the board
+    and rack), so the GUI thread can keep repainting and running its timers.
+    The chosen move is delivered through move_ready, tagged with the search
+    id the worker was started with.
+    """
+    
+    # Signals
+    move_ready = pyqtSignal(object, int)  # Move (or None to pass), search id
+    
+    def __init__(self, ai_player, tiles_remaining, unseen_tiles, search_id):
+        """Initialize the worker.
+        
+        Args:
+            ai_player: The game's AIPlayer; it is snapshotted here, on the
+                calling thread.
+            tiles_remaining: Number of tiles remaining in the bag.
+            unseen_tiles: The tiles the AI cannot see.
+            search_id: An id passed back with the result.
+        """
+        super().__init__()
+        
+        self.ai_player = ai_player.snapshot()
+        self.tiles_remaining = tiles_remaining
+        self.unseen_tiles = list(unseen_tiles)
+        self.search_id = search_id
+    
+    def run(self):
+        """Search for a move and emit it (runs on the worker thread)."""
+        move = self.ai_player.make_move(self.tiles_remaining, self.unseen_tiles)
+        
+        if not self.ai_player.cancelled:
+            self.move_ready.emit(move, self.search_id)
+    
+    def cancel(self):
+        """Stop the search; no result is emitted."""
+        self.ai_player.cancel()
+
+class PonderWorker(QThread):
+    """Works out the AI's replies to likely human moves during the human's turn.
+    
+    Each reply is delivered through prediction_ready with the key of the
+    position it answers (see AIPlayer.ponder_key()), so the controller can
+    reuse it if the human's move leads to that position.
+    """
+    
+    # Signals
+    prediction_ready = pyqtSignal(object, object)  # Position key, move (or None to pass)
+    
+    def __init__(self, ai_player, tiles_remaining, unseen_tiles):
+        """Initialize the worker.
+        
+        Args:
+            ai_player: The game's AIPlayer; it is snapshotted here, on the
+                calling thread.
+            tiles_remaining: Number of tiles remaining in the bag.
+            unseen_tiles: The tiles the AI cannot see.
+        """
+        super().__init__()
+        
+        self.ai_player = ai_player.snapshot()
+        self.tiles_remaining = tiles_remaining
+        self.unseen_tiles = list(unseen_tiles)
+    
+    def run(self):
+        """Ponder until done or cancelled (runs on the worker thread)."""
+        self.ai_player.ponder(self.tiles_remaining, self.unseen_tiles,
+                              self.prediction_ready.emit)
+    
+    def cancel(self):
+        """Stop pondering; no further predictions are emitted."""
+        self.ai_player.cancel()
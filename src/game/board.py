@@ -1,8 +1,25 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from src.game.zobrist import LETTER_SLOTS, square_keys
+
+# Cross-check masks are 26-bit ints, one bit per letter A-Z
+ALL_LETTERS = (1 << 26) - 1
+
+def letter_bit(letter):
+    """Get the cross-check bit for an uppercase letter."""
+    return 1 << (ord(letter) - 65)
+
 class Board:
-    """Represents the Scrabble game board."""
+    """Represents the Scrabble game board.
+    
+    Tiles are stored in flat arrays indexed by row * size + col: a bytearray
+    of letter codes (0 for an empty square) and a bytearray of tile values.
+    Per-row and per-column occupancy bitsets and a tile count make emptiness
+    and occupancy queries constant-time, and copy() is a handful of buffer
+    copies. A Zobrist hash of the tiles is kept up to date for the AI's
+    transposition tables.
+    """
     
     # Bonus tile types
     NORMAL = 0
@@ -11,6 +28,10 @@ class Board:
     DOUBLE_WORD = 3
     TRIPLE_WORD = 4
     
+    # Multipliers applied by each bonus type
+    LETTER_MULTIPLIERS = {DOUBLE_LETTER: 2, TRIPLE_LETTER: 3}
+    WORD_MULTIPLIERS = {DOUBLE_WORD: 2, TRIPLE_WORD: 3}
+    
     def __init__(self, size=15):
         """Initialize a new board with the specified size.
         
@@ -19,11 +40,42 @@ class Board:
         """
         self.size = size
         
-        # Initialize the board grid
-        self.grid = [[None for _ in range(size)] for _ in range(size)]
+        # Initialize the tile storage
+        self.letters = bytearray(size * size)
+        self.values = bytearray(size * size)
+        self.row_bits = [0] * size  # bit col is set if (row, col) has a tile
+        self.col_bits = [0] * size  # bit row is set if (row, col) has a tile
+        self.tile_count = 0
+        
+        # Zobrist hash of the tiles, updated by place_tile() and remove_tile()
+        self.zobrist_keys = square_keys(size)
+        self.zobrist_hash = 0
         
         # Initialize the bonus grid
         self.bonus_grid = [[self.NORMAL for _ in range(size)] for _ in range(size)]
+        
+        # Premium multipliers indexed by row * size + col, rebuilt from the
+        # bonus grid by initialize_bonus_tiles() and randomize_bonus_tiles()
+        self.letter_multipliers = [1] * (size * size)
+        self.word_multipliers = [1] * (size * size)
+        
+        # Cross-checks for move generation, indexed by row * size + col and
+        # keyed by play direction (True for horizontal plays). Only maintained
+        # once a word graph is attached with set_word_graph().
+        self.dawg = None
+        self.cross_checks = {
+            True: [ALL_LETTERS] * (size * size),
+            False: [ALL_LETTERS] * (size * size)
+        }
+        # (score, word multiplier, length) of the perpendicular tiles, or None
+        self.cross_scores = {
+            True: [None] * (size * size),
+            False: [None] * (size * size)
+        }
+        
+        # Anchors: empty squares adjacent to at least one tile
+        self.anchors = set()
+        
         self.initialize_bonus_tiles()
     
     def initialize_bonus_tiles(self):
@@ -59,6 +111,9 @@ class Board:
                           (12, 6), (12, 8),
                           (14, 3), (14, 11)]:
             self.bonus_grid[row][col] = self.DOUBLE_LETTER
+        
+        self.update_multiplier_tables()
+        self.update_all_cross_checks()
     
     def place_tile(self, row, col, letter, value):
         """Place a tile on the board at the specified position.
@@ -77,11 +132,20 @@ class Board:
             return False
         
         # Check if the position is already occupied
-        if self.grid[row][col] is not None:
+        index = row * self.size + col
+        if self.letters[index]:
             return False
         
         # Place the tile
-        self.grid[row][col] = (letter.upper(), value)
+        code = ord(letter.upper())
+        self.letters[index] = code
+        self.values[index] = value
+        self.zobrist_hash ^= self.zobrist_keys[index * LETTER_SLOTS + (code & 31)]
+        self.row_bits[row] |= 1 << col
+        self.col_bits[col] |= 1 << row
+        self.tile_count += 1
+        self.update_anchors_around(row, col)
+        self.update_cross_checks_around(row, col)
         return True
     
     def remove_tile(self, row, col):
@@ -99,11 +163,19 @@ class Board:
             return False
         
         # Check if there's a tile to remove
-        if self.grid[row][col] is None:
+        index = row * self.size + col
+        if not self.letters[index]:
             return False
         
         # Remove the tile
-        self.grid[row][col] = None
+        self.zobrist_hash ^= self.zobrist_keys[index * LETTER_SLOTS + (self.letters[index] & 31)]
+        self.letters[index] = 0
+        self.values[index] = 0
+        self.row_bits[row] &= ~(1 << col)
+        self.col_bits[col] &= ~(1 << row)
+        self.tile_count -= 1
+        self.update_anchors_around(row, col)
+        self.update_cross_checks_around(row, col)
         return True
     
     def get_tile(self, row, col):
@@ -119,7 +191,12 @@ class Board:
         if not self.is_valid_position(row, col):
             return None
         
-        return self.grid[row][col]
+        index = row * self.size + col
+        code = self.letters[index]
+        if not code:
+            return None
+        
+        return (chr(code), self.values[index])
     
     def has_tile(self, row, col):
         """Check if there's a tile at the specified position.
@@ -134,7 +211,7 @@ class Board:
         if not self.is_valid_position(row, col):
             return False
         
-        return self.grid[row][col] is not None
+        return self.letters[row * self.size + col] != 0
     
     def get_bonus_type(self, row, col):
         """Get the bonus type at the specified position.
@@ -151,6 +228,37 @@ class Board:
         
         return self.bonus_grid[row][col]
     
+    def get_anchors(self):
+        """Get the anchor squares (empty squares adjacent to existing tiles).
+        
+        The set is maintained as tiles are placed and removed, so this does
+        not scan the board. Callers must not modify it.
+        
+        Returns:
+            set: A set of (row, col) tuples.
+        """
+        return self.anchors
+    
+    def update_anchors_around(self, row, col):
+        """Update the anchor set after a change at one square.
+        
+        Args:
+            row: The row index of the changed square.
+            col: The column index of the changed square.
+        """
+        for r, c in ((row, col), (row - 1, col), (row, col + 1),
+                     (row + 1, col), (row, col - 1)):
+            if not self.is_valid_position(r, c):
+                continue
+            
+            if not self.letters[r * self.size + c] and (self.has_tile(r - 1, c) or
+                                            self.has_tile(r, c + 1) or
+                                            self.has_tile(r + 1, c) or
+                                            self.has_tile(r, c - 1)):
+                self.anchors.add((r, c))
+            else:
+                self.anchors.discard((r, c))
+    
     def is_valid_position(self, row, col):
         """Check if the specified position is valid on the board.
         
@@ -169,26 +277,187 @@ class Board:
         Returns:
             bool: True if the board is empty, False otherwise.
         """
+        return self.tile_count == 0
+    
+    def get_tile_count(self):
+        """Get the number of tiles on the board.
+        
+        Returns:
+            int: The number of tiles.
+        """
+        return self.tile_count
+    
+    def get_hash(self):
+        """Get the Zobrist hash of the tiles on the board.
+        
+        Returns:
+            int: A 64-bit hash; boards with the same tiles hash equally.
+        """
+        return self.zobrist_hash
+    
+    def get_row_occupancy(self, row):
+        """Get the occupancy bitset of a row.
+        
+        Args:
+            row: The row index (0-based).
+            
+        Returns:
+            int: A bitset with bit col set for every occupied square.
+        """
+        return self.row_bits[row]
+    
+    def get_col_occupancy(self, col):
+        """Get the occupancy bitset of a column.
+        
+        Args:
+            col: The column index (0-based).
+            
+        Returns:
+            int: A bitset with bit row set for every occupied square.
+        """
+        return self.col_bits[col]
+    
+    def get_placed_tiles(self):
+        """Get all tiles on the board, skipping empty rows.
+        
+        Returns:
+            list: A list of (row, col, letter, value) tuples in row-major order.
+        """
+        tiles = []
+        letters = self.letters
+        values = self.values
+        
         for row in range(self.size):
+            if not self.row_bits[row]:
+                continue
+            
+            base = row * self.size
             for col in range(self.size):
-                if self.grid[row][col] is not None:
-                    return False
-        return True
+                code = letters[base + col]
+                if code:
+                    tiles.append((row, col, chr(code), values[base + col]))
+        
+        return tiles
+    
+    @property
+    def grid(self):
+        """The board as a list of rows of (letter, value) tuples or None.
+        
+        This is built on demand; assigning a grid replaces the board contents.
+        """
+        return [[self.get_tile(row, col) for col in range(self.size)]
+                for row in range(self.size)]
+    
+    @grid.setter
+    def grid(self, grid):
+        letters = bytearray(self.size * self.size)
+        values = bytearray(self.size * self.size)
+        
+        for row in range(self.size):
+            for col in range(self.size):
+                tile = grid[row][col]
+                if tile is not None:
+                    letter, value = tile
+                    index = row * self.size + col
+                    letters[index] = ord(letter.upper())
+                    values[index] = value
+        
+        self.set_tiles(letters, values)
+    
+    def set_tiles(self, letters, values):
+        """Replace the board contents.
+        
+        Args:
+            letters: Letter codes indexed by row * size + col (0 for empty).
+            values: Tile values indexed by row * size + col.
+        """
+        self.letters = bytearray(letters)
+        self.values = bytearray(values)
+        self.row_bits = [0] * self.size
+        self.col_bits = [0] * self.size
+        self.tile_count = 0
+        self.zobrist_hash = 0
+        
+        for index, code in enumerate(self.letters):
+            if code:
+                row, col = divmod(index, self.size)
+                self.row_bits[row] |= 1 << col
+                self.col_bits[col] |= 1 << row
+                self.tile_count += 1
+                self.zobrist_hash ^= self.zobrist_keys[index * LETTER_SLOTS + (code & 31)]
+        
+        self.anchors = set()
+        for row in range(self.size):
+            for col in range(self.size):
+                self.update_anchors_around(row, col)
+        self.update_all_cross_checks()
+    
+    def get_snapshot(self):
+        """Get a compact, picklable copy of the board contents.
+        
+        Returns:
+            tuple: (size, letters, values, bonuses), where the last three are
+                   bytes indexed by row * size + col.
+        """
+        bonuses = bytes(bonus for row in self.bonus_grid for bonus in row)
+        return self.size, bytes(self.letters), bytes(self.values), bonuses
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, dawg=None):
+        """Create a board from a snapshot.
+        
+        Args:
+            snapshot: A tuple returned by get_snapshot().
+            dawg: Optional word graph to maintain cross-checks against.
+            
+        Returns:
+            Board: The restored board.
+        """
+        size, letters, values, bonuses = snapshot
+        
+        board = cls(size)
+        board.bonus_grid = [list(bonuses[row * size:(row + 1) * size]) for row in range(size)]
+        board.update_multiplier_tables()
+        board.dawg = dawg
+        board.set_tiles(letters, values)
+        return board
+    
+    def copy(self):
+        """Create an independent copy of the board.
+        
+        Returns:
+            Board: A board with the same tiles, bonuses and cross-checks.
+        """
+        board = Board.__new__(Board)
+        board.size = self.size
+        board.letters = self.letters[:]
+        board.values = self.values[:]
+        board.row_bits = self.row_bits[:]
+        board.col_bits = self.col_bits[:]
+        board.tile_count = self.tile_count
+        board.zobrist_keys = self.zobrist_keys
+        board.zobrist_hash = self.zobrist_hash
+        board.bonus_grid = [row[:] for row in self.bonus_grid]
+        board.letter_multipliers = self.letter_multipliers[:]
+        board.word_multipliers = self.word_multipliers[:]
+        board.dawg = self.dawg
+        board.cross_checks = {h: checks[:] for h, checks in self.cross_checks.items()}
+        board.cross_scores = {h: scores[:] for h, scores in self.cross_scores.items()}
+        board.anchors = set(self.anchors)
+        return board
     
     def get_words_from_move(self, tiles):
         """Get all words formed by placing the given tiles on the board.
         
+        The board is not modified; the tiles are overlaid while reading.
+        
         Args:
             tiles: A list of (row, col, letter, value) tuples representing the tiles to place.
             
         Returns:
             list: A list of (word, positions) tuples, where positions is a list of (row, col) tuples.
         """
-        # Temporarily place the tiles on the board
-        original_grid = [row[:] for row in self.grid]
-        
-        for row, col, letter, value in tiles:
-            self.grid[row][col] = (letter.upper(), value)
+        overlay = {(row, col): letter.upper() for row, col, letter, _ in tiles}
         
         words = []
         
@@ -196,8 +465,8 @@ class Board:
         if len(tiles) <= 1:
             # Single tile, check both directions
             for row, col, _, _ in tiles:
-                h_word = self.get_word_at(row, col, True)
-                v_word = self.get_word_at(row, col, False)
+                h_word = self.get_word_at(row, col, True, overlay)
+                v_word = self.get_word_at(row, col, False, overlay)
                 
                 if h_word and len(h_word[0]) > 1:
                     words.append(h_word)
@@ -210,43 +479,50 @@ class Board:
             
             # Get the main word
             for row, col, _, _ in tiles:
-                word = self.get_word_at(row, col, is_horizontal)
+                word = self.get_word_at(row, col, is_horizontal, overlay)
                 if word and len(word[0]) > 1 and word not in words:
                     words.append(word)
                 
                 # Get perpendicular words
-                perp_word = self.get_word_at(row, col, not is_horizontal)
+                perp_word = self.get_word_at(row, col, not is_horizontal, overlay)
                 if perp_word and len(perp_word[0]) > 1 and perp_word not in words:
                     words.append(perp_word)
         
-        # Restore the original grid
-        self.grid = original_grid
-        
         return words
     
-    def get_word_at(self, row, col, horizontal=True):
+    def get_word_at(self, row, col, horizontal=True, overlay=None):
         """Get the word at the specified position in the given direction.
         
         Args:
             row: The row index (0-based).
             col: The column index (0-based).
             horizontal: True for horizontal, False for vertical.
+            overlay: Optional {(row, col): letter} mapping of tiles to read as
+                if they were on the board (they take precedence).
             
         Returns:
             tuple: A (word, positions) tuple, or None if no word is found.
                   positions is a list of (row, col) tuples.
         """
-        if not self.has_tile(row, col):
+        overlay = overlay or {}
+        
+        def letter_at(r, c):
+            letter = overlay.get((r, c))
+            if letter is None and self.has_tile(r, c):
+                letter = chr(self.letters[r * self.size + c])
+            return letter
+        
+        if letter_at(row, col) is None:
             return None
         
         # Find the start of the word
         start_row, start_col = row, col
         
         if horizontal:
-            while start_col > 0 and self.has_tile(start_row, start_col - 1):
+            while start_col > 0 and letter_at(start_row, start_col - 1) is not None:
                 start_col -= 1
         else:
-            while start_row > 0 and self.has_tile(start_row - 1, start_col):
+            while start_row > 0 and letter_at(start_row - 1, start_col) is not None:
                 start_row -= 1
         
         # Collect the word and positions
@@ -254,8 +530,11 @@ class Board:
         positions = []
         curr_row, curr_col = start_row, start_col
         
-        while self.is_valid_position(curr_row, curr_col) and self.has_tile(curr_row, curr_col):
-            letter, _ = self.grid[curr_row][curr_col]
+        while True:
+            letter = letter_at(curr_row, curr_col)
+            if letter is None:
+                break
+            
             word += letter
             positions.append((curr_row, curr_col))
             
@@ -266,9 +545,15 @@ class Board:
         
         return (word, positions) if word else None
     
-    def randomize_bonus_tiles(self):
-        """Randomize the positions of bonus tiles while maintaining the same distribution."""
+    def randomize_bonus_tiles(self, rng=None):
+        """Randomize the positions of bonus tiles while maintaining the same distribution.
+        
+        Args:
+            rng: Optional random.Random to draw positions from (defaults to
+                the random module).
+        """
         import random
+        rng = rng or random
         
         # Count current bonus types
         bonus_counts = {
@@ -299,10 +584,163 @@ class Board:
         for bonus_type, count in bonus_counts.items():
             for _ in range(count):
                 while True:
-                    row = random.randint(0, self.size - 1)
-                    col = random.randint(0, self.size - 1)
+                    row = rng.randint(0, self.size - 1)
+                    col = rng.randint(0, self.size - 1)
                     
                     if (row, col) not in assigned_positions:
                         self.bonus_grid[row][col] = bonus_type
                         assigned_positions.add((row, col))
-                        break 
\ No newline at end of file
+                        break
+        
+        self.update_multiplier_tables()
+        self.update_all_cross_checks()
+    
+    def update_multiplier_tables(self):
+        """Rebuild the premium multiplier tables from the bonus grid."""
+        letter_multipliers = []
+        word_multipliers = []
+        
+        for row in range(self.size):
+            for col in range(self.size):
+                bonus_type = self.bonus_grid[row][col]
+                letter_multipliers.append(self.LETTER_MULTIPLIERS.get(bonus_type, 1))
+                word_multipliers.append(self.WORD_MULTIPLIERS.get(bonus_type, 1))
+        
+        self.letter_multipliers = letter_multipliers
+        self.word_multipliers = word_multipliers
+    
+    def set_word_graph(self, dawg):
+        """Attach a word graph and start maintaining cross-checks.
+        
+        Args:
+            dawg: The word graph used to decide which letters fit each square,
+                or None to stop maintaining cross-checks.
+        """
+        self.dawg = dawg
+        self.update_all_cross_checks()
+    
+    def get_cross_checks(self, horizontal=True):
+        """Get the cross-check masks for plays in one direction.
+        
+        A square's mask has a bit set for every letter that forms a valid
+        perpendicular word there. Squares without perpendicular neighbors
+        allow every letter.
+        
+        Args:
+            horizontal: True for horizontal plays, False for vertical plays.
+            
+        Returns:
+            list: 26-bit masks indexed by row * size + col.
+        """
+        return self.cross_checks[horizontal]
+    
+    def get_cross_scores(self, horizontal=True):
+        """Get the perpendicular word data for plays in one direction.
+        
+        Args:
+            horizontal: True for horizontal plays, False for vertical plays.
+            
+        Returns:
+            list: For each square (indexed by row * size + col), a
+                  (score, word multiplier, length) tuple describing the
+                  perpendicular tiles already on the board, or None if there
+                  are none. The score includes letter bonuses.
+        """
+        return self.cross_scores[horizontal]
+    
+    def update_all_cross_checks(self):
+        """Recompute the cross-checks for every square."""
+        if self.dawg is None:
+            return
+        
+        for row in range(self.size):
+            for col in range(self.size):
+                self.update_cross_check(row, col, True)
+                self.update_cross_check(row, col, False)
+    
+    def update_cross_checks_around(self, row, col):
+        """Recompute the cross-checks affected by a change at one square.
+        
+        Only the square itself and the nearest empty squares at both ends of
+        its row and column runs can change.
+        
+        Args:
+            row: The row index of the changed square.
+            col: The column index of the changed square.
+        """
+        if self.dawg is None:
+            return
+        
+        self.update_cross_check(row, col, True)
+        self.update_cross_check(row, col, False)
+        
+        for step_row, step_col, horizontal in ((1, 0, True), (0, 1, False)):
+            for sign in (-1, 1):
+                r, c = row + sign * step_row, col + sign * step_col
+                while self.has_tile(r, c):
+                    r, c = r + sign * step_row, c + sign * step_col
+                if self.is_valid_position(r, c):
+                    self.update_cross_check(r, c, horizontal)
+    
+    def update_cross_check(self, row, col, horizontal):
+        """Recompute the cross-check and cross-score of one square.
+        
+        Args:
+            row: The row index (0-based).
+            col: The column index (0-based).
+            horizontal: True for horizontal plays (constrained by the vertical
+                word through the square), False for vertical plays.
+        """
+        index = row * self.size + col
+        
+        if self.letters[index]:
+            self.cross_checks[horizontal][index] = ALL_LETTERS
+            self.cross_scores[horizontal][index] = None
+            return
+        
+        if horizontal:
+            step_row, step_col = 1, 0
+        else:
+            step_row, step_col = 0, 1
+        
+        # Collect the perpendicular tiles before and after the square
+        prefix = []
+        r, c = row - step_row, col - step_col
+        while self.has_tile(r, c):
+            prefix.append((r, c))
+            r, c = r - step_row, c - step_col
+        prefix.reverse()
+        
+        suffix = []
+        r, c = row + step_row, col + step_col
+        while self.has_tile(r, c):
+            suffix.append((r, c))
+            r, c = r + step_row, c + step_col
+        
+        if not prefix and not suffix:
+            self.cross_checks[horizontal][index] = ALL_LETTERS
+            self.cross_scores[horizontal][index] = None
+            return
+        
+        dawg = self.dawg
+        mask = 0
+        size = self.size
+        letters = self.letters
+        node = dawg.walk(chr(letters[r * size + c]) for r, c in prefix)
+        if node is not None:
+            suffix_letters = [chr(letters[r * size + c]) for r, c in suffix]
+            for letter, child in dawg.get_edges(node).items():
+                end = dawg.walk(suffix_letters, child)
+                if end is not None and dawg.is_terminal(end):
+                    mask |= letter_bit(letter)
+        
+        # Score the existing tiles the same way ScoreCalculator does
+        score = 0
+        word_multiplier = 1
+        for r, c in prefix + suffix:
+            square = r * size + c
+            score += self.values[square] * self.letter_multipliers[square]
+            word_multiplier *= self.word_multipliers[square]
+        
+        self.cross_checks[horizontal][index] = mask
+        self.cross_scores[horizontal][index] = (score, word_multiplier, len(prefix) + len(suffix)) 
\ No newline at end of file
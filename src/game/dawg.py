@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+class _BuildNode:
+    """Mutable node used while the DAWG is being built."""
+    
+    __slots__ = ('edges', 'terminal')
+    
+    def __init__(self):
+        self.edges = {}
+        self.terminal = False
+
+class Dawg:
+    """Directed acyclic word graph (a minimized trie) over uppercase words.
+    
+    Nodes are plain integers; node 0 is the root. The graph is built with
+    Daciuk's incremental algorithm, so equivalent suffixes share nodes.
+    """
+    
+    ROOT = 0
+    
+    def __init__(self, words=()):
+        """Build a DAWG from a collection of words.
+        
+        Args:
+            words: An iterable of words. Case is ignored.
+        """
+        self.edges = []  # node -> {letter: child node}
+        self.terminal = bytearray()
+        self.word_count = 0
+        self.build(words)
+    
+    def build(self, words):
+        """Build the graph from a collection of words.
+        
+        Args:
+            words: An iterable of words. Case is ignored.
+        """
+        root = _BuildNode()
+        register = {}
+        unchecked = []  # [(parent, letter, child), ...] along the last word
+        previous = ""
+        count = 0
+        
+        def minimize(down_to):
+            for i in range(len(unchecked) - 1, down_to - 1, -1):
+                parent, letter, child = unchecked.pop()
+                key = (child.terminal,
+                       tuple((l, id(c)) for l, c in child.edges.items()))
+                existing = register.get(key)
+                if existing is not None:
+                    parent.edges[letter] = existing
+                else:
+                    register[key] = child
+        
+        for word in sorted(set(word.upper() for word in words)):
+            if not word:
+                continue
+            
+            # Length of the prefix shared with the previous word
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            
+            minimize(common)
+            
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = _BuildNode()
+                node.edges[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            
+            node.terminal = True
+            previous = word
+            count += 1
+        
+        minimize(0)
+        
+        # Flatten the graph into integer-indexed arrays
+        ids = {id(root): 0}
+        order = [root]
+        for node in order:
+            for child in node.edges.values():
+                if id(child) not in ids:
+                    ids[id(child)] = len(order)
+                    order.append(child)
+        
+        self.edges = [{letter: ids[id(child)] for letter, child in node.edges.items()}
+                      for node in order]
+        self.terminal = bytearray(1 if node.terminal else 0 for node in order)
+        self.word_count = count
+    
+    def get_edges(self, node):
+        """Get the outgoing edges of a node.
+        
+        Args:
+            node: The node index.
+        
+        Returns:
+            dict: A mapping of letter to child node.
+        """
+        return self.edges[node]
+    
+    def get_child(self, node, letter):
+        """Follow the edge for a letter.
+        
+        Args:
+            node: The node index.
+            letter: An uppercase letter.
+        
+        Returns:
+            int: The child node, or None if there is no such edge.
+        """
+        return self.edges[node].get(letter)
+    
+    def is_terminal(self, node):
+        """Check if a node ends a word.
+        
+        Args:
+            node: The node index.
+        
+        Returns:
+            bool: True if the path to this node spells a word.
+        """
+        return self.terminal[node] == 1
+    
+    def walk(self, letters, node=ROOT):
+        """Follow a sequence of letters from a node.
+        
+        Args:
+            letters: The uppercase letters to follow.
+            node: The node to start from (defaults to the root).
+        
+        Returns:
+            int: The node reached, or None if the path leaves the graph.
+        """
+        edges = self.edges
+        for letter in letters:
+            node = edges[node].get(letter)
+            if node is None:
+                return None
+        return node
+    
+    def node_count(self):
+        """Get the number of nodes in the graph.
+        
+        Returns:
+            int: The node count.
+        """
+        return len(self.edges)
+    
+    def __contains__(self, word):
+        node = self.walk(word.upper())
+        return node is not None and self.terminal[node] == 1
+    
+    def __len__(self):
+        return self.word_count
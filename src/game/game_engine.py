@@ -0,0 +1,773 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import random
+from datetime import datetime, timedelta
+
+from src.game.board import Board
+from src.game.tile_bag import TileBag
+from src.game.player import Player
+from src.game.score_calculator import ScoreCalculator
+from src.ai.ai_player import AIPlayer
+
+class GameEngine:
+    """Game rules and state for a player against the AI, without any GUI.
+    
+    The engine holds the board, bag and racks, validates and scores moves and
+    runs the turn order. It never waits or schedules anything itself: state
+    changes are reported through optional callbacks, and the AI only moves
+    when play_ai_move() or apply_ai_move() is called. That lets the same
+    rules drive the Qt GUI (see GameController) and headless games.
+    
+    Callbacks (all optional, called on the thread that changed the state):
+        on_board_updated(updates): The board changed; updates is a list of
+            (row, col, 'place', letter, value).
+        on_rack_updated(tiles): The player's rack changed.
+        on_game_info_updated(info): Scores, turn or clock changed; see
+            get_game_info().
+        on_move_result(success, message, score): A submitted move was
+            accepted or rejected.
+        on_move_played(record): A move was played; record is a dict with
+            'player' ("player" or "ai"), 'word', 'score', 'tiles',
+            'direction' and 'turn_number'.
+        on_ai_turn(): It is now the AI's turn.
+        on_challenge_started(): The AI's last word can now be challenged.
+        on_game_over(winner, player_score, ai_score): The game ended.
+    """
+    
+    def __init__(self, word_validator, player, difficulty="medium", ai_options=None, seed=None):
+        """Initialize the engine.
+        
+        Args:
+            word_validator: The word validator.
+            player: The Player object for the human side.
+            difficulty: The AI difficulty ("easy", "medium", "hard").
+            ai_options: Optional keyword arguments for the AIPlayer.
+            seed: Optional seed for the first game. Each game's seed is kept
+                in self.seed; replaying it deals the same tiles and, for
+                searches without a time limit, makes the same AI moves.
+        """
+        self.word_validator = word_validator
+        self.player = player
+        self.difficulty = difficulty.lower()
+        self.ai_options = dict(ai_options or {})
+        
+        # Seed of the current game, and the seed requested for the next one
+        self.seed = None
+        self.next_seed = seed
+        
+        # Game components
+        self.board = None
+        self.tile_bag = None
+        self.score_calculator = None
+        self.ai_player = None
+        
+        # Game state
+        self.current_player = None  # "player" or "ai"
+        self.start_time = None
+        self.game_time = "00:00"
+        self.turn_number = 1
+        self.is_game_over = False
+        self.winner = None
+        self.current_move_tiles = []  # [(row, col, letter, value), ...]
+        self.challenge_time = 30  # 30 seconds to make a challenge
+        self.challenge_remaining = 0
+        self.can_challenge = False
+        self.challenge_penalty = 10  # Points deducted for failed challenge
+        # Statistics
+        self.player_score = 0
+        self.ai_score = 0
+        self.pass_count = 0  # Consecutive passes
+        self.last_move = {"player": "None", "word": "None", "score": 0}
+        
+        # Callbacks
+        self.on_board_updated = None
+        self.on_rack_updated = None
+        self.on_game_info_updated = None
+        self.on_move_result = None
+        self.on_move_played = None
+        self.on_ai_turn = None
+        self.on_challenge_started = None
+        self.on_game_over = None
+    
+    def notify(self, callback, *args):
+        """Call a callback if it is set.
+        
+        Args:
+            callback: The callback, or None.
+            *args: The arguments to pass.
+        """
+        if callback is not None:
+            callback(*args)
+    
+    def create_components(self, difficulty, seed=None):
+        """Create a fresh board, bag, score calculator and AI.
+        
+        The bag and the AI get separate random streams derived from the game
+        seed, so the tiles dealt do not depend on how the AI searches.
+        
+        Args:
+            difficulty: The AI difficulty.
+            seed: The game seed; a new one is chosen if None.
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        self.seed = seed
+        
+        self.board = Board()
+        self.tile_bag = TileBag(rng=random.Random("%s:bag" % seed))
+        self.score_calculator = ScoreCalculator()
+        
+        options = dict(self.ai_options)
+        options.setdefault('rng', random.Random("%s:ai" % seed))
+        
+        ai_player = Player(-1, "AI", is_ai=True)
+        self.ai_player = AIPlayer(ai_player, difficulty, self.board,
+                                  self.word_validator, self.score_calculator,
+                                  **options)
+    
+    def initialize_game(self, seed=None):
+        """Initialize a new game.
+        
+        Args:
+            seed: Optional seed for the game (defaults to the seed given to
+                the engine for its first game, then to a new one).
+        """
+        if seed is None:
+            seed, self.next_seed = self.next_seed, None
+        self.create_components(self.difficulty, seed)
+        
+        # Draw initial tiles for players
+        self.player.set_tiles(self.tile_bag.draw_tiles(7))
+        self.ai_player.player.set_tiles(self.tile_bag.draw_tiles(7))
+        
+        # Set initial game state
+        self.current_player = "player"  # Player goes first
+        self.start_time = datetime.now()
+        self.turn_number = 1
+        self.is_game_over = False
+        self.winner = None
+        self.player_score = 0
+        self.ai_score = 0
+        self.pass_count = 0
+        self.current_move_tiles = []
+        
+        self.notify_board_update()
+        self.notify_rack_update()
+        self.notify_game_info_update()
+    
+    def load_game(self, game_data):
+        """Load a saved game.
+        
+        Args:
+            game_data: The saved game, as returned by DatabaseManager.load_game().
+        """
+        # Extract game data
+        game = game_data['game']
+        moves = game_data['moves']
+        
+        self.create_components(game[2])  # difficulty is at index 2
+        
+        # Load board configuration
+        board_config = json.loads(game[8])  # board_config is at index 8
+        for pos, tile_info in board_config.items():
+            row, col = map(int, pos.strip('()').split(','))
+            letter, value = tile_info
+            self.board.place_tile(row, col, letter, value)
+        
+        # Set game state from saved data
+        self.player_score = game[3]  # player_score is at index 3
+        self.ai_score = game[4]  # ai_score is at index 4
+        
+        # Set player tiles (from saved state or draw new ones)
+        # For simplicity, we'll draw new tiles for now
+        tiles_on_board_count = len(board_config)
+        tiles_used = tiles_on_board_count + 14  # 7 tiles per player
+        for _ in range(tiles_used):
+            self.tile_bag.draw_tiles(1)  # Discard to match the state
+        
+        self.player.set_tiles(self.tile_bag.draw_tiles(7))
+        self.ai_player.player.set_tiles(self.tile_bag.draw_tiles(7))
+        
+        # Set current player (simplification: always start with player's turn when loading)
+        self.current_player = "player"
+        
+        # Set other game state
+        self.start_time = datetime.now() - timedelta(seconds=game[6] or 0)  # duration is at index 6
+        self.turn_number = len(moves) + 1
+        self.is_game_over = bool(game[9])  # completed is at index 9
+        self.winner = None
+        self.pass_count = 0
+        self.current_move_tiles = []
+        
+        self.notify_board_update()
+        self.notify_rack_update()
+        self.notify_game_info_update()
+    
+    def get_duration(self):
+        """Get the number of seconds since the game started.
+        
+        Returns:
+            int: The game duration in seconds.
+        """
+        return int((datetime.now() - self.start_time).total_seconds())
+    
+    def update_game_time(self):
+        """Update the game clock; meant to be called once a second."""
+        if self.start_time and not self.is_game_over:
+            delta = datetime.now() - self.start_time
+            hours, remainder = divmod(delta.seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            
+            if hours > 0:
+                self.game_time = f"{hours:02}:{minutes:02}:{seconds:02}"
+            else:
+                self.game_time = f"{minutes:02}:{seconds:02}"
+            
+            self.notify_game_info_update()
+    
+    def start_challenge_period(self):
+        """Start the period during which a word can be challenged."""
+        self.can_challenge = True
+        self.challenge_remaining = self.challenge_time
+        self.notify(self.on_challenge_started)
+        self.notify_game_info_update()
+    
+    def challenge_timeout(self):
+        """Count down the challenge period; meant to be called once a second."""
+        if not self.can_challenge:
+            return
+        
+        self.challenge_remaining -= 1
+        if self.challenge_remaining <= 0:
+            self.end_challenge_period()
+        self.notify_game_info_update()
+    
+    def end_challenge_period(self):
+        """End the challenge period."""
+        self.can_challenge = False
+        self.challenge_remaining = 0
+        self.notify_game_info_update()
+    
+    def challenge_word(self, word):
+        """Challenge the validity of a word.
+        
+        Args:
+            word: The word being challenged.
+        
+        Returns:
+            bool: True if challenge successful, False if failed.
+        """
+        if not self.can_challenge:
+            return False
+        
+        # Check if word is actually valid
+        is_valid = self.word_validator.is_valid_word(word)
+        
+        if not is_valid:
+            # Challenge successful - remove word and deduct points
+            self.handle_successful_challenge(word)
+            return True
+        else:
+            # Challenge failed - penalize challenger
+            self.handle_failed_challenge()
+            return False
+    
+    def handle_successful_challenge(self, word):
+        """Handle a successful word challenge.
+        
+        Args:
+            word: The successfully challenged word.
+        """
+        # Find the move that placed this word
+        for row, col, letter, value in self.current_move_tiles:
+            self.board.remove_tile(row, col)
+            self.ai_player.player.add_tile(letter, value)
+        
+        # Deduct points from AI's score
+        self.ai_score -= self.last_move["score"]
+        
+        # Update game state
+        self.end_challenge_period()
+        self.notify_board_update()
+        self.notify_game_info_update()
+    
+    def handle_failed_challenge(self):
+        """Handle a failed word challenge."""
+        # Deduct penalty points from player
+        self.player_score = max(0, self.player_score - self.challenge_penalty)
+        
+        # End challenge period
+        self.end_challenge_period()
+        self.notify_game_info_update()
+    
+    def place_tile(self, row, col, letter, value):
+        """Place a tile from the player's rack on the board."""
+        if self.current_player != "player" or self.is_game_over:
+            return False
+        
+        # Place tile on board
+        if self.board.place_tile(row, col, letter, value):
+            # Add to current move
+            self.current_move_tiles.append((row, col, letter, value))
+            
+            # Remove from player's rack
+            self.player.remove_tile(letter)
+            
+            self.notify_board_update()
+            self.notify_rack_update()
+            
+            return True
+        
+        return False
+    
+    def remove_tile(self, row, col):
+        """Take a tile of the current move back off the board."""
+        if self.current_player != "player" or self.is_game_over:
+            return False
+        
+        # Check if the tile is part of the current move
+        for i, (tile_row, tile_col, letter, value) in enumerate(self.current_move_tiles):
+            if tile_row == row and tile_col == col:
+                # Remove from current move
+                tile_data = self.current_move_tiles.pop(i)
+                
+                # Add back to player's rack
+                self.player.add_tile(tile_data[2], tile_data[3])
+                
+                # Remove from board
+                self.board.remove_tile(row, col)
+                
+                self.notify_board_update()
+                self.notify_rack_update()
+                
+                return True
+        
+        return False
+    
+    def play_move(self, tiles):
+        """Place a whole move for the player and submit it.
+        
+        Args:
+            tiles: The move's (row, col, letter, value) tuples.
+        
+        Returns:
+            bool: True if the move was accepted.
+        """
+        for row, col, letter, value in tiles:
+            if not self.place_tile(row, col, letter, value):
+                self.recall_tiles()
+                self.notify(self.on_move_result, False, "Tiles cannot be placed there.", 0)
+                return False
+        
+        return self.submit_move()
+    
+    def submit_move(self):
+        """Submit the player's current move."""
+        if self.current_player != "player" or self.is_game_over:
+            return False
+        
+        # Check if any tiles have been placed
+        if not self.current_move_tiles:
+            self.notify(self.on_move_result, False, "No tiles placed.", 0)
+            return False
+        
+        # Validate the move
+        words, is_valid, message = self.validate_move()
+        
+        if not is_valid:
+            # Revert the move
+            self.recall_tiles()
+            self.notify(self.on_move_result, False, message, 0)
+            return False
+        
+        # Calculate score
+        score = 0
+        main_word = ""
+        
+        for word, word_positions in words:
+            word_score = self.score_calculator.calculate_score(word, word_positions, self.board)
+            score += word_score
+            
+            # The main word is the one with the most tiles from the current move
+            if len(word) > len(main_word):
+                main_word = word
+        
+        # Update player score
+        self.player_score += score
+        
+        self.notify(self.on_move_played, {
+            "player": "player",
+            "word": main_word,
+            "score": score,
+            "tiles": list(self.current_move_tiles),
+            "direction": "horizontal" if self.is_horizontal_move() else "vertical",
+            "turn_number": self.turn_number
+        })
+        
+        # Update last move info
+        self.last_move = {
+            "player": "player",
+            "word": main_word,
+            "score": score
+        }
+        
+        # Reset current move
+        self.current_move_tiles = []
+        
+        # Draw new tiles
+        new_tiles = self.tile_bag.draw_tiles(7 - len(self.player.tiles))
+        for letter, value in new_tiles:
+            self.player.add_tile(letter, value)
+        
+        # Reset pass count
+        self.pass_count = 0
+        
+        self.notify_rack_update()
+        self.notify_game_info_update()
+        self.notify(self.on_move_result, True, f"Valid move! Word: {main_word}", score)
+        
+        # Check for game over
+        if self.check_game_over():
+            return True
+        
+        self.start_ai_turn()
+        return True
+    
+    def validate_move(self):
+        """Validate the current move."""
+        # Check if this is the first move
+        is_first_move = self.board.is_first_move()
+        
+        # Check if tiles are placed in a line
+        if not self.is_tiles_in_line():
+            return [], False, "Tiles must be placed in a line."
+        
+        # Check if tiles are connected to existing tiles (except first move)
+        if not is_first_move and not self.is_connected_to_existing():
+            return [], False, "Tiles must be connected to existing tiles."
+        
+        # Check if first move covers the center cell
+        if is_first_move and not self.covers_center():
+            return [], False, "First move must cover the center cell."
+        
+        # Check if the words formed are valid
+        words = self.board.get_words_from_move(self.current_move_tiles)
+        
+        invalid_words = []
+        for word, _ in words:
+            if not self.word_validator.is_valid_word(word):
+                invalid_words.append(word)
+        
+        if invalid_words:
+            word_list = ", ".join(invalid_words)
+            return [], False, f"Invalid word(s): {word_list}"
+        
+        return words, True, "Valid move."
+    
+    def is_tiles_in_line(self):
+        """Check if the placed tiles are in a line."""
+        if len(self.current_move_tiles) <= 1:
+            return True
+        
+        # Check if all tiles are in the same row
+        same_row = all(t[0] == self.current_move_tiles[0][0] for t in self.current_move_tiles)
+        
+        # Check if all tiles are in the same column
+        same_col = all(t[1] == self.current_move_tiles[0][1] for t in self.current_move_tiles)
+        
+        return same_row or same_col
+    
+    def is_horizontal_move(self):
+        """Check if the current move is horizontal."""
+        if len(self.current_move_tiles) <= 1:
+            return True  # Default to horizontal for single tile
+        
+        # If all tiles have the same row, it's horizontal
+        return all(t[0] == self.current_move_tiles[0][0] for t in self.current_move_tiles)
+    
+    def is_connected_to_existing(self):
+        """Check if the placed tiles are connected to existing tiles."""
+        # Get positions of current move tiles
+        current_positions = set((r, c) for r, c, _, _ in self.current_move_tiles)
+        
+        # Check if any placed tile is adjacent to an existing tile
+        for row, col, _, _ in self.current_move_tiles:
+            # Check adjacent cells (up, right, down, left)
+            adjacent_positions = [
+                (row - 1, col),
+                (row, col + 1),
+                (row + 1, col),
+                (row, col - 1)
+            ]
+            
+            for adj_row, adj_col in adjacent_positions:
+                # Skip if out of bounds
+                if not (0 <= adj_row < 15 and 0 <= adj_col < 15):
+                    continue
+                
+                # Skip if it's part of the current move
+                if (adj_row, adj_col) in current_positions:
+                    continue
+                
+                # If there's a tile at this position, it's connected
+                if self.board.has_tile(adj_row, adj_col):
+                    return True
+        
+        return False
+    
+    def covers_center(self):
+        """Check if the move covers the center cell."""
+        center_row, center_col = 7, 7
+        
+        for row, col, _, _ in self.current_move_tiles:
+            if row == center_row and col == center_col:
+                return True
+        
+        return False
+    
+    def recall_tiles(self):
+        """Recall all tiles from the current move back to the rack."""
+        if self.current_player != "player" or self.is_game_over:
+            return False
+        
+        # Remove tiles from board and add back to rack
+        for row, col, letter, value in self.current_move_tiles:
+            self.board.remove_tile(row, col)
+            self.player.add_tile(letter, value)
+        
+        # Clear current move
+        self.current_move_tiles = []
+        
+        self.notify_board_update()
+        self.notify_rack_update()
+        
+        return True
+    
+    def pass_turn(self):
+        """Pass the player's turn."""
+        if self.current_player != "player" or self.is_game_over:
+            return False
+        
+        # Recall any tiles placed but not submitted
+        if self.current_move_tiles:
+            self.recall_tiles()
+        
+        # Increment pass count
+        self.pass_count += 1
+        
+        # Update last move info
+        self.last_move = {
+            "player": "player",
+            "word": "PASS",
+            "score": 0
+        }
+        
+        # Check for game over (3 consecutive passes)
+        if self.pass_count >= 6:  # 3 rounds of passes (player and AI)
+            self.end_game()
+            return True
+        
+        self.start_ai_turn()
+        return True
+    
+    def start_ai_turn(self):
+        """Hand the turn to the AI."""
+        self.current_player = "ai"
+        self.notify_game_info_update()
+        self.notify(self.on_ai_turn)
+    
+    def get_unseen_tiles(self):
+        """Get the tiles hidden from the AI.
+        
+        Returns:
+            list: The bag plus the player's rack, as (letter, value) tuples.
+        """
+        return self.tile_bag.get_remaining_tiles() + self.player.get_tiles()
+    
+    def play_ai_move(self):
+        """Let the AI choose and play its move on the calling thread.
+        
+        Returns:
+            bool: True if it was the AI's turn.
+        """
+        if self.current_player != "ai" or self.is_game_over:
+            return False
+        
+        move = self.ai_player.make_move(self.tile_bag.get_remaining_tiles_count(),
+                                        self.get_unseen_tiles())
+        self.apply_ai_move(move)
+        return True
+    
+    def apply_ai_move(self, move):
+        """Play the AI's chosen move and hand the turn back to the player.
+        
+        Args:
+            move: The AI's move, or None to pass.
+        """
+        if self.current_player != "ai" or self.is_game_over:
+            return
+        
+        if move and move['tiles']:
+            # Place tiles on board
+            for row, col, letter, value in move['tiles']:
+                self.board.place_tile(row, col, letter, value)
+                self.ai_player.player.remove_tile(letter)
+            
+            # Update score
+            self.ai_score += move['score']
+            
+            # Update last move info
+            self.last_move = {
+                "player": "ai",
+                "word": move['word'],
+                "score": move['score']
+            }
+            
+            # Start challenge period
+            self.start_challenge_period()
+            
+            # Reset pass count
+            self.pass_count = 0
+            
+            # Draw new tiles for AI
+            new_tiles = self.tile_bag.draw_tiles(7 - len(self.ai_player.player.tiles))
+            for letter, value in new_tiles:
+                self.ai_player.player.add_tile(letter, value)
+            
+            self.notify(self.on_move_played, {
+                "player": "ai",
+                "word": move['word'],
+                "score": move['score'],
+                "tiles": list(move['tiles']),
+                "direction": "horizontal" if move['direction'] == 'horizontal' else "vertical",
+                "turn_number": self.turn_number
+            })
+        else:
+            # AI passes
+            self.pass_count += 1
+            
+            # Update last move info
+            self.last_move = {
+                "player": "ai",
+                "word": "PASS",
+                "score": 0
+            }
+        
+        # Increment turn number
+        self.turn_number += 1
+        
+        # Check for game over
+        if self.check_game_over():
+            return
+        
+        # Switch back to player's turn
+        self.current_player = "player"
+        
+        self.notify_board_update()
+        self.notify_game_info_update()
+    
+    def check_game_over(self):
+        """Check if the game is over."""
+        # Check if bag is empty and either player has no tiles
+        if (self.tile_bag.is_empty() and
+            (len(self.player.tiles) == 0 or len(self.ai_player.player.tiles) == 0)):
+            self.end_game()
+            return True
+        
+        # Check if 6 consecutive passes (3 full rounds)
+        if self.pass_count >= 6:
+            self.end_game()
+            return True
+        
+        return False
+    
+    def end_game(self):
+        """End the game and calculate final scores."""
+        self.is_game_over = True
+        
+        # Calculate remaining tile values
+        player_remaining = sum(value for _, value in self.player.tiles)
+        ai_remaining = sum(value for _, value in self.ai_player.player.tiles)
+        
+        # Adjust scores based on remaining tiles
+        if len(self.player.tiles) == 0:
+            self.player_score += ai_remaining
+            self.ai_score -= ai_remaining
+        elif len(self.ai_player.player.tiles) == 0:
+            self.ai_score += player_remaining
+            self.player_score -= player_remaining
+        # If game ended due to passes, subtract remaining tile values
+        else:
+            self.player_score -= player_remaining
+            self.ai_score -= ai_remaining
+        
+        # Determine winner
+        if self.player_score > self.ai_score:
+            self.winner = "Player"
+        elif self.ai_score > self.player_score:
+            self.winner = "AI"
+        else:
+            self.winner = "Tie"
+        
+        self.notify_game_info_update()
+        self.notify(self.on_game_over, self.winner, self.player_score, self.ai_score)
+    
+    def get_board_config(self):
+        """Get the placed tiles in the format games are saved in.
+        
+        Returns:
+            str: JSON mapping "(row,col)" to [letter, value].
+        """
+        board_state = {}
+        for row, col, letter, value in self.board.get_placed_tiles():
+            board_state[f"({row},{col})"] = [letter, value]
+        
+        return json.dumps(board_state)
+    
+    def get_board_state(self):
+        """Get the current state of the board."""
+        board_state = {}
+        for row, col, letter, value in self.board.get_placed_tiles():
+            board_state[(row, col)] = (letter, value)
+        return board_state
+    
+    def get_player_tiles(self):
+        """Get the current tiles in the player's rack."""
+        return self.player.get_tiles()
+    
+    def get_game_info(self):
+        """Get the current game information."""
+        info = {
+            'player_score': self.player_score,
+            'ai_score': self.ai_score,
+            'difficulty': self.difficulty,
+            'is_player_turn': self.current_player == "player",
+            'turn_number': self.turn_number,
+            'tiles_remaining': self.tile_bag.get_remaining_tiles_count(),
+            'progress': min(100, int(((100 - self.tile_bag.get_remaining_tiles_count()) / 100) * 100)),
+            'game_time': self.game_time,
+            'last_move': self.last_move,
+            'can_challenge': self.can_challenge,
+            'challenge_time': self.challenge_remaining,
+            'seed': self.seed
+        }
+        return info
+    
+    def notify_board_update(self):
+        """Report the full board state to on_board_updated."""
+        if self.on_board_updated is not None:
+            updates = [(row, col, 'place', letter, value)
+                       for row, col, letter, value in self.board.get_placed_tiles()]
+            self.on_board_updated(updates)
+    
+    def notify_rack_update(self):
+        """Report the player's rack to on_rack_updated."""
+        if self.on_rack_updated is not None:
+            self.on_rack_updated(self.player.get_tiles())
+    
+    def notify_game_info_update(self):
+        """Report the game information to on_game_info_updated."""
+        if self.on_game_info_updated is not None:
+            self.on_game_info_updated(self.get_game_info())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from src.game.dawg import Dawg
+from src.game.lexicon_file import lexicon_path, open_lexicon
+
+class Lexicon:
+    """In-memory index of the dictionary table.
+    
+    The whole table is read once and kept as frozen sets, so word lookups are
+    plain hash lookups instead of a SQLite round trip. Lexicons are shared per
+    database file; writers call invalidate() and the next lookup reloads.
+    
+    If a compiled lexicon file for the database is present and up to date
+    (see src.game.lexicon_file), the unthemed word graph and word lookups use
+    the memory-mapped file and the table is only read for themes.
+    """
+    
+    # Shared lexicons, keyed by database path
+    _instances = {}
+    
+    def __init__(self, db_manager):
+        """Initialize the lexicon.
+        
+        Args:
+            db_manager: The database manager to load words from.
+        """
+        self.db_manager = db_manager
+        self.words = frozenset()
+        self.theme_words = {}  # theme -> frozenset of words
+        self.dawgs = {}  # theme (or None) -> Dawg
+        self.loaded = False
+        self.mapped = None  # MappedDawg of the lexicon file, if usable
+        self.mapped_checked = False
+    
+    @classmethod
+    def for_database(cls, db_manager):
+        """Get the shared lexicon for a database.
+        
+        Args:
+            db_manager: The database manager.
+        
+        Returns:
+            Lexicon: The lexicon for the manager's database file.
+        """
+        lexicon = cls._instances.get(db_manager.db_path)
+        if lexicon is None:
+            lexicon = cls(db_manager)
+            cls._instances[db_manager.db_path] = lexicon
+        return lexicon
+    
+    def load(self):
+        """Load all words from the dictionary table into memory."""
+        words = set()
+        theme_words = {}
+        
+        for word, theme in self.db_manager.get_dictionary_entries():
+            words.add(word)
+            theme_words.setdefault(theme, set()).add(word)
+        
+        self.words = frozenset(words)
+        self.theme_words = {theme: frozenset(ws) for theme, ws in theme_words.items()}
+        self.loaded = True
+    
+    def get_mapped(self):
+        """Get the memory-mapped lexicon file, opening it on first use.
+        
+        Returns:
+            MappedDawg: The mapped word graph, or None if there is no usable
+                lexicon file for the database.
+        """
+        if not self.mapped_checked:
+            self.mapped = open_lexicon(lexicon_path(self.db_manager.db_path), self.db_manager)
+            self.mapped_checked = True
+        return self.mapped
+    
+    def invalidate(self):
+        """Drop the cached words so they are reloaded on the next lookup."""
+        self.words = frozenset()
+        self.theme_words = {}
+        self.dawgs = {}
+        self.loaded = False
+        # The file lacks the words just written; use the table from now on
+        self.mapped = None
+        self.mapped_checked = True
+    
+    def contains(self, word, theme=None):
+        """Check if a word is in the lexicon.
+        
+        Args:
+            word: The word to check.
+            theme: Optional theme the word must belong to.
+        
+        Returns:
+            bool: True if the word is known, False otherwise.
+        """
+        if not self.loaded:
+            if not theme and self.get_mapped() is not None:
+                return word in self.mapped
+            self.load()
+        
+        if theme:
+            return word.lower() in self.theme_words.get(theme, ())
+        return word.lower() in self.words
+    
+    def get_words(self, theme=None):
+        """Get all words in the lexicon.
+        
+        Args:
+            theme: Optional theme to restrict the words to.
+        
+        Returns:
+            frozenset: The lowercase words.
+        """
+        if not self.loaded:
+            self.load()
+        
+        if theme:
+            return self.theme_words.get(theme, frozenset())
+        return self.words
+    
+    def get_dawg(self, theme=None):
+        """Get a word graph over the lexicon, building it on first use.
+        
+        Args:
+            theme: Optional theme to restrict the words to.
+        
+        Returns:
+            Dawg: The word graph.
+        """
+        key = theme or None
+        dawg = self.dawgs.get(key)
+        if dawg is None:
+            if key is None:
+                dawg = self.get_mapped()
+            if dawg is None:
+                dawg = Dawg(self.get_words(key))
+            self.dawgs[key] = dawg
+        return dawg
+    
+    def get_themes(self, word):
+        """Get all themes a word belongs to.
+        
+        Args:
+            word: The word to check.
+        
+        Returns:
+            list: A list of themes.
+        """
+        if not self.loaded:
+            self.load()
+        
+        word = word.lower()
+        return [theme for theme, words in self.theme_words.items() if word in words]
+    
+    def __contains__(self, word):
+        return self.contains(word)
+    
+    def __len__(self):
+        if not self.loaded:
+            if self.get_mapped() is not None:
+                return len(self.mapped)
+            self.load()
+        return len(self.words)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Precompiled lexicon files: a DAWG stored as flat arrays.
+
+Usage:
+    python -m src.game.lexicon_file
+    python -m src.game.lexicon_file --words words.txt --output resources/scrabble.lex
+
+The compiler builds a Dawg from the dictionary table (or a word list) and
+writes its nodes and edges as flat little-endian arrays. MappedDawg
+memory-maps such a file and reads the arrays in place, so opening it costs
+a checksum pass instead of a rebuild, and every process that maps the file
+shares the same read-only pages.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from src.game.dawg import Dawg
+
+# Binary format: header, then the arrays
+#   first_edge: u32 x (nodes + 1)  edges of node n are first_edge[n]:first_edge[n + 1]
+#   children:   u32 x edges
+#   letters:    u8 x edges         uppercase ASCII
+#   terminal:   u8 x nodes
+# The header records where the words came from: the dictionary table's row
+# count and highest id, or zeros for a word list. The checksum is the CRC-32
+# of everything after the header.
+MAGIC = b"LEXN"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIIIIII")
+
+def lexicon_path(db_path):
+    """Get the default lexicon file for a database.
+    
+    Args:
+        db_path: The path of the database file.
+    
+    Returns:
+        str: The database path with a .lex extension.
+    """
+    return os.path.splitext(db_path)[0] + ".lex"
+
+def compile_lexicon(words, path, source=(0, 0)):
+    """Build a word graph and write it as a lexicon file.
+    
+    Args:
+        words: An iterable of words. Case is ignored.
+        path: The path of the file; its directory is created if needed.
+        source: The (row count, highest id) of the dictionary table the
+            words were read from, or (0, 0) for a word list.
+    
+    Returns:
+        Dawg: The compiled graph.
+    """
+    dawg = Dawg(words)
+    
+    first_edge = array("I", [0])
+    children = array("I")
+    letters = bytearray()
+    for edges in dawg.edges:
+        for letter, child in sorted(edges.items()):
+            letters.append(ord(letter))
+            children.append(child)
+        first_edge.append(len(children))
+    
+    if sys.byteorder != "little":
+        first_edge.byteswap()
+        children.byteswap()
+    
+    body = b"".join([first_edge.tobytes(), children.tobytes(), bytes(letters),
+                     bytes(dawg.terminal)])
+    header = _HEADER.pack(MAGIC, VERSION, 0, dawg.node_count(), len(children),
+                          len(dawg), source[0], source[1], zlib.crc32(body))
+    
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    # Write beside the target and swap it in, so processes that have the old
+    # file mapped keep a consistent copy
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(temporary, path)
+    
+    return dawg
+
+def compile_database(db_manager, path=None):
+    """Compile every word in the dictionary table into a lexicon file.
+    
+    Args:
+        db_manager: The database manager.
+        path: The path of the file (defaults to lexicon_path() of the
+            database).
+    
+    Returns:
+        Dawg: The compiled graph.
+    """
+    source = db_manager.get_dictionary_fingerprint()
+    words = set(word for word, _ in db_manager.get_dictionary_entries())
+    return compile_lexicon(words, path or lexicon_path(db_manager.db_path), source)
+
+class MappedDawg:
+    """A Dawg read in place from a memory-mapped lexicon file.
+    
+    It has the Dawg interface, so move generation and cross-checks work on
+    either. Edge dicts are decoded from the arrays the first time a node is
+    visited and kept, so only the part of the graph the game reaches is ever
+    decoded. Pickling a MappedDawg sends only the path; the receiving
+    process maps the same file.
+    """
+    
+    ROOT = 0
+    
+    def __init__(self, path):
+        """Map a lexicon file.
+        
+        Args:
+            path: The path of the file.
+        
+        Raises:
+            ValueError: If the file is not a lexicon file of a known version
+                or fails its checksum.
+        """
+        self.path = path
+        
+        with open(path, "rb") as f:
+            try:
+                self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError("%s is not a lexicon file" % path)
+        
+        self.read_header()
+        
+        # node -> decoded edge dict, or None until the node is visited
+        self.edge_cache = [None] * len(self.terminal)
+    
+    def read_header(self):
+        """Check the header and checksum and set up views of the arrays."""
+        data = memoryview(self.mapping)
+        if len(data) < _HEADER.size:
+            raise ValueError("%s is not a lexicon file" % self.path)
+        
+        (magic, version, _, nodes, edges, self.word_count, rows, max_id,
+         checksum) = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("%s is not a lexicon file" % self.path)
+        if version != VERSION:
+            raise ValueError("Unsupported lexicon file version %d in %s" % (version, self.path))
+        
+        size = _HEADER.size + 4 * (nodes + 1) + 5 * edges + nodes
+        if len(data) != size or zlib.crc32(data[_HEADER.size:]) != checksum:
+            raise ValueError("%s is damaged" % self.path)
+        
+        self.source = (rows, max_id)
+        
+        offset = _HEADER.size
+        first_edge = data[offset:offset + 4 * (nodes + 1)]
+        offset += len(first_edge)
+        children = data[offset:offset + 4 * edges]
+        offset += len(children)
+        self.letters = data[offset:offset + edges]
+        self.terminal = data[offset + edges:]
+        
+        if sys.byteorder == "little":
+            self.first_edge = first_edge.cast("I")
+            self.children = children.cast("I")
+        else:
+            # Big-endian machines pay for a private, swapped copy
+            self.first_edge = array("I", first_edge)
+            self.first_edge.byteswap()
+            self.children = array("I", children)
+            self.children.byteswap()
+    
+    def get_edges(self, node):
+        """Get the outgoing edges of a node.
+        
+        Args:
+            node: The node index.
+        
+        Returns:
+            dict: A mapping of letter to child node.
+        """
+        edges = self.edge_cache[node]
+        if edges is None:
+            edges = self.decode_edges(node)
+        return edges
+    
+    def decode_edges(self, node):
+        """Decode a node's edges from the arrays and cache them."""
+        start = self.first_edge[node]
+        end = self.first_edge[node + 1]
+        letters = self.letters
+        children = self.children
+        edges = {chr(letters[i]): children[i] for i in range(start, end)}
+        self.edge_cache[node] = edges
+        return edges
+    
+    def get_child(self, node, letter):
+        """Follow the edge for a letter.
+        
+        Args:
+            node: The node index.
+            letter: An uppercase letter.
+        
+        Returns:
+            int: The child node, or None if there is no such edge.
+        """
+        return self.get_edges(node).get(letter)
+    
+    def is_terminal(self, node):
+        """Check if a node ends a word.
+        
+        Args:
+            node: The node index.
+        
+        Returns:
+            bool: True if the path to this node spells a word.
+        """
+        return self.terminal[node] == 1
+    
+    def walk(self, letters, node=ROOT):
+        """Follow a sequence of letters from a node.
+        
+        Args:
+            letters: The uppercase letters to follow.
+            node: The node to start from (defaults to the root).
+        
+        Returns:
+            int: The node reached, or None if the path leaves the graph.
+        """
+        edge_cache = self.edge_cache
+        for letter in letters:
+            edges = edge_cache[node]
+            if edges is None:
+                edges = self.decode_edges(node)
+            node = edges.get(letter)
+            if node is None:
+                return None
+        return node
+    
+    def node_count(self):
+        """Get the number of nodes in the graph.
+        
+        Returns:
+            int: The node count.
+        """
+        return len(self.terminal)
+    
+    def __contains__(self, word):
+        node = self.walk(word.upper())
+        return node is not None and self.terminal[node] == 1
+    
+    def __len__(self):
+        return self.word_count
+    
+    def __reduce__(self):
+        return (MappedDawg, (self.path,))
+
+def open_lexicon(path, db_manager=None):
+    """Map a lexicon file if it exists, is valid and is up to date.
+    
+    Args:
+        path: The path of the file.
+        db_manager: Optional database manager; a file compiled from its
+            dictionary table is only used while the table is unchanged.
+    
+    Returns:
+        MappedDawg: The mapped graph, or None if the file cannot be used.
+    """
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        dawg = MappedDawg(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring lexicon file: {e}")
+        return None
+    
+    if db_manager is not None and dawg.source != (0, 0):
+        if dawg.source != db_manager.get_dictionary_fingerprint():
+            return None
+    
+    return dawg
+
+def main(argv=None):
+    """Compile a lexicon file from the command line.
+    
+    Args:
+        argv: Optional argument list (defaults to sys.argv[1:]).
+    
+    Returns:
+        int: The exit status.
+    """
+    from src.data.database import DatabaseManager
+    
+    parser = argparse.ArgumentParser(description="Compile the dictionary into a lexicon file.")
+    parser.add_argument("--database", default="resources/scrabble.db",
+                        help="database holding the dictionary")
+    parser.add_argument("--words", default=None,
+                        help="compile this word list (one word per line) instead")
+    parser.add_argument("--output", default=None,
+                        help="lexicon file (defaults to the database path with .lex)")
+    args = parser.parse_args(argv)
+    
+    output = args.output or lexicon_path(args.database)
+    
+    if args.words:
+        with open(args.words) as f:
+            dawg = compile_lexicon((line.strip() for line in f), output)
+    else:
+        db_manager = DatabaseManager(args.database)
+        db_manager.initialize_database()
+        dawg = compile_database(db_manager, output)
+        db_manager.close()
+    
+    print("Wrote %s: %d words, %d nodes, %d bytes" % (
+        output, len(dawg), dawg.node_count(), os.path.getsize(output)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 from src.game.board import Board
 
 class ScoreCalculator:
@@ -24,36 +26,24 @@ class ScoreCalculator:
         if not word or not positions:
             return 0
         
-        # Get each letter's base value and apply letter bonuses
-        letter_scores = []
+        # Look up bonuses in the board's precomputed multiplier tables
+        size = board.size
+        letters = board.letters
+        values = board.values
+        letter_multipliers = board.letter_multipliers
+        word_multipliers = board.word_multipliers
+        
+        base_score = 0
         word_multiplier = 1
         
-        for i, (row, col) in enumerate(positions):
-            # Get the letter and its value
-            tile = board.get_tile(row, col)
-            if not tile:  # This shouldn't happen with valid positions
+        for row, col in positions:
+            square = row * size + col
+            if not letters[square]:  # This shouldn't happen with valid positions
                 continue
             
-            letter, value = tile
-            
-            # Apply letter bonus if applicable
-            bonus_type = board.get_bonus_type(row, col)
-            
-            if bonus_type == Board.DOUBLE_LETTER:
-                letter_scores.append(value * 2)
-            elif bonus_type == Board.TRIPLE_LETTER:
-                letter_scores.append(value * 3)
-            else:
-                letter_scores.append(value)
-            
-            # Accumulate word multipliers
-            if bonus_type == Board.DOUBLE_WORD:
-                word_multiplier *= 2
-            elif bonus_type == Board.TRIPLE_WORD:
-                word_multiplier *= 3
-        
-        # Calculate base score
-        base_score = sum(letter_scores)
+            # Apply letter and word bonuses
+            base_score += values[square] * letter_multipliers[square]
+            word_multiplier *= word_multipliers[square]
         
         # Apply word multiplier
         final_score = base_score * word_multiplier
@@ -82,10 +72,283 @@ class ScoreCalculator:
         
         return total_score
     
+    def encode_placements(self, placements, board, max_tiles=7):
+        """Pack placements into the arrays used by calculate_batch_scores().
+        
+        Args:
+            placements: A list of tile lists of (row, col, letter, value) tuples.
+            board: The game board.
+            max_tiles: The maximum number of tiles in one placement.
+            
+        Returns:
+            tuple: (squares, values) int arrays of shape (len(placements), max_tiles).
+                   squares holds row * size + col for each tile, padded with -1.
+        """
+        squares = np.full((len(placements), max_tiles), -1, dtype=np.int64)
+        values = np.zeros((len(placements), max_tiles), dtype=np.int64)
+        
+        for i, tiles in enumerate(placements):
+            for j, (row, col, _, value) in enumerate(tiles):
+                squares[i, j] = row * board.size + col
+                values[i, j] = value
+        
+        return squares, values
+    
+    def calculate_batch_scores(self, squares, values, board):
+        """Calculate the scores of many placements in one vectorized pass.
+        
+        Each placement must be a legal one: its tiles sit on empty squares in
+        one line and form a contiguous word with the tiles on the board. The
+        scores match calculate_move_score() on the words formed.
+        
+        Words are scored from per-line prefix sums of the tiles already on the
+        board and of the bonus multiplier grids, so no placement is walked.
+        
+        Args:
+            squares: An int array (placements x tiles) of row * size + col
+                indexes, padded with -1.
+            values: An int array of the same shape with the tile values.
+            board: The game board.
+            
+        Returns:
+            numpy.ndarray: One score per placement.
+        """
+        size = board.size
+        squares = np.asarray(squares, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+        
+        if squares.shape[0] == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        # Board layers, stacked per direction: [0] along rows, [1] along columns
+        occupied = np.frombuffer(bytes(board.letters), dtype=np.uint8).reshape(size, size) != 0
+        tile_values = np.frombuffer(bytes(board.values), dtype=np.uint8).reshape(size, size).astype(np.int64)
+        letter_multipliers = np.array(board.letter_multipliers, dtype=np.int64)
+        word_multipliers = np.array(board.word_multipliers, dtype=np.int64).reshape(size, size)
+        
+        existing_scores = tile_values * letter_multipliers.reshape(size, size) * occupied
+        
+        def by_direction(layer):
+            return np.stack([layer, layer.T])
+        
+        def prefix_sums(layer):
+            stacked = by_direction(layer)
+            sums = np.zeros((2, size, size + 1), dtype=np.int64)
+            np.cumsum(stacked, axis=2, out=sums[:, :, 1:])
+            return sums
+        
+        score_sums = prefix_sums(existing_scores)
+        double_sums = prefix_sums((word_multipliers == 2).astype(np.int64))
+        triple_sums = prefix_sums((word_multipliers == 3).astype(np.int64))
+        
+        # Lengths of the runs of existing tiles just before and after each square
+        occupied_lines = by_direction(occupied.astype(np.int64))
+        run_before = np.zeros((2, size, size), dtype=np.int64)
+        run_after = np.zeros((2, size, size), dtype=np.int64)
+        for pos in range(1, size):
+            run_before[:, :, pos] = (run_before[:, :, pos - 1] + 1) * occupied_lines[:, :, pos - 1]
+        for pos in range(size - 2, -1, -1):
+            run_after[:, :, pos] = (run_after[:, :, pos + 1] + 1) * occupied_lines[:, :, pos + 1]
+        
+        def word_scores(direction, line, first, last, letter_score):
+            # Score the full run through [first, last] along a line
+            start = first - run_before[direction, line, first]
+            end = last + run_after[direction, line, last] + 1
+            length = end - start
+            base = score_sums[direction, line, end] - score_sums[direction, line, start] + letter_score
+            doubles = double_sums[direction, line, end] - double_sums[direction, line, start]
+            triples = triple_sums[direction, line, end] - triple_sums[direction, line, start]
+            scores = base * (2 ** doubles) * (3 ** triples) + 50 * (length == 7)
+            return np.where(length > 1, scores, 0)
+        
+        present = squares >= 0
+        safe_squares = np.where(present, squares, 0)
+        rows = safe_squares // size
+        cols = safe_squares % size
+        new_scores = np.where(present, values * letter_multipliers[safe_squares], 0)
+        
+        # A placement is vertical if its tiles share a column but not a row;
+        # single tiles are scored as horizontal plus their vertical word
+        first_rows = rows[:, :1]
+        first_cols = cols[:, :1]
+        same_row = np.all(~present | (rows == first_rows), axis=1)
+        vertical = ~same_row & np.all(~present | (cols == first_cols), axis=1)
+        
+        direction = vertical.astype(np.int64)
+        line = np.where(vertical, first_cols[:, 0], first_rows[:, 0])
+        positions = np.where(vertical[:, None], rows, cols)
+        first = np.where(present, positions, size).min(axis=1)
+        last = np.where(present, positions, -1).max(axis=1)
+        
+        main_scores = word_scores(direction, line, first, last, new_scores.sum(axis=1))
+        
+        # Perpendicular word through each new tile
+        cross_direction = np.broadcast_to((1 - direction)[:, None], squares.shape)
+        cross_line = np.where(vertical[:, None], rows, cols)
+        cross_position = np.where(vertical[:, None], cols, rows)
+        cross_scores = word_scores(cross_direction, cross_line, cross_position,
+                                   cross_position, new_scores)
+        cross_scores = np.where(present, cross_scores, 0).sum(axis=1)
+        
+        return main_scores + cross_scores
+    
+    def score_placement(self, tiles, board):
+        """Calculate the score for placing tiles, without modifying the board.
+        
+        Gives the same result as calculate_move_score() on the words from
+        board.get_words_from_move(tiles) with the tiles on the board, but
+        reads the squares directly. When the board maintains cross-checks,
+        perpendicular words are scored from its cross-scores.
+        
+        Args:
+            tiles: A list of (row, col, letter, value) tuples on empty squares.
+            board: The game board.
+            
+        Returns:
+            int: The total score for the move.
+        """
+        if not tiles:
+            return 0
+        
+        if len(tiles) == 1:
+            # A single tile can form a word in each direction
+            row, col, _, value = tiles[0]
+            return (self._cross_word_score(board, row, col, value, True) +
+                    self._cross_word_score(board, row, col, value, False))
+        
+        horizontal = all(tile[0] == tiles[0][0] for tile in tiles)
+        new_values = {(row, col): value for row, col, _, value in tiles}
+        
+        total_score = 0
+        scored_starts = set()
+        
+        for row, col, _, value in tiles:
+            # Main word (shared by every tile in a contiguous placement)
+            start, length, word_score = self._line_score(board, row, col, horizontal, new_values)
+            if length > 1 and start not in scored_starts:
+                scored_starts.add(start)
+                total_score += word_score
+            
+            # Perpendicular word through this tile
+            total_score += self._cross_word_score(board, row, col, value, horizontal)
+        
+        return total_score
+    
+    def _cross_word_score(self, board, row, col, value, horizontal):
+        """Score the word perpendicular to a play through one new tile.
+        
+        Args:
+            board: The game board.
+            row: The row index of the new tile.
+            col: The column index of the new tile.
+            value: The value of the new tile.
+            horizontal: The direction of the play; the word scored runs the other way.
+            
+        Returns:
+            int: The word's score, or 0 if the tile has no perpendicular neighbors.
+        """
+        if board.dawg is None:
+            _, length, word_score = self._line_score(
+                board, row, col, not horizontal, {(row, col): value}
+            )
+            return word_score if length > 1 else 0
+        
+        cross_score = board.get_cross_scores(horizontal)[row * board.size + col]
+        if cross_score is None:
+            return 0
+        
+        score, word_multiplier, length = cross_score
+        square = row * board.size + col
+        score += value * board.letter_multipliers[square]
+        word_multiplier *= board.word_multipliers[square]
+        
+        final_score = score * word_multiplier
+        if length + 1 == 7:
+            final_score += 50
+        
+        return final_score
+    
+    def _line_score(self, board, row, col, horizontal, new_values):
+        """Score the run of tiles through a square in one direction.
+        
+        Args:
+            board: The game board.
+            row: The row index (0-based).
+            col: The column index (0-based).
+            horizontal: True to read along the row, False along the column.
+            new_values: {(row, col): value} for tiles not yet on the board.
+            
+        Returns:
+            tuple: (start, length, score) where start is the (row, col) of the
+                   first tile of the run.
+        """
+        size = board.size
+        letters = board.letters
+        values = board.values
+        letter_multipliers = board.letter_multipliers
+        word_multipliers = board.word_multipliers
+        
+        # Walk along the line as flat square indexes
+        if horizontal:
+            position, step, square = col, 1, row * size
+        else:
+            position, step, square = row, size, col
+        
+        def value_at(pos):
+            value = new_values.get((row, pos) if horizontal else (pos, col))
+            if value is None and letters[square + pos * step]:
+                value = values[square + pos * step]
+            return value
+        
+        # Find the start of the run
+        start = position
+        while start > 0 and value_at(start - 1) is not None:
+            start -= 1
+        
+        # Score the run the same way calculate_score does
+        base_score = 0
+        word_multiplier = 1
+        pos = start
+        
+        while pos < size:
+            value = value_at(pos)
+            if value is None:
+                break
+            
+            index = square + pos * step
+            base_score += value * letter_multipliers[index]
+            word_multiplier *= word_multipliers[index]
+            pos += 1
+        
+        length = pos - start
+        final_score = base_score * word_multiplier
+        if length == 7:
+            final_score += 50
+        
+        start_square = (row, start) if horizontal else (start, col)
+        return start_square, length, final_score
+    
+    def score_placements(self, placements, board):
+        """Score many placements against the same board in one call.
+        
+        Args:
+            placements: A list of tile lists, each as accepted by score_placement().
+            board: The game board.
+            
+        Returns:
+            list: The score of each placement, in order.
+        """
+        if not placements:
+            return []
+        
+        squares, values = self.encode_placements(placements, board)
+        return self.calculate_batch_scores(squares, values, board).tolist()
+    
     def evaluate_word_placement(self, word, position, direction, player_tiles, board):
         """Evaluate the potential score for placing a word at a position.
         
-        This is used by the AI to evaluate possible moves.
+        This is used by the AI to evaluate possible moves. The board is only
+        read, never copied or modified.
         
         Args:
             word: The word to place.
@@ -101,48 +364,35 @@ class ScoreCalculator:
                 - 'words': A list of words formed.
                 - 'tiles_used': A list of tiles used from the player's rack.
         """
-        # Make a copy of the current board state
-        original_grid = [row[:] for row in board.grid]
+        invalid = {'score': 0, 'valid': False, 'words': [], 'tiles_used': []}
         
-        # Check if the player has the necessary tiles
-        available_letters = [letter.upper() for letter, _ in player_tiles]
+        available_tiles = list(player_tiles)
         tiles_used = []
+        placement = []
         
-        start_row, start_col = position
-        current_row, current_col = start_row, start_col
+        current_row, current_col = position
         
-        # Try to place the word on the board
         for letter in word.upper():
             # Check if the position is out of bounds
             if not board.is_valid_position(current_row, current_col):
-                # Restore the board
-                board.grid = original_grid
-                return {'score': 0, 'valid': False, 'words': [], 'tiles_used': []}
+                return invalid
             
-            # If there's already a tile at this position, it must match the letter
-            if board.has_tile(current_row, current_col):
-                existing_letter, _ = board.get_tile(current_row, current_col)
-                if existing_letter.upper() != letter:
-                    # Restore the board
-                    board.grid = original_grid
-                    return {'score': 0, 'valid': False, 'words': [], 'tiles_used': []}
+            existing = board.get_tile(current_row, current_col)
+            if existing:
+                # If there's already a tile at this position, it must match the letter
+                if existing[0].upper() != letter:
+                    return invalid
             else:
                 # We need to use a tile from the player's rack
-                if letter in available_letters:
-                    available_letters.remove(letter)
-                    
-                    # Find the value of this letter
-                    for rack_letter, value in player_tiles:
-                        if rack_letter.upper() == letter and (rack_letter.upper(), value) not in tiles_used:
-                            tiles_used.append((rack_letter.upper(), value))
-                            # Place the tile
-                            board.place_tile(current_row, current_col, letter, value)
-                            break
+                for i, (rack_letter, value) in enumerate(available_tiles):
+                    if rack_letter.upper() == letter:
+                        available_tiles.pop(i)
+                        tiles_used.append((letter, value))
+                        placement.append((current_row, current_col, letter, value))
+                        break
                 else:
                     # Player doesn't have the required tile
-                    # Restore the board
-                    board.grid = original_grid
-                    return {'score': 0, 'valid': False, 'words': [], 'tiles_used': []}
+                    return invalid
             
             # Move to the next position
             if direction == "horizontal":
@@ -150,34 +400,17 @@ class ScoreCalculator:
             else:
                 current_row += 1
         
-        # At this point, the word has been successfully placed
-        # Get all words formed by the placement
-        tile_positions = []
-        
-        current_row, current_col = start_row, start_col
-        for _ in word:
-            if board.has_tile(current_row, current_col):
-                tile_positions.append((current_row, current_col))
-                
-                if direction == "horizontal":
-                    current_col += 1
-                else:
-                    current_row += 1
-        
-        words_formed = board.get_words_from_move(
-            [(row, col, board.get_tile(row, col)[0], board.get_tile(row, col)[1]) 
-             for row, col in tile_positions]
-        )
-        
-        # Calculate the score for all words formed
-        total_score = self.calculate_move_score(words_formed, board)
+        # A placement must use at least one tile from the rack
+        if not placement:
+            return invalid
         
-        # Restore the board
-        board.grid = original_grid
+        # Get all words formed by the placement and score them
+        words_formed = board.get_words_from_move(placement)
+        total_score = self.score_placement(placement, board)
         
         return {
             'score': total_score,
             'valid': True,
             'words': [word for word, _ in words_formed],
             'tiles_used': tiles_used
-        } 
\ No newline at end of file
+        }
@@ -37,14 +37,17 @@ class TileBag:
         ' ': {'count': 2, 'value': 0}  # blank tiles
     }
     
-    def __init__(self, custom_distribution=None):
+    def __init__(self, custom_distribution=None, rng=None):
         """Initialize a new tile bag.
         
         Args:
             custom_distribution: Optional custom tile distribution.
+            rng: Optional random.Random used for shuffling, so a seeded bag
+                deals the same tiles every time.
         """
         self.tiles = []
         self.distribution = custom_distribution or self.TILE_DISTRIBUTION
+        self.rng = rng or random.Random()
         self.initialize_tiles()
     
     def initialize_tiles(self):
@@ -56,7 +59,7 @@ class TileBag:
                 self.tiles.append((letter, info['value']))
         
         # Shuffle the tiles
-        random.shuffle(self.tiles)
+        self.rng.shuffle(self.tiles)
     
     def draw_tiles(self, count):
         """Draw a specified number of tiles from the bag.
@@ -85,7 +88,7 @@ class TileBag:
             tiles: A list of (letter, value) tuples to return to the bag.
         """
         self.tiles.extend(tiles)
-        random.shuffle(self.tiles)
+        self.rng.shuffle(self.tiles)
     
     def exchange_tiles(self, tiles_to_exchange):
         """Exchange tiles with the bag.
@@ -2,8 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import os
-import sqlite3
-import nltk
+
+from src.data.dictionary_loader import load_words, nltk_words, word_points
+from src.game.lexicon import Lexicon
 
 class WordValidator:
     """Validates words against a Scrabble dictionary."""
@@ -17,6 +18,7 @@ class WordValidator:
         """
         self.db_manager = db_manager
         self.theme = theme
+        self.lexicon = Lexicon.for_database(db_manager)
         
         # Initialize the dictionary from the database
         self.initialize_dictionary()
@@ -24,10 +26,7 @@ class WordValidator:
     def initialize_dictionary(self):
         """Initialize the dictionary from various sources."""
         # Check if we need to load the initial dictionary
-        self.db_manager.connect()
-        self.db_manager.cursor.execute("SELECT COUNT(*) FROM dictionary")
-        count = self.db_manager.cursor.fetchone()[0]
-        self.db_manager.close()
+        count = self.db_manager.count_dictionary_words()
         
         if count == 0:
             self.load_nltk_dictionary()
@@ -35,31 +34,10 @@ class WordValidator:
     def load_nltk_dictionary(self):
         """Load words from NLTK corpus."""
         try:
-            # Download NLTK word lists if not already available
-            nltk.download('words', quiet=True)
-            nltk.download('scowl-wl', quiet=True)
-            
-            # Get words from NLTK corpus
-            from nltk.corpus import words as nltk_words
-            
-            word_list = set(word.lower() for word in nltk_words.words())
-            
-            # Filter words: Scrabble rules typically allow 2-15 letter words
-            valid_words = [word for word in word_list if 2 <= len(word) <= 15]
-            
-            # Add words to the database
-            self.db_manager.connect()
-            
-            for word in valid_words:
-                # Calculate basic point value (just sum of letter values)
-                points = self.calculate_base_points(word)
-                self.db_manager.cursor.execute(
-                    "INSERT OR IGNORE INTO dictionary (word, points, theme) VALUES (?, ?, ?)",
-                    (word.lower(), points, "standard")
-                )
-            
-            self.db_manager.commit()
-            self.db_manager.close()
+            stats = load_words(self.db_manager, nltk_words(), "standard")
+            self.lexicon.invalidate()
+            print(f"Loaded {stats['added']} words in {stats['seconds']:.1f} s "
+                  f"({stats['words_per_second']:.0f} words/s)")
             
         except Exception as e:
             print(f"Error loading NLTK dictionary: {e}")
@@ -73,14 +51,7 @@ class WordValidator:
         Returns:
             int: The base point value.
         """
-        # Standard Scrabble letter values
-        letter_values = {
-            'A': 1, 'B': 3, 'C': 3, 'D': 2, 'E': 1, 'F': 4, 'G': 2, 'H': 4, 'I': 1,
-            'J': 8, 'K': 5, 'L': 1, 'M': 3, 'N': 1, 'O': 1, 'P': 3, 'Q': 10, 'R': 1,
-            'S': 1, 'T': 1, 'U': 1, 'V': 4, 'W': 4, 'X': 8, 'Y': 4, 'Z': 10
-        }
-        
-        return sum(letter_values.get(letter.upper(), 0) for letter in word)
+        return word_points(word)
     
     def is_valid_word(self, word, theme=None):
         """Check if a word exists in the dictionary.
@@ -95,8 +66,16 @@ class WordValidator:
         # Use the specified theme or fall back to the validator's theme
         current_theme = theme or self.theme
         
-        # Check if the word is in the dictionary
-        return self.db_manager.is_valid_word(word, current_theme)
+        # Check if the word is in the in-memory lexicon
+        return self.lexicon.contains(word, current_theme)
+    
+    def get_dawg(self):
+        """Get the word graph for the validator's theme (used for move generation).
+        
+        Returns:
+            Dawg: The word graph.
+        """
+        return self.lexicon.get_dawg(self.theme)
     
     def get_word_value(self, word):
         """Get the base value of a word.
@@ -123,7 +102,11 @@ class WordValidator:
         points = self.calculate_base_points(word)
         
         # Add to the database
-        return self.db_manager.add_dictionary_word(word, points, theme)
+        added = self.db_manager.add_dictionary_word(word, points, theme)
+        if added:
+            self.lexicon.invalidate()
+        
+        return added
     
     def get_word_themes(self, word):
         """Get all themes a word belongs to.
@@ -134,15 +117,7 @@ class WordValidator:
         Returns:
             list: A list of themes.
         """
-        self.db_manager.connect()
-        self.db_manager.cursor.execute(
-            "SELECT theme FROM dictionary WHERE word = ?",
-            (word.lower(),)
-        )
-        themes = [row[0] for row in self.db_manager.cursor.fetchall()]
-        self.db_manager.close()
-        
-        return themes
+        return self.lexicon.get_themes(word)
     
     def load_theme_dictionary(self, theme, file_path):
         """Load a themed dictionary from a file.
@@ -160,26 +135,11 @@ class WordValidator:
         added_count = 0
         
         try:
-            with open(file_path, 'r') as f:
-                words = [line.strip().lower() for line in f if line.strip()]
-            
-            self.db_manager.connect()
-            
-            for word in words:
-                if 2 <= len(word) <= 15:  # Valid Scrabble word length
-                    points = self.calculate_base_points(word)
-                    try:
-                        self.db_manager.cursor.execute(
-                            "INSERT INTO dictionary (word, points, theme) VALUES (?, ?, ?)",
-                            (word, points, theme)
-                        )
-                        added_count += 1
-                    except sqlite3.IntegrityError:
-                        # Word with this theme already exists
-                        pass
+            stats = load_words(self.db_manager, file_path, theme)
+            added_count = stats['added']
             
-            self.db_manager.commit()
-            self.db_manager.close()
+            if added_count:
+                self.lexicon.invalidate()
             
         except Exception as e:
             print(f"Error loading theme dictionary: {e}")
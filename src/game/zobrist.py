@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+
+# Keys are indexed by letter code & 31: A-Z map to 1-26, the blank to 0
+LETTER_SLOTS = 32
+
+# Most copies of one letter a rack can hold
+RACK_COPIES = 16
+
+# Fixed seeds so hashes agree between processes and runs
+_SEED = 0x5C4A881E
+
+_square_keys = {}
+
+_rng = random.Random(_SEED)
+RACK_KEYS = [[[_rng.getrandbits(64) for _ in range(RACK_COPIES)]
+              for _ in range(LETTER_SLOTS)]
+             for _ in range(2)]
+PASS_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+SIDE_KEY = _rng.getrandbits(64)
+
+def square_keys(size):
+    """Get the Zobrist keys for a board size.
+    
+    Args:
+        size: The board size.
+    
+    Returns:
+        list: 64-bit keys indexed by (row * size + col) * LETTER_SLOTS + slot.
+    """
+    keys = _square_keys.get(size)
+    if keys is None:
+        rng = random.Random(_SEED + size)
+        keys = [rng.getrandbits(64) for _ in range(size * size * LETTER_SLOTS)]
+        _square_keys[size] = keys
+    return keys
+
+def rack_hash(tiles, side=0):
+    """Hash a rack independently of tile order.
+    
+    Args:
+        tiles: The rack as (letter, value) tuples.
+        side: 0 or 1, so the two players' racks hash differently.
+    
+    Returns:
+        int: The 64-bit rack hash.
+    """
+    counts = {}
+    for letter, _ in tiles:
+        slot = ord(letter.upper()) & 31
+        counts[slot] = counts.get(slot, 0) + 1
+    
+    keys = RACK_KEYS[side]
+    value = 0
+    for slot, count in counts.items():
+        for copy in range(min(count, RACK_COPIES)):
+            value ^= keys[slot][copy]
+    return value
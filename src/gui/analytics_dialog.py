@@ -216,10 +216,7 @@ class AnalyticsDialog(QDialog):
         """Load statistics data from the database."""
         if not self.player:
             # Load player list
-            self.db_manager.connect()
-            self.db_manager.cursor.execute("SELECT id, name FROM players ORDER BY name")
-            players = self.db_manager.cursor.fetchall()
-            self.db_manager.close()
+            players = self.db_manager.get_players()
             
             for player_id, player_name in players:
                 self.player_combo.addItem(player_name, player_id)
@@ -282,16 +279,7 @@ class AnalyticsDialog(QDialog):
         self.highest_score_label.setText(str(highest_score))
         
         # Load recent games
-        self.db_manager.connect()
-        self.db_manager.cursor.execute("""
-        SELECT date_played, player_score, ai_score, winner, ai_difficulty, duration
-        FROM games
-        WHERE player_id = ?
-        ORDER BY date_played DESC
-        LIMIT 10
-        """, (player_id,))
-        recent_games = self.db_manager.cursor.fetchall()
-        self.db_manager.close()
+        recent_games = self.db_manager.get_recent_games(player_id, 10)
         
         # Update recent games table
         self.games_table.setRowCount(len(recent_games))
@@ -318,40 +306,17 @@ class AnalyticsDialog(QDialog):
             self.games_table.setItem(row, 5, QTableWidgetItem(duration))
         
         # Load word stats
-        self.db_manager.connect()
-        self.db_manager.cursor.execute("""
-        SELECT word, score, COUNT(*) as uses
-        FROM moves
-        WHERE player_id = ?
-        GROUP BY word
-        ORDER BY score DESC, uses DESC
-        LIMIT 20
-        """, (player_id,))
-        top_words = self.db_manager.cursor.fetchall()
-        
-        # Calculate average word length
-        self.db_manager.cursor.execute("""
-        SELECT AVG(LENGTH(word)) as avg_length
-        FROM moves
-        WHERE player_id = ?
-        """, (player_id,))
-        avg_length = self.db_manager.cursor.fetchone()
-        
-        if avg_length and avg_length[0]:
-            self.avg_word_length_label.setText(f"{avg_length[0]:.1f}")
+        word_stats = self.db_manager.get_word_stats(player_id, 20)
+        top_words = word_stats['top_words']
+        
+        # Show the average word length
+        avg_length = word_stats['avg_length']
+        if avg_length:
+            self.avg_word_length_label.setText(f"{avg_length:.1f}")
         else:
             self.avg_word_length_label.setText("0")
         
-        # Get word length distribution
-        self.db_manager.cursor.execute("""
-        SELECT LENGTH(word) as length, COUNT(*) as count
-        FROM moves
-        WHERE player_id = ?
-        GROUP BY length
-        ORDER BY length
-        """, (player_id,))
-        word_length_dist = self.db_manager.cursor.fetchall()
-        self.db_manager.close()
+        word_length_dist = word_stats['length_distribution']
         
         # Update top words table
         self.top_words_table.setRowCount(len(top_words))
@@ -324,9 +324,15 @@ class GameBoardWidget(QWidget):
                     return False
         return True
     
-    def randomize_bonus_positions(self):
-        """Randomize the positions of bonus cells."""
+    def randomize_bonus_positions(self, rng=None):
+        """Randomize the positions of bonus cells.
+        
+        Args:
+            rng: Optional random.Random to draw positions from (defaults to
+                the random module).
+        """
         import random
+        rng = rng or random
         
         # Count current bonuses by type
         bonus_counts = {
@@ -359,8 +365,8 @@ class GameBoardWidget(QWidget):
         for bonus_type, count in bonus_counts.items():
             for _ in range(count):
                 while True:
-                    row = random.randint(0, self.board_size - 1)
-                    col = random.randint(0, self.board_size - 1)
+                    row = rng.randint(0, self.board_size - 1)
+                    col = rng.randint(0, self.board_size - 1)
                     
                     # Check if the cell has already been assigned a bonus
                     if (row, col) not in assigned_cells:
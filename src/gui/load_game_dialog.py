@@ -100,10 +100,7 @@ class LoadGameDialog(QDialog):
     def load_games(self):
         """Load the list of saved games from the database."""
         # Load players for filter
-        self.db_manager.connect()
-        self.db_manager.cursor.execute("SELECT id, name FROM players ORDER BY name")
-        players = self.db_manager.cursor.fetchall()
-        self.db_manager.close()
+        players = self.db_manager.get_players()
         
         # Populate player combo
         for player_id, player_name in players:
@@ -66,11 +66,11 @@ class MainWindow(QMainWindow):
         """Challenge the AI's last word."""
         if not self.game_controller:
             return
-
+        
         last_move = self.game_controller.last_move
         if last_move['player'] != 'ai' or last_move['word'] == 'PASS':
             return
-
+        
         result = self.game_controller.challenge_word(last_move['word'])
         
         if result:
@@ -282,31 +282,21 @@ class MainWindow(QMainWindow):
         self.settings.setValue("ai_difficulty", difficulty)
         
         # Create or get player from database
-        self.db_manager.connect()
-        self.db_manager.cursor.execute(
-            "SELECT id FROM players WHERE name = ?", (player_name,)
-        )
-        player_data = self.db_manager.cursor.fetchone()
-        
-        if player_data:
-            player_id = player_data[0]
-        else:
-            self.db_manager.cursor.execute(
-                "INSERT INTO players (name) VALUES (?)", (player_name,)
-            )
-            player_id = self.db_manager.cursor.lastrowid
-        
-        self.db_manager.commit()
-        self.db_manager.close()
+        player_id = self.db_manager.get_or_create_player(player_name)
         
         # Create player object
         self.current_player = Player(player_id, player_name, is_ai=False)
         
+        # Stop the previous game's background work
+        if self.game_controller:
+            self.game_controller.shutdown()
+        
         # Create game controller
         self.game_controller = GameController(
             self.db_manager, 
             self.current_player,
-            difficulty
+            difficulty,
+            pondering=self.settings.value("ai_pondering", False, type=bool)
         )
         
         # Connect signals
@@ -375,23 +365,22 @@ class MainWindow(QMainWindow):
         game_data = self.db_manager.load_game(game_id)
         if game_data:
             # Get player info
-            self.db_manager.connect()
-            self.db_manager.cursor.execute(
-                "SELECT id, name FROM players WHERE id = ?", 
-                (game_data['game'][1],)  # player_id is at index 1
-            )
-            player_data = self.db_manager.cursor.fetchone()
-            self.db_manager.close()
+            player_data = self.db_manager.get_player(game_data['game'][1])  # player_id is at index 1
             
             if player_data:
                 # Create player object
                 self.current_player = Player(player_data[0], player_data[1], is_ai=False)
                 
+                # Stop the previous game's background work
+                if self.game_controller:
+                    self.game_controller.shutdown()
+                
                 # Create game controller
                 self.game_controller = GameController(
                     self.db_manager,
                     self.current_player,
-                    game_data['game'][2]  # ai_difficulty is at index 2
+                    game_data['game'][2],  # ai_difficulty is at index 2
+                    pondering=self.settings.value("ai_pondering", False, type=bool)
                 )
                 
                 # Connect signals
@@ -548,11 +537,14 @@ class MainWindow(QMainWindow):
             if save_reply == QMessageBox.Yes:
                 self.save_game()
             
+            self.game_controller.shutdown()
             self.stacked_widget.setCurrentIndex(0)
     
     def closeEvent(self, event):
         """Handle application close event."""
         if not self.game_controller or self.stacked_widget.currentIndex() == 0:
+            if self.game_controller:
+                self.game_controller.shutdown()
             event.accept()
             return
         
@@ -573,6 +565,7 @@ class MainWindow(QMainWindow):
             if save_reply == QMessageBox.Yes:
                 self.save_game()
             
+            self.game_controller.shutdown()
             event.accept()
         else:
             event.ignore() 
\ No newline at end of file
@@ -53,6 +53,9 @@ class SettingsDialog(QDialog):
         difficulty_layout.addWidget(self.medium_radio)
         difficulty_layout.addWidget(self.hard_radio)
         
+        self.pondering_check = QCheckBox("AI Thinks During Your Turn")
+        difficulty_layout.addWidget(self.pondering_check)
+        
         difficulty_group.setLayout(difficulty_layout)
         game_layout.addWidget(difficulty_group)
         
@@ -214,6 +217,8 @@ class SettingsDialog(QDialog):
         else:
             self.hard_radio.setChecked(True)
         
+        self.pondering_check.setChecked(self.settings.value("ai_pondering", False, type=bool))
+        
         # Load word theme
         theme = self.settings.value("word_theme", "Standard")
         index = self.theme_combo.findText(theme, Qt.MatchFixedString)
@@ -283,6 +288,8 @@ class SettingsDialog(QDialog):
         else:
             self.settings.setValue("ai_difficulty", "hard")
         
+        self.settings.setValue("ai_pondering", self.pondering_check.isChecked())
+        
         # Save word theme
         self.settings.setValue("word_theme", self.theme_combo.currentText())
         